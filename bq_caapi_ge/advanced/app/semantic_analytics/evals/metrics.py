@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, time
 from decimal import Decimal
+import hashlib
 import json
 import logging
 import math
+import operator
 import os
 from pathlib import Path
 import statistics
+import threading
 from typing import Any
 
 from google.adk.evaluation.eval_case import ConversationScenario
@@ -21,6 +26,7 @@ from google.adk.evaluation.eval_metrics import EvalStatus
 from google.adk.evaluation.evaluator import EvaluationResult
 from google.adk.evaluation.evaluator import PerInvocationResult
 from google.cloud import bigquery
+import numpy as np
 import yaml
 
 logger = logging.getLogger(__name__)
@@ -32,6 +38,16 @@ _DEFAULT_PROJECT = "johanesa-playground-326616"
 _DEFAULT_LOCATION = "US"
 _DEFAULT_MAXIMUM_BYTES = 1_000_000_000
 _MAX_RESULT_ROWS = 100
+_DEFAULT_MAX_WORKERS = 8
+_NUMERIC_TYPES = frozenset({int, float, type(None)})
+_HASHABLE_TYPES = frozenset({str, int, float, bool, type(None)})
+_DEFAULT_GOLD_CACHE_PATH = (
+    Path(__file__).resolve().parents[1] / ".adk" / "gold_result_cache.json"
+)
+
+_executor_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_gold_cache_lock = threading.Lock()
 
 
 def semantic_selection_match(
@@ -77,19 +93,26 @@ def semantic_selection_match(
     )
 
 
-def bigquery_result_match(
+async def bigquery_result_match(
     eval_metric: EvalMetric,
     actual_invocations: list[Invocation],
     expected_invocations: list[Invocation] | None,
     conversation_scenario: ConversationScenario | None,
 ) -> EvaluationResult:
-    """Compares generated-query results with the case's gold BigQuery result."""
+    """Compares generated-query results with the case's gold BigQuery result.
+
+    Invocations are scored on a shared worker pool sized by `EVAL_MAX_WORKERS`,
+    so concurrent ADK evaluations do not block each other on BigQuery. Gold
+    rows are read from the persistent gold-result cache when the gold SQL and
+    the last-modified times of its source tables are unchanged.
+    """
     del conversation_scenario
     project = os.getenv("GOOGLE_CLOUD_PROJECT", _DEFAULT_PROJECT)
     location = os.getenv("BIGQUERY_LOCATION", _DEFAULT_LOCATION)
     maximum_bytes = _positive_int_env(
         "EVAL_MAXIMUM_BYTES_BILLED", _DEFAULT_MAXIMUM_BYTES
     )
+    cache_path = _gold_cache_path()
     client = bigquery.Client(project=project, location=location)
 
     def score(actual: Invocation) -> float:
@@ -108,12 +131,13 @@ def bigquery_result_match(
                 maximum_bytes=maximum_bytes,
                 location=location,
             )
-            gold_rows = _execute_checked_query(
+            gold_rows = _gold_rows(
                 client,
                 case["gold_sql"],
                 allowed_sources=allowed_sources,
                 maximum_bytes=maximum_bytes,
                 location=location,
+                cache_path=cache_path,
             )
         except Exception as error:  # provider and generated-SQL boundary
             logger.error("BigQuery metric failed for %s: %s", case["id"], error)
@@ -135,11 +159,19 @@ def bigquery_result_match(
             )
         return 1.0 if matched else 0.0
 
-    return _evaluate_metric(
+    loop = asyncio.get_running_loop()
+    executor = _query_executor()
+    scores = await asyncio.gather(
+        *(
+            loop.run_in_executor(executor, _safe_score, score, actual)
+            for actual in actual_invocations
+        )
+    )
+    return _metric_result(
         eval_metric,
         actual_invocations,
         expected_invocations,
-        score,
+        list(scores),
     )
 
 
@@ -148,21 +180,37 @@ def _evaluate_metric(
     actual_invocations: list[Invocation],
     expected_invocations: list[Invocation] | None,
     scorer: Callable[[Invocation], float],
+) -> EvaluationResult:
+    scores = [_safe_score(scorer, actual) for actual in actual_invocations]
+    return _metric_result(
+        eval_metric,
+        actual_invocations,
+        expected_invocations,
+        scores,
+    )
+
+
+def _safe_score(scorer: Callable[[Invocation], float], actual: Invocation) -> float:
+    try:
+        return scorer(actual)
+    except (KeyError, ValueError) as error:
+        logger.error("Metric fixture error: %s", error)
+        return 0.0
+
+
+def _metric_result(
+    eval_metric: EvalMetric,
+    actual_invocations: list[Invocation],
+    expected_invocations: list[Invocation] | None,
+    scores: list[float],
 ) -> EvaluationResult:
     per_invocation = []
-    scores = []
-    for index, actual in enumerate(actual_invocations):
+    for index, (actual, score) in enumerate(zip(actual_invocations, scores)):
         expected = (
             expected_invocations[index]
             if expected_invocations and index < len(expected_invocations)
             else None
         )
-        try:
-            score = scorer(actual)
-        except (KeyError, ValueError) as error:
-            logger.error("Metric fixture error: %s", error)
-            score = 0.0
-        scores.append(score)
         per_invocation.append(
             PerInvocationResult(
                 actual_invocation=actual,
@@ -279,6 +327,116 @@ def _execute_checked_query(
     return tuple(rows)
 
 
+def _gold_rows(
+    client: bigquery.Client,
+    sql: str,
+    *,
+    allowed_sources: frozenset[str],
+    maximum_bytes: int,
+    location: str,
+    cache_path: Path | None,
+) -> tuple[tuple[Any, ...], ...]:
+    if cache_path is None:
+        return _execute_checked_query(
+            client,
+            sql,
+            allowed_sources=allowed_sources,
+            maximum_bytes=maximum_bytes,
+            location=location,
+        )
+    key = _gold_cache_key(
+        sql,
+        location=location,
+        table_versions=_table_versions(client, allowed_sources),
+    )
+    cached = _read_gold_cache(cache_path, key)
+    if cached is not None:
+        return cached
+    rows = _execute_checked_query(
+        client,
+        sql,
+        allowed_sources=allowed_sources,
+        maximum_bytes=maximum_bytes,
+        location=location,
+    )
+    _write_gold_cache(cache_path, key, rows)
+    return rows
+
+
+def _table_versions(client: bigquery.Client, sources: frozenset[str]) -> dict[str, str]:
+    versions = {}
+    for source in sorted(sources):
+        modified = client.get_table(source).modified
+        versions[source] = modified.isoformat() if modified else ""
+    return versions
+
+
+def _gold_cache_key(sql: str, *, location: str, table_versions: dict[str, str]) -> str:
+    payload = json.dumps(
+        {
+            "sql_sha256": hashlib.sha256(sql.strip().encode("utf-8")).hexdigest(),
+            "location": location.upper(),
+            "tables": table_versions,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _read_gold_cache(path: Path, key: str) -> tuple[tuple[Any, ...], ...] | None:
+    with _gold_cache_lock:
+        rows = _load_gold_cache(path).get(key)
+    if rows is None:
+        return None
+    return tuple(tuple(row) for row in rows)
+
+
+def _write_gold_cache(path: Path, key: str, rows: tuple[tuple[Any, ...], ...]) -> None:
+    with _gold_cache_lock:
+        entries = _load_gold_cache(path)
+        entries[key] = [list(row) for row in rows]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(f"{path.suffix}.tmp")
+        temporary.write_text(
+            json.dumps(entries, ensure_ascii=False, sort_keys=True, default=str),
+            encoding="utf-8",
+        )
+        temporary.replace(path)
+
+
+def _load_gold_cache(path: Path) -> dict[str, Any]:
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as error:
+        logger.warning("Ignoring unreadable gold result cache %s: %s", path, error)
+        return {}
+    return raw if isinstance(raw, dict) else {}
+
+
+def _gold_cache_path() -> Path | None:
+    raw = os.getenv("EVAL_GOLD_CACHE_PATH")
+    if raw is None:
+        return _DEFAULT_GOLD_CACHE_PATH
+    raw = raw.strip()
+    if not raw or raw.lower() in {"0", "false", "off", "none"}:
+        return None
+    return Path(raw).expanduser()
+
+
+def _query_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_positive_int_env("EVAL_MAX_WORKERS", _DEFAULT_MAX_WORKERS),
+                thread_name_prefix="semantic-eval",
+            )
+        return _executor
+
+
 def _rows_equal(
     left: tuple[tuple[Any, ...], ...],
     right: tuple[tuple[Any, ...], ...],
@@ -286,6 +444,138 @@ def _rows_equal(
     ordered: bool,
     relative: float,
     absolute: float,
+) -> bool:
+    """Compares result rows column-wise with NumPy.
+
+    Columns whose values are all numbers or NULL on both sides are compared
+    with vectorized `math.isclose` semantics. Every other column is encoded
+    once into integer codes from a dictionary shared by both sides, so exact
+    comparison and unordered multiset matching reduce to integer array
+    operations. Unordered rows are matched by sorting both sides on the exact
+    codes first and the numeric values second.
+    """
+    if len(left) != len(right):
+        return False
+    if not left:
+        return True
+    widths = {len(row) for row in left} | {len(row) for row in right}
+    if len(widths) != 1:
+        return _rows_equal_pairwise(
+            left, right, ordered=ordered, relative=relative, absolute=absolute
+        )
+    left_columns, right_columns = _encode_columns(left, right, widths.pop())
+    if not ordered:
+        left_columns = _sort_columns(left_columns)
+        right_columns = _sort_columns(right_columns)
+    return all(
+        _columns_equal(left_column, right_column, relative=relative, absolute=absolute)
+        for left_column, right_column in zip(left_columns, right_columns)
+    )
+
+
+def _encode_columns(
+    left: tuple[tuple[Any, ...], ...],
+    right: tuple[tuple[Any, ...], ...],
+    width: int,
+) -> tuple[
+    list[tuple[np.ndarray, np.ndarray | None]],
+    list[tuple[np.ndarray, np.ndarray | None]],
+]:
+    codes: dict[Any, int] = {}
+    left_columns = []
+    right_columns = []
+    for index in range(width):
+        column = operator.itemgetter(index)
+        left_values = list(map(column, left))
+        right_values = list(map(column, right))
+        if _is_numeric_column(left_values) and _is_numeric_column(right_values):
+            left_columns.append(_numeric_column(left_values))
+            right_columns.append(_numeric_column(right_values))
+        else:
+            left_columns.append((_exact_column(left_values, codes), None))
+            right_columns.append((_exact_column(right_values, codes), None))
+    return left_columns, right_columns
+
+
+def _is_numeric_column(values: list[Any]) -> bool:
+    return set(map(type, values)) <= _NUMERIC_TYPES
+
+
+def _numeric_column(values: list[Any]) -> tuple[np.ndarray, np.ndarray]:
+    if None in values:
+        nulls = np.array([value is None for value in values], dtype=bool)
+    else:
+        nulls = np.zeros(len(values), dtype=bool)
+    return np.array(values, dtype=np.float64), nulls
+
+
+def _exact_column(values: list[Any], codes: dict[Any, int]) -> np.ndarray:
+    encode = codes.setdefault
+    if set(map(type, values)) <= _HASHABLE_TYPES:
+        encoded = [encode(value, len(codes)) for value in values]
+    else:
+        encoded = [encode(_hashable_value(value), len(codes)) for value in values]
+    return np.array(encoded, dtype=np.int64)
+
+
+def _hashable_value(value: Any) -> Any:
+    try:
+        hash(value)
+    except TypeError:
+        return (
+            "__unhashable__",
+            json.dumps(value, sort_keys=True, default=str, separators=(",", ":")),
+        )
+    return value
+
+
+def _sort_columns(
+    columns: list[tuple[np.ndarray, np.ndarray | None]],
+) -> list[tuple[np.ndarray, np.ndarray | None]]:
+    exact_keys = [values for values, nulls in columns if nulls is None]
+    numeric_keys = []
+    for values, nulls in columns:
+        if nulls is not None:
+            numeric_keys.extend((nulls, values))
+    # np.lexsort treats the last key as the primary sort key.
+    order = np.lexsort(tuple(reversed(exact_keys + numeric_keys)))
+    return [
+        (values[order], None if nulls is None else nulls[order])
+        for values, nulls in columns
+    ]
+
+
+def _columns_equal(
+    left: tuple[np.ndarray, np.ndarray | None],
+    right: tuple[np.ndarray, np.ndarray | None],
+    *,
+    relative: float,
+    absolute: float,
+) -> bool:
+    left_values, left_nulls = left
+    right_values, right_nulls = right
+    if left_nulls is None or right_nulls is None:
+        return bool(np.array_equal(left_values, right_values))
+    if not np.array_equal(left_nulls, right_nulls):
+        return False
+    with np.errstate(invalid="ignore", over="ignore"):
+        tolerance = np.maximum(
+            relative * np.maximum(np.abs(left_values), np.abs(right_values)),
+            absolute,
+        )
+        close = (left_values == right_values) | (
+            np.abs(left_values - right_values) <= tolerance
+        )
+    return bool(np.all(close | left_nulls))
+
+
+def _rows_equal_pairwise(
+    left: tuple[tuple[Any, ...], ...],
+    right: tuple[tuple[Any, ...], ...],
+    *,
+    ordered: bool,
+    relative: float,
+    absolute: float,
 ) -> bool:
     if not ordered:
         left = tuple(sorted(left, key=_row_sort_key))
@@ -314,6 +604,10 @@ def _values_equal(left: Any, right: Any, *, relative: float, absolute: float) ->
 
 
 def _normalize_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _normalize_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_normalize_value(item) for item in value]
     if isinstance(value, Decimal):
         return float(value)
     if isinstance(value, (datetime, date, time)):
@@ -7,20 +7,35 @@ signed cookie), tokens are refreshed when expired, backend sessions are reused
 across queries, and the user token is written to the workflow's configured
 session-state key (``ADK_OAUTH_TOKEN_STATE_KEY``, default
 ``AUTH_RESOURCE_SEMANTIC_ANALYTICS``) so it reaches the guarded SQL executor.
+
+Backend calls share one keep-alive HTTP session and a cached GCP access token, and
+``/api/query/stream`` relays backend events to the browser as Server-Sent Events
+as they arrive instead of buffering the whole response.
 """
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from collections.abc import Callable, Iterable, Iterator
+from datetime import UTC, datetime
 import json
 import os
 import secrets
-import subprocess
+import threading
 from typing import Any
 
 import requests
 from dotenv import load_dotenv
-from flask import Flask, redirect, render_template, request, session, url_for
+from flask import (
+    Flask,
+    Response,
+    redirect,
+    render_template,
+    request,
+    session,
+    stream_with_context,
+    url_for,
+)
+from google.auth.exceptions import GoogleAuthError
 from google_auth_oauthlib.flow import Flow
 
 # Load environment from parent directory
@@ -89,12 +104,22 @@ AGENT_ENGINE_BASE = (
     f"/locations/{AGENT_ENGINE_LOCATION}/reasoningEngines/{REASONING_ENGINE_ID}"
 )
 
+# Connection pool size of the shared backend HTTP session. The Flask dev server is
+# threaded, so each concurrent query can hold one keep-alive connection.
+HTTP_POOL_SIZE = int(os.getenv("TEST_WEB_HTTP_POOL_SIZE", "10"))
+GCP_TOKEN_SCOPES = ["https://www.googleapis.com/auth/cloud-platform"]
+
 # Server-side session store. Only an opaque session id is placed in the signed
 # cookie; access and refresh tokens never leave the server. This in-process dict is
 # adequate for a single-process dev harness; a real deployment would use a shared
 # backing store.
 _SESSIONS: dict[str, dict[str, Any]] = {}
 
+_http_session: requests.Session | None = None
+_http_session_lock = threading.Lock()
+_gcp_credentials: Any = None
+_gcp_credentials_lock = threading.Lock()
+
 
 # --- pure helpers (unit-testable without a Flask context) -------------------
 
@@ -123,8 +148,8 @@ def is_token_expired(
     except ValueError:
         return True
     if expiry.tzinfo is None:
-        expiry = expiry.replace(tzinfo=timezone.utc)
-    current = now or datetime.now(timezone.utc)
+        expiry = expiry.replace(tzinfo=UTC)
+    current = now or datetime.now(UTC)
     return (expiry - current).total_seconds() <= skew_seconds
 
 
@@ -151,6 +176,41 @@ def format_response_text(output: Any) -> str:
     return json.dumps(output, indent=2)
 
 
+def parse_stream_event(line: str | bytes | None) -> dict[str, Any] | None:
+    """Parses one line of a backend event stream.
+
+    Agent Engine ``:streamQuery`` emits newline-delimited JSON and the ADK
+    ``/run_sse`` endpoint emits ``data: <json>`` lines; both are accepted. Blank
+    lines, SSE comments, and unparseable lines return ``None``.
+    """
+    if not line:
+        return None
+    if isinstance(line, bytes):
+        line = line.decode("utf-8", errors="replace")
+    line = line.strip()
+    if line.startswith("data:"):
+        line = line[len("data:") :].strip()
+    if not line or line.startswith(":"):
+        return None
+    try:
+        event = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return event if isinstance(event, dict) else None
+
+
+def event_text(event: dict[str, Any]) -> str:
+    """Returns the concatenated text parts of a backend event."""
+    content = event.get("content") or {}
+    parts = content.get("parts") or []
+    return "".join(part.get("text", "") for part in parts if isinstance(part, dict))
+
+
+def format_sse(payload: dict[str, Any]) -> str:
+    """Encodes a payload as a single Server-Sent Events ``data`` frame."""
+    return f"data: {json.dumps(payload)}\n\n"
+
+
 def extract_provenance(output: Any) -> dict[str, Any]:
     """Extracts the reasoning-path and execution provenance from an output payload.
 
@@ -226,17 +286,57 @@ def _ensure_valid_token(data: dict[str, Any]) -> tuple[str | None, str | None]:
 
         credentials = _credentials_from_store(data)
         credentials.refresh(Request())
-    except Exception as error:  # surface any refresh failure as reauth
+    except GoogleAuthError as error:  # surface any refresh failure as reauth
         return None, f"token refresh failed; please sign in again: {error}"
     data["access_token"] = credentials.token
     data["token_expiry"] = (
-        credentials.expiry.replace(tzinfo=timezone.utc).isoformat()
+        credentials.expiry.replace(tzinfo=UTC).isoformat()
         if credentials.expiry
         else None
     )
     return credentials.token, None
 
 
+# --- shared backend transport ----------------------------------------------
+
+
+def _http() -> requests.Session:
+    """Returns the process-wide keep-alive session used for backend calls."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE
+            )
+            http_session = requests.Session()
+            http_session.mount("https://", adapter)
+            http_session.mount("http://", adapter)
+            _http_session = http_session
+        return _http_session
+
+
+def _get_gcp_access_token() -> str:
+    """Returns a cached Application Default Credentials token for Agent Engine.
+
+    The token is refreshed only when it is missing or within the
+    ``is_token_expired`` skew of its expiry, so queries no longer pay for a token
+    fetch on every request.
+    """
+    global _gcp_credentials
+    with _gcp_credentials_lock:
+        if _gcp_credentials is None:
+            import google.auth
+
+            _gcp_credentials, _ = google.auth.default(scopes=GCP_TOKEN_SCOPES)
+        expiry = _gcp_credentials.expiry
+        expiry_iso = expiry.replace(tzinfo=UTC).isoformat() if expiry else None
+        if not _gcp_credentials.token or is_token_expired(expiry_iso):
+            from google.auth.transport.requests import Request
+
+            _gcp_credentials.refresh(Request())
+        return _gcp_credentials.token
+
+
 # --- backend query paths ----------------------------------------------------
 
 
@@ -253,7 +353,7 @@ def _query_local_adk(message: str, access_token: str, data: dict[str, Any]):
         "session_id": session_id,
         "new_message": {"role": "user", "parts": [{"text": message}]},
     }
-    run_response = requests.post(f"{base_url}/run", json=run_payload, timeout=120)
+    run_response = _http().post(f"{base_url}/run", json=run_payload, timeout=120)
     if not run_response.ok:
         return {"error": f"Local ADK query failed: {run_response.text}"}, 500
 
@@ -279,7 +379,7 @@ def _get_or_create_local_session(
     if cached and data.get("session_token") == access_token:
         return cached
     session_payload = {"state": {TOKEN_STATE_KEY: access_token}}
-    response = requests.post(
+    response = _http().post(
         f"{base_url}/apps/{ADK_LOCAL_APP_NAME}/users/{user_email}/sessions",
         json=session_payload,
         timeout=30,
@@ -298,7 +398,7 @@ def _query_agent_engine(message: str, access_token: str, data: dict[str, Any]):
     user_email = data.get("user_email", "test-user")
     try:
         gcp_token = _get_gcp_access_token()
-    except Exception as e:
+    except GoogleAuthError as e:
         return {"error": f"Failed to get GCP token: {e}"}, 500
 
     headers = {
@@ -316,7 +416,7 @@ def _query_agent_engine(message: str, access_token: str, data: dict[str, Any]):
             "session_id": session_id,
         }
     }
-    query_response = requests.post(
+    query_response = _http().post(
         f"{AGENT_ENGINE_BASE}:streamQuery",
         headers=headers,
         json=query_payload,
@@ -345,7 +445,7 @@ def _get_or_create_agent_session(
         "userId": user_email,
         "sessionState": {TOKEN_STATE_KEY: access_token},
     }
-    response = requests.post(
+    response = _http().post(
         f"{AGENT_ENGINE_BASE}/sessions",
         headers=headers,
         json=session_payload,
@@ -363,30 +463,9 @@ def _get_or_create_agent_session(
     return session_id
 
 
-def _get_gcp_access_token() -> str:
-    result = subprocess.run(
-        ["gcloud", "auth", "print-access-token"],
-        capture_output=True,
-        text=True,
-        check=True,
-    )
-    return result.stdout.strip()
-
-
 def _extract_agent_engine_response(response_body: str) -> str:
-    response_text = ""
-    for line in response_body.strip().split("\n"):
-        if line:
-            try:
-                event = json.loads(line)
-                content = event.get("content", {})
-                parts = content.get("parts", [])
-                for part in parts:
-                    if "text" in part:
-                        response_text += part["text"]
-            except json.JSONDecodeError:
-                continue
-    return response_text
+    events = (parse_stream_event(line) for line in response_body.splitlines())
+    return "".join(event_text(event) for event in events if event)
 
 
 def _maybe_json(text: str) -> Any:
@@ -396,6 +475,146 @@ def _maybe_json(text: str) -> Any:
         return text
 
 
+# --- streaming query paths --------------------------------------------------
+
+
+def _agent_engine_output(events: list[dict[str, Any]]) -> Any:
+    text = "".join(event_text(event) for event in events)
+    return _maybe_json(text) if text else None
+
+
+def _open_local_adk_stream(
+    message: str, access_token: str, data: dict[str, Any]
+) -> tuple[requests.Response | None, str | None, str | None]:
+    """Opens a streaming ``/run_sse`` call against the local ADK API server.
+
+    Returns ``(upstream, session_id, None)`` on success, or
+    ``(None, None, error)`` when the session or the stream cannot be opened.
+    """
+    base_url = ADK_LOCAL_BASE_URL.rstrip("/")
+    user_email = data.get("user_email", "test-user")
+    session_id = _get_or_create_local_session(base_url, user_email, access_token, data)
+    if session_id is None:
+        return None, None, "Failed to create local ADK session"
+
+    run_payload = {
+        "app_name": ADK_LOCAL_APP_NAME,
+        "user_id": user_email,
+        "session_id": session_id,
+        "new_message": {"role": "user", "parts": [{"text": message}]},
+        "streaming": False,
+    }
+    upstream = _http().post(
+        f"{base_url}/run_sse", json=run_payload, stream=True, timeout=120
+    )
+    if not upstream.ok:
+        error = f"Local ADK query failed: {upstream.text}"
+        upstream.close()
+        return None, None, error
+    return upstream, session_id, None
+
+
+def _open_agent_engine_stream(
+    message: str, access_token: str, data: dict[str, Any]
+) -> tuple[requests.Response | None, str | None, str | None]:
+    """Opens a streaming ``:streamQuery`` call against Agent Engine.
+
+    Returns ``(upstream, session_id, None)`` on success, or
+    ``(None, None, error)`` when the token, session, or stream is unavailable.
+    """
+    user_email = data.get("user_email", "test-user")
+    try:
+        gcp_token = _get_gcp_access_token()
+    except GoogleAuthError as e:
+        return None, None, f"Failed to get GCP token: {e}"
+
+    headers = {
+        "Authorization": f"Bearer {gcp_token}",
+        "Content-Type": "application/json",
+    }
+    session_id = _get_or_create_agent_session(headers, user_email, access_token, data)
+    if session_id is None:
+        return None, None, "Failed to create Agent Engine session"
+
+    query_payload = {
+        "input": {
+            "message": message,
+            "user_id": user_email,
+            "session_id": session_id,
+        }
+    }
+    upstream = _http().post(
+        f"{AGENT_ENGINE_BASE}:streamQuery",
+        headers=headers,
+        json=query_payload,
+        stream=True,
+        timeout=120,
+    )
+    if not upstream.ok:
+        error = f"Query failed: {upstream.text}"
+        upstream.close()
+        return None, None, error
+    return upstream, session_id, None
+
+
+def relay_events(
+    lines: Iterable[str | bytes],
+    *,
+    finalize: Callable[[list[dict[str, Any]]], Any],
+    metadata: dict[str, Any],
+) -> Iterator[str]:
+    """Relays backend stream lines to the browser as Server-Sent Events.
+
+    Each text-bearing event is forwarded as a ``delta`` frame as soon as it is
+    read; other events are forwarded as ``progress`` frames naming their author.
+    A final ``done`` frame carries the response, provenance, and ``metadata``,
+    computed by ``finalize`` over every event seen. Backend error events and
+    transport failures end the stream with an ``error`` frame.
+    """
+    events: list[dict[str, Any]] = []
+    try:
+        for line in lines:
+            event = parse_stream_event(line)
+            if event is None:
+                continue
+            if "error" in event and "content" not in event:
+                yield format_sse({"type": "error", "error": str(event["error"])})
+                return
+            events.append(event)
+            text = event_text(event)
+            if text:
+                yield format_sse({"type": "delta", "text": text})
+            elif event.get("author"):
+                yield format_sse({"type": "progress", "author": event["author"]})
+    except requests.RequestException as error:
+        yield format_sse({"type": "error", "error": f"Backend stream failed: {error}"})
+        return
+
+    output = finalize(events)
+    yield format_sse(
+        {
+            "type": "done",
+            "response": format_response_text(output),
+            "provenance": extract_provenance(output),
+            **metadata,
+        }
+    )
+
+
+def _stream_upstream(
+    upstream: requests.Response,
+    *,
+    finalize: Callable[[list[dict[str, Any]]], Any],
+    metadata: dict[str, Any],
+) -> Iterator[str]:
+    try:
+        yield from relay_events(
+            upstream.iter_lines(), finalize=finalize, metadata=metadata
+        )
+    finally:
+        upstream.close()
+
+
 def get_oauth_flow():
     """Create OAuth flow with client configuration."""
     client_config = {
@@ -447,7 +666,7 @@ def callback():
     data["access_token"] = credentials.token
     data["refresh_token"] = credentials.refresh_token
     data["token_expiry"] = (
-        credentials.expiry.replace(tzinfo=timezone.utc).isoformat()
+        credentials.expiry.replace(tzinfo=UTC).isoformat()
         if credentials.expiry
         else None
     )
@@ -506,6 +725,56 @@ def query():
     return _query_agent_engine(message, access_token, data)
 
 
+@app.route("/api/query/stream", methods=["POST"])
+def query_stream():
+    """Stream a query's backend events to the browser as Server-Sent Events.
+
+    Authentication, token refresh, and backend session setup happen before the
+    stream opens, so those failures still return JSON errors with a status code.
+    """
+    data = _session_data()
+    if not data.get("access_token"):
+        return {"error": "Not authenticated"}, 401
+
+    body = request.get_json(silent=True) or {}
+    message = body.get("message", "")
+    if not message:
+        return {"error": "Message is required"}, 400
+
+    access_token, error = _ensure_valid_token(data)
+    if error:
+        return {"error": error, "reauth": True}, 401
+
+    try:
+        if RUNTIME_MODE == "local_adk":
+            upstream, session_id, error = _open_local_adk_stream(
+                message, access_token, data
+            )
+            finalize, app_name = select_final_output, ADK_LOCAL_APP_NAME
+        else:
+            upstream, session_id, error = _open_agent_engine_stream(
+                message, access_token, data
+            )
+            finalize, app_name = _agent_engine_output, REASONING_ENGINE_ID
+    except requests.RequestException as e:
+        return {"error": f"Backend request failed: {e}"}, 502
+    if error:
+        return {"error": error}, 500
+
+    metadata = {
+        "session_id": session_id,
+        "runtime_mode": RUNTIME_MODE,
+        "app_name": app_name,
+    }
+    return Response(
+        stream_with_context(
+            _stream_upstream(upstream, finalize=finalize, metadata=metadata)
+        ),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.route("/auth/logout")
 def logout():
     """Clear session and logout."""
@@ -16,6 +16,16 @@ look.
   equivalent of the console "Save to schema" action, and it requires ``--wait``
   (the descriptions only exist once the documentation job has finished).
 
+Tables are enriched concurrently on a bounded worker pool. All REST calls share
+one keep-alive HTTP session, and a single ``ScanJobPoller`` thread checks the
+status of every outstanding scan job, so scans for all tables overlap instead of
+running one after another.
+
+Progress is journaled to a local state file: scan job names and completed
+publish/write-back steps per table. A re-run after an interruption re-attaches
+to scan jobs that are still running or already succeeded and skips finished
+steps instead of starting every scan again.
+
 The generic Dataplex REST plumbing is kept byte-compatible with
 ``bq_cross_cloud_lakehouse/agent/scripts/enrich_bigquery_metadata.py`` so the
 two stay easy to sync.
@@ -25,6 +35,8 @@ Usage::
     uv run python scripts/enrich_bigquery_metadata.py
     uv run python scripts/enrich_bigquery_metadata.py --wait
     uv run python scripts/enrich_bigquery_metadata.py --dry-run
+    uv run python scripts/enrich_bigquery_metadata.py --wait --max-workers 16
+    uv run python scripts/enrich_bigquery_metadata.py --wait --reset-state
 """
 
 from __future__ import annotations
@@ -37,11 +49,16 @@ import os
 import re
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Self
 from urllib.parse import urlencode
 
+import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
@@ -65,6 +82,10 @@ DATAPLEX_SCAN_PREFIX = os.getenv("DATAPLEX_SCAN_PREFIX", "bq-caapi")
 DATAPLEX_BASE = "https://dataplex.googleapis.com/v1"
 BIGQUERY_BASE = "https://bigquery.googleapis.com/bigquery/v2"
 OPERATION_POLL_INTERVAL = 2
+HTTP_TIMEOUT_SECONDS = 60
+DEFAULT_MAX_WORKERS = 8
+STATE_DIR = PROJECT_ROOT / ".enrichment_state"
+STATE_FILE_VERSION = 1
 SUCCESS_JOB_STATES = {"SUCCEEDED", "SUCCEEDED_WITH_ERRORS"}
 TERMINAL_JOB_STATES = {
     "SUCCEEDED",
@@ -83,6 +104,9 @@ PROFILE_MODES = {"LIGHTWEIGHT", "STANDARD"}
 BIGQUERY_MULTI_REGIONS = {"us", "eu"}
 MULTI_REGION_SUGGESTIONS = {"us": "us-central1", "eu": "europe-west1"}
 
+_http_session: requests.Session | None = None
+_http_session_lock = threading.Lock()
+
 
 def validate_dataplex_location(location: str) -> None:
     """Reject BigQuery multi-regions, which Dataplex does not accept.
@@ -125,6 +149,30 @@ def get_access_token() -> str:
     return result.stdout.strip()
 
 
+def create_http_session(pool_size: int) -> requests.Session:
+    """Create a keep-alive HTTP session for Dataplex and BigQuery REST calls.
+
+    Args:
+        pool_size: Maximum number of pooled connections per host. Size it to
+            the number of threads that issue requests concurrently.
+
+    Returns:
+        A session whose HTTPS adapter reuses connections across requests.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=pool_size))
+    return session
+
+
+def http_session() -> requests.Session:
+    """Return the shared HTTP session, creating a default one on first use."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            _http_session = create_http_session(DEFAULT_MAX_WORKERS + 1)
+        return _http_session
+
+
 def request(
     method: str,
     url: str,
@@ -143,32 +191,29 @@ def request(
         Parsed JSON response.
 
     Raises:
-        RuntimeError: If curl fails, JSON is invalid, or API returns an error.
+        RuntimeError: If the request fails, JSON is invalid, or API returns an
+            error.
     """
-    cmd = [
-        "curl",
-        "-s",
-        "-X",
-        method,
-        "-H",
-        f"Authorization: Bearer {token}",
-        "-H",
-        "Content-Type: application/json",
-        "-H",
-        f"X-Goog-User-Project: {PROJECT_ID}",
-        url,
-    ]
-    if payload is not None:
-        cmd += ["-d", json.dumps(payload)]
-
-    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-    if result.returncode != 0:
-        raise RuntimeError(f"curl failed: {result.stderr.strip()}")
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json",
+        "X-Goog-User-Project": PROJECT_ID or "",
+    }
+    try:
+        response = http_session().request(
+            method,
+            url,
+            headers=headers,
+            data=json.dumps(payload) if payload is not None else None,
+            timeout=HTTP_TIMEOUT_SECONDS,
+        )
+    except requests.RequestException as e:
+        raise RuntimeError(f"HTTP request failed: {e}") from e
 
     try:
-        data = json.loads(result.stdout or "{}")
+        data = json.loads(response.text or "{}")
     except json.JSONDecodeError as e:
-        raise RuntimeError(f"Invalid JSON response: {result.stdout[:200]}") from e
+        raise RuntimeError(f"Invalid JSON response: {response.text[:200]}") from e
 
     if "error" in data:
         raise RuntimeError(
@@ -476,6 +521,53 @@ def run_scan(scan_name: str, token: str, dry_run: bool) -> str | None:
     return job_id or None
 
 
+def scan_job_url(scan_name: str, job_id: str) -> str:
+    """Return the full-view GET URL for a Dataplex scan job."""
+    return f"{data_scans_url()}/{scan_name}/jobs/{job_id}?view=FULL"
+
+
+def scan_job_state(job: dict) -> str:
+    """Return the state of a Dataplex scan job response."""
+    return job.get("state") or job.get("status", {}).get("state") or "UNKNOWN"
+
+
+def scan_job_finished(scan_name: str, job_id: str, job: dict) -> bool:
+    """Log a scan job status and report whether it finished successfully.
+
+    Args:
+        scan_name: Dataplex data scan ID.
+        job_id: DataScanJob ID.
+        job: Scan job response.
+
+    Returns:
+        True if the job reached a successful terminal state, False if it is
+        still running.
+
+    Raises:
+        RuntimeError: If the scan finished in a failure state.
+    """
+    state = scan_job_state(job)
+    logger.info(
+        "Dataplex scan status: %s job=%s state=%s",
+        scan_name,
+        job_id,
+        state,
+    )
+    if state not in TERMINAL_JOB_STATES:
+        return False
+    if state not in SUCCESS_JOB_STATES:
+        raise RuntimeError(
+            f"Dataplex scan {scan_name} job {job_id} finished with {state}."
+        )
+    if state == "SUCCEEDED_WITH_ERRORS":
+        logger.warning(
+            "Dataplex scan %s job=%s succeeded with errors.",
+            scan_name,
+            job_id,
+        )
+    return True
+
+
 def wait_for_scan_job(
     scan_name: str,
     job_id: str,
@@ -496,31 +588,265 @@ def wait_for_scan_job(
     Raises:
         RuntimeError: If the scan finishes in a failure state.
     """
-    url = f"{data_scans_url()}/{scan_name}/jobs/{job_id}?view=FULL"
+    url = scan_job_url(scan_name, job_id)
     while True:
         data = request("GET", url, token)
-        state = data.get("state") or data.get("status", {}).get("state") or "UNKNOWN"
-        logger.info(
-            "Dataplex scan status: %s job=%s state=%s",
-            scan_name,
-            job_id,
-            state,
-        )
-        if state in TERMINAL_JOB_STATES:
-            if state not in SUCCESS_JOB_STATES:
-                raise RuntimeError(
-                    f"Dataplex scan {scan_name} job {job_id} finished with {state}."
-                )
-            if state == "SUCCEEDED_WITH_ERRORS":
-                logger.warning(
-                    "Dataplex scan %s job=%s succeeded with errors.",
-                    scan_name,
-                    job_id,
-                )
+        if scan_job_finished(scan_name, job_id, data):
             return data
         time.sleep(poll_interval)
 
 
+class ScanJobPoller:
+    """Poll every outstanding Dataplex scan job from one background thread.
+
+    Table workers register their scan jobs and block on a future while a single
+    thread issues one status request per outstanding job per poll interval.
+    Newly registered jobs are checked immediately.
+    """
+
+    def __init__(self, token: str, poll_interval: int) -> None:
+        """Start the polling thread.
+
+        Args:
+            token: Bearer token.
+            poll_interval: Seconds between polling rounds.
+        """
+        self._token = token
+        self._poll_interval = poll_interval
+        self._jobs: dict[tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="dataplex-scan-poller", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def submit(self, scan_name: str, job_id: str) -> Future:
+        """Register a scan job and return a future for its final response.
+
+        Args:
+            scan_name: Dataplex data scan ID.
+            job_id: DataScanJob ID.
+
+        Returns:
+            Future resolved with the final job response, or with the
+            RuntimeError raised for a failed job.
+
+        Raises:
+            RuntimeError: If the poller is closed.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ScanJobPoller is closed.")
+            future = self._jobs.setdefault((scan_name, job_id), Future())
+        self._wakeup.set()
+        return future
+
+    def wait(self, scan_name: str, job_id: str) -> dict:
+        """Block until a scan job reaches a terminal state.
+
+        Args:
+            scan_name: Dataplex data scan ID.
+            job_id: DataScanJob ID.
+
+        Returns:
+            Final job response.
+
+        Raises:
+            RuntimeError: If the scan finishes in a failure state.
+        """
+        return self.submit(scan_name, job_id).result()
+
+    def close(self) -> None:
+        """Stop polling and fail any job that is still outstanding."""
+        with self._lock:
+            self._closed = True
+            outstanding = list(self._jobs.values())
+            self._jobs.clear()
+        self._wakeup.set()
+        self._thread.join()
+        for future in outstanding:
+            future.set_exception(RuntimeError("ScanJobPoller closed before job ended."))
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            with self._lock:
+                if self._closed:
+                    return
+                jobs = list(self._jobs.items())
+            for (scan_name, job_id), future in jobs:
+                if self._poll(scan_name, job_id, future):
+                    with self._lock:
+                        self._jobs.pop((scan_name, job_id), None)
+            self._wakeup.wait(self._poll_interval if jobs else None)
+
+    def _poll(self, scan_name: str, job_id: str, future: Future) -> bool:
+        try:
+            job = request("GET", scan_job_url(scan_name, job_id), self._token)
+            if not scan_job_finished(scan_name, job_id, job):
+                return False
+        except RuntimeError as e:
+            future.set_exception(e)
+            return True
+        future.set_result(job)
+        return True
+
+
+def payload_fingerprint(payload: dict) -> str:
+    """Return a stable fingerprint of a DataScan payload.
+
+    Args:
+        payload: DataScan create payload.
+
+    Returns:
+        Short hex digest that changes whenever the scan configuration changes.
+    """
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+class EnrichmentJournal:
+    """Local JSON journal of enrichment progress for one project and dataset.
+
+    The journal records the job started for each scan, together with a
+    fingerprint of the scan payload, and the per-table steps that completed.
+    Every update is written to disk immediately, so an interrupted run leaves a
+    journal the next run can resume from. A run where every target succeeds
+    clears the journal, so the next run starts fresh.
+    """
+
+    def __init__(self, path: Path, scope: dict[str, str], reset: bool = False) -> None:
+        """Load the journal, discarding it if it belongs to another scope.
+
+        Args:
+            path: State file path.
+            scope: Project, dataset, and location the run enriches.
+            reset: Whether to ignore any existing state.
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self._data = {
+            "version": STATE_FILE_VERSION,
+            "scope": scope,
+            "scans": {},
+            "steps": {},
+        }
+        if reset or not path.exists():
+            return
+        try:
+            loaded = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Ignoring unreadable state file %s: %s", path, e)
+            return
+        if loaded.get("version") != STATE_FILE_VERSION or loaded.get("scope") != scope:
+            logger.warning(
+                "Ignoring state file %s: it was written for a different scope.",
+                path,
+            )
+            return
+        self._data = loaded
+        logger.info("Resuming enrichment from state file %s.", path)
+
+    def scan_job(self, scan_name: str, payload: dict) -> str | None:
+        """Return the journaled job ID for a scan with an unchanged payload.
+
+        Args:
+            scan_name: Dataplex data scan ID.
+            payload: DataScan payload the current run would submit.
+
+        Returns:
+            Job ID from an earlier run, or None.
+        """
+        with self._lock:
+            entry = self._data["scans"].get(scan_name)
+        if not entry or entry.get("fingerprint") != payload_fingerprint(payload):
+            return None
+        return entry.get("job_id")
+
+    def record_scan_job(self, scan_name: str, payload: dict, job_id: str) -> None:
+        """Record the job started for a scan.
+
+        Args:
+            scan_name: Dataplex data scan ID.
+            payload: DataScan payload the job runs.
+            job_id: DataScanJob ID.
+        """
+        with self._lock:
+            self._data["scans"][scan_name] = {
+                "fingerprint": payload_fingerprint(payload),
+                "job_id": job_id,
+            }
+            self._save()
+
+    def step_done(self, target: str, step: str, version: str) -> bool:
+        """Report whether a step already completed for the same input version.
+
+        Args:
+            target: Table ID the step applies to.
+            step: Step name.
+            version: Identifier of the step input, such as a scan or job name.
+
+        Returns:
+            True if the step completed with this version.
+        """
+        with self._lock:
+            return self._data["steps"].get(target, {}).get(step) == version
+
+    def record_step(self, target: str, step: str, version: str) -> None:
+        """Record a completed step.
+
+        Args:
+            target: Table ID the step applies to.
+            step: Step name.
+            version: Identifier of the step input, such as a scan or job name.
+        """
+        with self._lock:
+            self._data["steps"].setdefault(target, {})[step] = version
+            self._save()
+
+    def clear(self) -> None:
+        """Delete the journal after a run in which every target succeeded."""
+        with self._lock:
+            self._data["scans"] = {}
+            self._data["steps"] = {}
+            self._path.unlink(missing_ok=True)
+
+    def _save(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self._path.with_suffix(f"{self._path.suffix}.tmp")
+        temporary.write_text(json.dumps(self._data, indent=2), encoding="utf-8")
+        temporary.replace(self._path)
+
+
+def scan_job_reusable(scan_name: str, job_id: str, token: str) -> bool:
+    """Report whether a journaled scan job can be re-attached to.
+
+    Args:
+        scan_name: Dataplex data scan ID.
+        job_id: DataScanJob ID from the journal.
+        token: Bearer token.
+
+    Returns:
+        True if the job is still running or finished successfully; False if it
+        failed or can no longer be read.
+    """
+    try:
+        job = request("GET", scan_job_url(scan_name, job_id), token)
+    except RuntimeError as e:
+        logger.info("Cannot re-attach to %s job=%s: %s", scan_name, job_id, e)
+        return False
+    state = scan_job_state(job)
+    return state not in TERMINAL_JOB_STATES or state in SUCCESS_JOB_STATES
+
+
 def create_and_run_scan(
     scan_name: str,
     payload: dict,
@@ -528,6 +854,8 @@ def create_and_run_scan(
     wait: bool,
     poll_interval: int,
     dry_run: bool,
+    poller: ScanJobPoller | None = None,
+    journal: EnrichmentJournal | None = None,
 ) -> dict | None:
     """Create, run, and optionally wait for a Dataplex scan.
 
@@ -538,15 +866,32 @@ def create_and_run_scan(
         wait: Whether to poll job completion.
         poll_interval: Seconds between polling attempts.
         dry_run: Whether to skip API calls.
+        poller: Optional shared poller. When set, the job is polled by the
+            poller's thread instead of a per-scan sleep loop.
+        journal: Optional state journal. A journaled job for the same payload
+            that is still running or succeeded is re-attached to instead of
+            starting a new run.
 
     Returns:
         Final job response if wait is enabled, otherwise None.
     """
-    upsert_scan(scan_name, payload, token, dry_run)
-    job_id = run_scan(scan_name, token, dry_run)
-    if wait and job_id:
-        return wait_for_scan_job(scan_name, job_id, token, poll_interval)
-    return None
+    job_id = None
+    if journal is not None and not dry_run:
+        job_id = journal.scan_job(scan_name, payload)
+        if job_id and scan_job_reusable(scan_name, job_id, token):
+            logger.info("Re-attached to Dataplex scan %s job=%s.", scan_name, job_id)
+        else:
+            job_id = None
+    if job_id is None:
+        upsert_scan(scan_name, payload, token, dry_run)
+        job_id = run_scan(scan_name, token, dry_run)
+        if journal is not None and job_id:
+            journal.record_scan_job(scan_name, payload, job_id)
+    if not wait or not job_id:
+        return None
+    if poller is not None:
+        return poller.wait(scan_name, job_id)
+    return wait_for_scan_job(scan_name, job_id, token, poll_interval)
 
 
 def count_non_partitioned_tables(dataset_id: str, token: str) -> int:
@@ -888,12 +1233,38 @@ def parse_args() -> argparse.Namespace:
             "interval spends most of the wall clock asleep."
         ),
     )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=int(os.getenv("ENRICH_MAX_WORKERS", str(DEFAULT_MAX_WORKERS))),
+        help=(
+            "Tables enriched concurrently. Scan jobs of all in-flight tables "
+            "overlap, so set this to the table count to run every scan at once."
+        ),
+    )
+    parser.add_argument(
+        "--state-file",
+        type=Path,
+        default=None,
+        help=(
+            "Enrichment state journal. Defaults to "
+            ".enrichment_state/<project>.<dataset>.json."
+        ),
+    )
+    parser.add_argument(
+        "--reset-state",
+        action="store_true",
+        help="Ignore the state journal and run every scan and step again.",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
         help="Log Dataplex payloads without creating or running scans.",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.max_workers < 1:
+        raise ValueError(f"--max-workers must be at least 1: {args.max_workers}")
+    return args
 
 
 def enrich_table(
@@ -903,6 +1274,8 @@ def enrich_table(
     sampling_percent: float | None,
     export_results_table: str | None,
     publish: bool,
+    poller: ScanJobPoller | None = None,
+    journal: EnrichmentJournal | None = None,
 ) -> None:
     """Run profile + documentation scans for one table and publish the results.
 
@@ -913,6 +1286,8 @@ def enrich_table(
         sampling_percent: Resolved sampling percentage (STANDARD mode).
         export_results_table: Optional profile export table URI.
         publish: Whether to publish results.
+        poller: Optional shared scan job poller used when waiting.
+        journal: Optional state journal used to skip completed work.
     """
     table_resource = bigquery_table_resource(PROJECT_ID, DATASET_ID, table_id)
 
@@ -926,7 +1301,14 @@ def enrich_table(
             export_results_table=export_results_table,
         )
         create_and_run_scan(
-            name, payload, token, args.wait, args.poll_interval, args.dry_run
+            name,
+            payload,
+            token,
+            args.wait,
+            args.poll_interval,
+            args.dry_run,
+            poller=poller,
+            journal=journal,
         )
 
     if args.skip_table_docs:
@@ -939,24 +1321,94 @@ def enrich_table(
         publish=publish,
     )
     job = create_and_run_scan(
-        name, payload, token, args.wait, args.poll_interval, args.dry_run
+        name,
+        payload,
+        token,
+        args.wait,
+        args.poll_interval,
+        args.dry_run,
+        poller=poller,
+        journal=journal,
     )
     if not publish:
         return
 
     # Publish to Knowledge Catalog / the Insights tab (labels) ...
-    publish_documentation_to_table(DATASET_ID, table_id, name, token, args.dry_run)
+    if journal is not None and journal.step_done(table_id, "publish", name):
+        logger.info("Documentation already published to %s; skipping.", table_id)
+    else:
+        publish_documentation_to_table(DATASET_ID, table_id, name, token, args.dry_run)
+        if journal is not None and not args.dry_run:
+            journal.record_step(table_id, "publish", name)
     # ... and write the generated descriptions into the table schema.
-    if not args.skip_schema_write_back:
-        overview, descriptions = extract_table_documentation(job)
-        apply_documentation_to_schema(
-            DATASET_ID, table_id, overview, descriptions, token, args.dry_run
+    if args.skip_schema_write_back:
+        return
+    job_name = (job or {}).get("name", "")
+    if journal is not None and journal.step_done(
+        table_id, "schema_write_back", job_name
+    ):
+        logger.info("Schema descriptions already written to %s; skipping.", table_id)
+        return
+    overview, descriptions = extract_table_documentation(job)
+    apply_documentation_to_schema(
+        DATASET_ID, table_id, overview, descriptions, token, args.dry_run
+    )
+    written = job_name and (overview or descriptions) and not args.dry_run
+    if journal is not None and written:
+        journal.record_step(table_id, "schema_write_back", job_name)
+
+
+def enrich_dataset(
+    args: argparse.Namespace,
+    token: str,
+    publish: bool,
+    poller: ScanJobPoller | None = None,
+    journal: EnrichmentJournal | None = None,
+) -> None:
+    """Run the dataset-level documentation scan.
+
+    Args:
+        args: Parsed CLI arguments.
+        token: Bearer token.
+        publish: Whether to publish results.
+        poller: Optional shared scan job poller used when waiting.
+        journal: Optional state journal used to re-attach to the scan job.
+    """
+    name = scan_id("dataset-docs", DATASET_ID)
+    payload = build_data_documentation_payload(
+        resource=bigquery_dataset_resource(PROJECT_ID, DATASET_ID),
+        generation_scope=None,
+        publish=publish,
+    )
+    try:
+        create_and_run_scan(
+            name,
+            payload,
+            token,
+            args.wait,
+            args.poll_interval,
+            args.dry_run,
+            poller=poller,
+            journal=journal,
+        )
+    except RuntimeError as e:
+        # Dataset-level documentation needs at least 2 non-partitioned
+        # tables. That is a Dataplex limitation, not a configuration error,
+        # and it must not block the table-level scans that actually carry
+        # the column descriptions.
+        if "at least 2 non-partitioned tables" not in str(e):
+            raise
+        logger.warning(
+            "Skipping dataset-level documentation for %s: Dataplex requires "
+            "at least 2 non-partitioned tables in the dataset. Table-level "
+            "profile and documentation scans continue normally.",
+            DATASET_ID,
         )
 
 
 def main() -> None:
     """Create and run Dataplex metadata enrichment scans."""
-    global DATASET_ID
+    global DATASET_ID, _http_session
 
     if not PROJECT_ID:
         raise ValueError("GOOGLE_CLOUD_PROJECT must be set.")
@@ -973,14 +1425,28 @@ def main() -> None:
         sampling_percent = 10.0
     token = "" if args.dry_run else get_access_token()
     publish = not args.no_publish
+    # One connection per table worker plus one for the scan job poller.
+    _http_session = create_http_session(args.max_workers + 1)
+    journal = None
+    if not args.dry_run:
+        journal = EnrichmentJournal(
+            args.state_file or STATE_DIR / f"{PROJECT_ID}.{DATASET_ID}.json",
+            scope={
+                "project": PROJECT_ID,
+                "dataset": DATASET_ID,
+                "location": DATAPLEX_LOCATION,
+            },
+            reset=args.reset_state,
+        )
 
     tables = list(args.tables)
     logger.info(
-        "Enriching %d tables (project=%s, dataset=%s, location=%s).",
+        "Enriching %d tables (project=%s, dataset=%s, location=%s, workers=%d).",
         len(tables),
         PROJECT_ID,
         DATASET_ID,
         DATAPLEX_LOCATION,
+        args.max_workers,
     )
     if publish and not args.skip_schema_write_back and not args.wait:
         logger.warning(
@@ -1000,38 +1466,50 @@ def main() -> None:
             )
             skip_dataset_docs = True
 
-    if not skip_dataset_docs:
-        name = scan_id("dataset-docs", DATASET_ID)
-        payload = build_data_documentation_payload(
-            resource=bigquery_dataset_resource(PROJECT_ID, DATASET_ID),
-            generation_scope=None,
-            publish=publish,
-        )
-        try:
-            create_and_run_scan(
-                name, payload, token, args.wait, args.poll_interval, args.dry_run
-            )
-        except RuntimeError as e:
-            # Dataset-level documentation needs at least 2 non-partitioned
-            # tables. That is a Dataplex limitation, not a configuration error,
-            # and it must not block the table-level scans that actually carry
-            # the column descriptions.
-            if "at least 2 non-partitioned tables" not in str(e):
-                raise
-            logger.warning(
-                "Skipping dataset-level documentation for %s: Dataplex requires "
-                "at least 2 non-partitioned tables in the dataset. Table-level "
-                "profile and documentation scans continue normally.",
-                DATASET_ID,
+    failed: list[str] = []
+    with (
+        ScanJobPoller(token, args.poll_interval) as poller,
+        ThreadPoolExecutor(
+            max_workers=args.max_workers, thread_name_prefix="enrich"
+        ) as pool,
+    ):
+        futures: dict[Future, str] = {}
+        if not skip_dataset_docs:
+            future = pool.submit(enrich_dataset, args, token, publish, poller, journal)
+            futures[future] = DATASET_ID
+        for table_id in tables:
+            future = pool.submit(
+                enrich_table,
+                table_id,
+                args,
+                token,
+                sampling_percent,
+                export_results_table,
+                publish,
+                poller,
+                journal,
             )
-
-    for table_id in tables:
-        enrich_table(
-            table_id, args, token, sampling_percent, export_results_table, publish
-        )
-
+            futures[future] = table_id
+        for future in as_completed(futures):
+            target = futures[future]
+            try:
+                future.result()
+            except RuntimeError as e:
+                logger.error("Enrichment failed for %s: %s", target, e)
+                failed.append(target)
+
+    enriched = [table_id for table_id in tables if table_id not in failed]
     if not args.dry_run:
-        log_view_links(DATASET_ID, tables)
+        log_view_links(DATASET_ID, enriched)
+    if failed:
+        raise RuntimeError(
+            f"Metadata enrichment failed for {len(failed)} target(s): "
+            f"{', '.join(sorted(failed))}."
+        )
+    if journal is not None:
+        # Only an interrupted or failed run resumes; a completed run must not
+        # re-attach to its finished jobs or skip publishing next time.
+        journal.clear()
     logger.info("Metadata enrichment finished.")
 
 
@@ -15,12 +15,15 @@ if str(PROJECT_ROOT) not in sys.path:
 from config.agent_definitions import unique_table_ids  # noqa: E402
 from scripts import enrich_bigquery_metadata as enrich  # noqa: E402
 from scripts.enrich_bigquery_metadata import (  # noqa: E402
+    EnrichmentJournal,
+    ScanJobPoller,
     apply_documentation_to_schema,
     bigquery_dataset_resource,
     bigquery_table_resource,
     build_data_documentation_payload,
     build_data_profile_payload,
     count_non_partitioned_tables,
+    create_and_run_scan,
     documentation_labels,
     enrich_table,
     extract_table_documentation,
@@ -28,6 +31,7 @@ from scripts.enrich_bigquery_metadata import (  # noqa: E402
     normalize_results_table,
     parse_args,
     publish_documentation_to_table,
+    request,
     scan_id,
     update_mask_for_payload,
     upsert_scan,
@@ -240,6 +244,71 @@ def test_wait_for_scan_job_accepts_succeeded_with_errors(monkeypatch):
     assert result["state"] == "SUCCEEDED_WITH_ERRORS"
 
 
+class _FakeResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class _FakeSession:
+    def __init__(self, text: str) -> None:
+        self.calls: list[tuple[str, str, dict]] = []
+        self._text = text
+
+    def request(self, method: str, url: str, **kwargs) -> _FakeResponse:
+        self.calls.append((method, url, kwargs))
+        return _FakeResponse(self._text)
+
+
+def test_request_sends_json_through_the_shared_session(monkeypatch):
+    """Tests REST calls reuse the pooled session with auth and quota headers."""
+    session = _FakeSession('{"name": "scan-a"}')
+    monkeypatch.setattr(enrich, "PROJECT_ID", "project-a")
+    monkeypatch.setattr(enrich, "_http_session", session)
+
+    first = request("POST", "https://example.test/a", "token", {"k": "v"})
+    request("GET", "https://example.test/b", "token")
+
+    assert first == {"name": "scan-a"}
+    assert [call[0] for call in session.calls] == ["POST", "GET"]
+    kwargs = session.calls[0][2]
+    assert kwargs["headers"]["Authorization"] == "Bearer token"
+    assert kwargs["headers"]["X-Goog-User-Project"] == "project-a"
+    assert kwargs["data"] == '{"k": "v"}'
+    assert session.calls[1][2]["data"] is None
+
+
+def test_request_raises_on_api_error_payload(monkeypatch):
+    """Tests an error body is surfaced as RuntimeError like the curl path did."""
+    session = _FakeSession('{"error": {"code": 404, "message": "not found"}}')
+    monkeypatch.setattr(enrich, "_http_session", session)
+
+    with pytest.raises(RuntimeError, match="API error 404: not found"):
+        request("GET", "https://example.test/a", "token")
+
+
+def test_scan_job_poller_resolves_every_outstanding_job(monkeypatch):
+    """Tests one poller thread tracks several jobs to their terminal states."""
+    states = {
+        "job-a": iter(["RUNNING", "SUCCEEDED"]),
+        "job-b": iter(["RUNNING", "RUNNING", "FAILED"]),
+    }
+
+    def fake_request(method: str, url: str, token: str, payload: dict | None = None):
+        job_id = url.split("/jobs/")[1].split("?")[0]
+        return {"state": next(states[job_id])}
+
+    monkeypatch.setattr(enrich, "PROJECT_ID", "project-a")
+    monkeypatch.setattr(enrich, "request", fake_request)
+
+    with ScanJobPoller(token="token", poll_interval=0) as poller:
+        succeeded = poller.submit("scan-a", "job-a")
+        failed = poller.submit("scan-b", "job-b")
+
+        assert succeeded.result(timeout=5) == {"state": "SUCCEEDED"}
+        with pytest.raises(RuntimeError, match="job-b finished with FAILED"):
+            failed.result(timeout=5)
+
+
 def test_parse_args_rejects_invalid_env_profile_mode(monkeypatch):
     """Tests env profile mode is validated like CLI profile mode."""
     monkeypatch.setattr(sys, "argv", ["enrich_bigquery_metadata.py"])
@@ -543,7 +612,7 @@ def test_enrich_table_publishes_labels_then_writes_the_schema(monkeypatch):
     monkeypatch.setattr(
         enrich,
         "create_and_run_scan",
-        lambda name, payload, token, wait, poll_interval, dry_run: job,
+        lambda name, payload, token, wait, poll_interval, dry_run, **_: job,
     )
     monkeypatch.setattr(
         enrich,
@@ -586,7 +655,7 @@ def test_enrich_table_honours_skip_schema_write_back(monkeypatch):
     monkeypatch.setattr(
         enrich,
         "create_and_run_scan",
-        lambda name, payload, token, wait, poll_interval, dry_run: {},
+        lambda name, payload, token, wait, poll_interval, dry_run, **_: {},
     )
     monkeypatch.setattr(
         enrich,
@@ -611,3 +680,166 @@ def test_enrich_table_honours_skip_schema_write_back(monkeypatch):
     )
 
     assert published == ["orders"]
+
+
+_SCOPE = {"project": "project-a", "dataset": "dataset_a", "location": "us-central1"}
+
+
+def test_create_and_run_scan_reattaches_to_journaled_job(monkeypatch, tmp_path):
+    """Tests a re-run resumes a running journaled job instead of starting a scan."""
+    payload = build_data_documentation_payload(
+        resource="//bigquery.googleapis.com/projects/project-a/datasets/d/tables/t",
+        generation_scope="ALL",
+        publish=True,
+    )
+    journal = EnrichmentJournal(tmp_path / "state.json", _SCOPE)
+    journal.record_scan_job("scan-a", payload, "job-1")
+    calls: list[tuple[str, str]] = []
+    states = iter(["RUNNING", "SUCCEEDED"])
+
+    def fake_request(method: str, url: str, token: str, payload: dict | None = None):
+        calls.append((method, url))
+        return {"name": "jobs/job-1", "state": next(states)}
+
+    monkeypatch.setattr(enrich, "PROJECT_ID", "project-a")
+    monkeypatch.setattr(enrich, "request", fake_request)
+
+    job = create_and_run_scan(
+        "scan-a",
+        payload,
+        token="token",
+        wait=True,
+        poll_interval=0,
+        dry_run=False,
+        journal=EnrichmentJournal(tmp_path / "state.json", _SCOPE),
+    )
+
+    assert job["state"] == "SUCCEEDED"
+    assert [method for method, _ in calls] == ["GET", "GET"]
+    assert all("/scan-a/jobs/job-1" in url for _, url in calls)
+
+
+def test_create_and_run_scan_reruns_when_payload_changed(monkeypatch, tmp_path):
+    """Tests a changed scan configuration starts a new job and journals it."""
+    old_payload = build_data_documentation_payload(
+        resource="//bigquery.googleapis.com/projects/project-a/datasets/d/tables/t",
+        generation_scope="ALL",
+        publish=True,
+    )
+    new_payload = build_data_documentation_payload(
+        resource="//bigquery.googleapis.com/projects/project-a/datasets/d/tables/t",
+        generation_scope="SQL_QUERIES",
+        publish=True,
+    )
+    path = tmp_path / "state.json"
+    EnrichmentJournal(path, _SCOPE).record_scan_job("scan-a", old_payload, "job-1")
+    monkeypatch.setattr(
+        enrich, "upsert_scan", lambda scan_name, payload, token, dry_run: None
+    )
+    monkeypatch.setattr(enrich, "run_scan", lambda scan_name, token, dry_run: "job-2")
+
+    create_and_run_scan(
+        "scan-a",
+        new_payload,
+        token="token",
+        wait=False,
+        poll_interval=0,
+        dry_run=False,
+        journal=EnrichmentJournal(path, _SCOPE),
+    )
+
+    assert EnrichmentJournal(path, _SCOPE).scan_job("scan-a", new_payload) == "job-2"
+
+
+def test_enrichment_journal_discards_state_for_another_dataset(tmp_path):
+    """Tests a state file from a different dataset is not resumed."""
+    path = tmp_path / "state.json"
+    EnrichmentJournal(path, _SCOPE).record_step("orders", "publish", "scan-a")
+
+    other = EnrichmentJournal(path, {**_SCOPE, "dataset": "dataset_b"})
+
+    assert not other.step_done("orders", "publish", "scan-a")
+    assert EnrichmentJournal(path, _SCOPE).step_done("orders", "publish", "scan-a")
+
+
+def test_enrich_table_skips_steps_completed_for_the_same_job(monkeypatch, tmp_path):
+    """Tests journaled publish and write-back steps are not repeated."""
+    job = {
+        "name": "projects/p/locations/l/dataScans/s/jobs/job-1",
+        "dataDocumentationResult": {"tableResult": {"overview": "Customer orders."}},
+    }
+    journal = EnrichmentJournal(tmp_path / "state.json", _SCOPE)
+    journal.record_step("orders", "publish", "bq-caapi-table-docs-dataset-a-orders")
+    journal.record_step("orders", "schema_write_back", job["name"])
+
+    def fail(*args, **kwargs):
+        raise AssertionError("completed steps must not run again")
+
+    monkeypatch.setattr(enrich, "PROJECT_ID", "project-a")
+    monkeypatch.setattr(enrich, "DATASET_ID", "dataset_a")
+    monkeypatch.setattr(
+        enrich,
+        "create_and_run_scan",
+        lambda name, payload, token, wait, poll_interval, dry_run, **_: job,
+    )
+    monkeypatch.setattr(enrich, "publish_documentation_to_table", fail)
+    monkeypatch.setattr(enrich, "apply_documentation_to_schema", fail)
+
+    enrich_table(
+        "orders",
+        _enrich_args(),
+        token="token",
+        sampling_percent=None,
+        export_results_table=None,
+        publish=True,
+        journal=journal,
+    )
+
+
+def test_main_clears_the_journal_after_a_successful_run(monkeypatch, tmp_path):
+    """Tests a second successful run neither resumes nor skips the first run's work."""
+    state_file = tmp_path / "state.json"
+    runs: list[dict[str, bool]] = []
+
+    def fake_enrich_table(table_id, *args):
+        journal = args[-1]
+        payload = {"table": table_id}
+        runs.append(
+            {
+                "reattached": journal.scan_job("scan-a", payload) is not None,
+                "skipped_publish": journal.step_done(table_id, "publish", "scan-a"),
+            }
+        )
+        journal.record_scan_job("scan-a", payload, f"job-{len(runs)}")
+        journal.record_step(table_id, "publish", "scan-a")
+
+    monkeypatch.setattr(enrich, "PROJECT_ID", "project-a")
+    monkeypatch.setattr(enrich, "DATAPLEX_LOCATION", "us-central1")
+    monkeypatch.setattr(
+        enrich,
+        "parse_args",
+        lambda: _enrich_args(
+            dataset="dataset_a",
+            tables=["orders"],
+            profile_results_table=None,
+            sampling_percent=None,
+            profile_mode="LIGHTWEIGHT",
+            no_publish=False,
+            max_workers=1,
+            state_file=state_file,
+            reset_state=False,
+            skip_dataset_docs=True,
+        ),
+    )
+    monkeypatch.setattr(enrich, "get_access_token", lambda: "token")
+    monkeypatch.setattr(enrich, "enrich_table", fake_enrich_table)
+    monkeypatch.setattr(enrich, "log_view_links", lambda *_: None)
+
+    enrich.main()
+    assert not state_file.exists()
+    enrich.main()
+
+    assert runs == [
+        {"reattached": False, "skipped_publish": False},
+        {"reattached": False, "skipped_publish": False},
+    ]
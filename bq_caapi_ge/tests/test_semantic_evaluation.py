@@ -1,5 +1,7 @@
 """Tests for the native ADK semantic evaluation assets and metrics."""
 
+import asyncio
+from datetime import datetime, timezone
 from decimal import Decimal
 import json
 from pathlib import Path
@@ -80,10 +82,15 @@ class _FakeBigQueryClient:
         self,
         sources: tuple[str, ...],
         rows: tuple[dict[str, object], ...] = (),
+        modified: datetime | None = None,
     ) -> None:
         self.calls: list[tuple[str, object, str]] = []
         self._sources = sources
         self._rows = rows
+        self._modified = modified or datetime(2026, 8, 1, tzinfo=timezone.utc)
+
+    def get_table(self, source: str) -> object:
+        return SimpleNamespace(modified=self._modified)
 
     def query(self, sql: str, *, job_config: object, location: str) -> object:
         self.calls.append((sql, job_config, location))
@@ -241,6 +248,35 @@ def test_rows_equal_preserves_order_when_required():
     )
 
 
+def test_rows_equal_matches_unordered_rows_as_multiset():
+    """Tests unordered comparison requires the same count of each distinct row."""
+    assert not metrics._rows_equal(
+        (("US", 1), ("US", 1), ("DE", 2)),
+        (("US", 1), ("DE", 2), ("DE", 2)),
+        ordered=False,
+        relative=1e-6,
+        absolute=1e-9,
+    )
+
+
+def test_rows_equal_distinguishes_null_from_zero_in_numeric_columns():
+    """Tests NULL and zero differ even though zero is within absolute tolerance."""
+    assert not metrics._rows_equal(
+        (("US", None),),
+        (("US", 0.0),),
+        ordered=True,
+        relative=1e-6,
+        absolute=1e-9,
+    )
+    assert metrics._rows_equal(
+        (("US", None), ("DE", 2)),
+        (("DE", 2.0000000001), ("US", None)),
+        ordered=False,
+        relative=1e-6,
+        absolute=1e-9,
+    )
+
+
 def test_normalize_sql_removes_supported_code_fence():
     """Tests SQL extraction accepts the model's fenced SQL representation."""
     assert metrics._normalize_sql("```sql\nSELECT 1\n```") == "SELECT 1"
@@ -281,3 +317,78 @@ def test_execute_checked_query_rejects_unexpected_source_before_execution():
         )
 
     assert len(client.calls) == 1
+
+
+def test_bigquery_result_match_reuses_cached_gold_rows(monkeypatch, tmp_path):
+    """Tests repeat runs execute only candidate SQL when gold sources are unchanged."""
+    source = "johanesa-playground-326616.thelook_ecommerce.orders"
+    client = _FakeBigQueryClient((source,), ({"completed_orders": 42},))
+    monkeypatch.setattr(metrics.bigquery, "Client", lambda **_: client)
+    monkeypatch.setenv("EVAL_GOLD_CACHE_PATH", str(tmp_path / "gold.json"))
+    invocation = _invocation(
+        "How many completed orders were placed?",
+        sql_text="SELECT 42 AS completed_orders",
+    )
+    metric = _metric("bigquery_result_match")
+
+    first = asyncio.run(metrics.bigquery_result_match(metric, [invocation], None, None))
+    first_calls = len(client.calls)
+    second = asyncio.run(
+        metrics.bigquery_result_match(metric, [invocation], None, None)
+    )
+
+    assert first.overall_score == 1.0
+    assert second.overall_score == 1.0
+    assert first_calls == 4
+    assert len(client.calls) - first_calls == 2
+    assert all(call[0] == "SELECT 42 AS completed_orders" for call in client.calls[4:])
+
+
+def test_gold_cache_round_trips_nested_timestamps(tmp_path):
+    """Tests STRUCT/ARRAY values holding timestamps are cached like live rows."""
+    value = {
+        "created_at": datetime(2026, 8, 1, 12, 30, tzinfo=timezone.utc),
+        "items": [{"price": Decimal("9.50")}],
+    }
+    rows = ((1, metrics._normalize_value(value)),)
+    path = tmp_path / "gold_cache.json"
+
+    metrics._write_gold_cache(path, "key", rows)
+
+    assert metrics._read_gold_cache(path, "key") == rows
+    assert rows[0][1] == {
+        "created_at": "2026-08-01T12:30:00+00:00",
+        "items": [{"price": 9.5}],
+    }
+
+
+def test_gold_cache_write_tolerates_unnormalized_values(tmp_path):
+    """Tests values json cannot encode natively are stored as strings."""
+    path = tmp_path / "gold_cache.json"
+    rows = (({"at": datetime(2026, 8, 1, tzinfo=timezone.utc)},),)
+
+    metrics._write_gold_cache(path, "key", rows)
+
+    assert metrics._read_gold_cache(path, "key") == (
+        ({"at": "2026-08-01 00:00:00+00:00"},),
+    )
+
+
+def test_gold_cache_key_changes_when_source_table_is_modified():
+    """Tests gold cache entries are invalidated by a newer source table version."""
+    sql = "SELECT 1"
+    source = "johanesa-playground-326616.thelook_ecommerce.orders"
+
+    original = metrics._gold_cache_key(
+        sql, location="US", table_versions={source: "2026-08-01T00:00:00+00:00"}
+    )
+    modified = metrics._gold_cache_key(
+        sql, location="US", table_versions={source: "2026-08-02T00:00:00+00:00"}
+    )
+
+    assert original != modified
+    assert original == metrics._gold_cache_key(
+        f"  {sql}\n",
+        location="us",
+        table_versions={source: "2026-08-01T00:00:00+00:00"},
+    )
@@ -6,7 +6,8 @@ These are hermetic: no live OAuth, backend, or network calls. They require the
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+from datetime import UTC, datetime, timedelta
+import json
 import os
 from pathlib import Path
 import sys
@@ -43,7 +44,7 @@ def test_validate_oauth_state():
 
 
 def test_is_token_expired():
-    now = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    now = datetime(2024, 1, 1, 12, 0, 0, tzinfo=UTC)
     future = (now + timedelta(hours=1)).isoformat()
     past = (now - timedelta(hours=1)).isoformat()
     near = (now + timedelta(seconds=30)).isoformat()
@@ -90,7 +91,7 @@ def test_format_response_text():
 
 
 def test_ensure_valid_token_passes_live_token():
-    future = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+    future = (datetime.now(UTC) + timedelta(hours=1)).isoformat()
     data = {"access_token": "tok", "token_expiry": future}
     token, error = web_app._ensure_valid_token(data)
     assert token == "tok"
@@ -108,7 +109,7 @@ def test_ensure_valid_token_refreshes_when_expired(monkeypatch):
     class _FakeCreds:
         def __init__(self):
             self.token = "old"
-            self.expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+            self.expiry = datetime.now(UTC) + timedelta(hours=1)
 
         def refresh(self, _request):
             self.token = "refreshed-tok"
@@ -135,6 +136,26 @@ class _FakeResp:
         return self._payload
 
 
+class _FakeHttp:
+    """Stands in for the shared keep-alive ``requests.Session``."""
+
+    def __init__(self, post):
+        self.post = post
+
+
+class _FakeStream:
+    def __init__(self, lines):
+        self._lines = lines
+        self.ok = True
+        self.closed = False
+
+    def iter_lines(self):
+        yield from self._lines
+
+    def close(self):
+        self.closed = True
+
+
 def test_local_session_is_reused_and_recreated_on_token_change(monkeypatch):
     calls: list[tuple[str, dict]] = []
 
@@ -142,7 +163,7 @@ def test_local_session_is_reused_and_recreated_on_token_change(monkeypatch):
         calls.append((url, json))
         return _FakeResp({"id": f"sess-{len(calls)}"})
 
-    monkeypatch.setattr(web_app.requests, "post", fake_post)
+    monkeypatch.setattr(web_app, "_http", lambda: _FakeHttp(fake_post))
     data = {"user_email": "u@example.com"}
 
     sid = web_app._get_or_create_local_session("http://x", "u@example.com", "tok", data)
@@ -167,6 +188,118 @@ def test_local_session_is_reused_and_recreated_on_token_change(monkeypatch):
     assert calls[1][1]["state"][web_app.TOKEN_STATE_KEY] == "tok-2"
 
 
+# --- streaming --------------------------------------------------------------
+
+
+def _sse_payloads(body: str) -> list[dict]:
+    frames = [frame for frame in body.split("\n\n") if frame]
+    return [json.loads(frame.removeprefix("data: ")) for frame in frames]
+
+
+def test_parse_stream_event_accepts_ndjson_and_sse_lines():
+    assert web_app.parse_stream_event('{"a": 1}') == {"a": 1}
+    assert web_app.parse_stream_event(b'data: {"a": 2}') == {"a": 2}
+    assert web_app.parse_stream_event("") is None
+    assert web_app.parse_stream_event(": keep-alive") is None
+    assert web_app.parse_stream_event("not json") is None
+    assert web_app.parse_stream_event("[1, 2]") is None
+
+
+def test_relay_events_forwards_deltas_before_done():
+    lines = [
+        '{"author": "planner"}',
+        '{"content": {"parts": [{"text": "{\\"status\\": "}]}}',
+        "",
+        '{"content": {"parts": [{"text": "\\"sql_executed\\"}"}]}}',
+    ]
+    frames = list(
+        web_app.relay_events(
+            lines,
+            finalize=web_app._agent_engine_output,
+            metadata={"session_id": "s-1"},
+        )
+    )
+    payloads = _sse_payloads("".join(frames))
+    assert [p["type"] for p in payloads] == ["progress", "delta", "delta", "done"]
+    assert payloads[0]["author"] == "planner"
+    assert payloads[-1]["provenance"] == {"status": "sql_executed"}
+    assert payloads[-1]["session_id"] == "s-1"
+
+
+def test_relay_events_stops_on_backend_error_event():
+    lines = ['data: {"error": "boom"}', '{"content": {"parts": [{"text": "late"}]}}']
+    payloads = _sse_payloads(
+        "".join(
+            web_app.relay_events(
+                lines, finalize=web_app.select_final_output, metadata={}
+            )
+        )
+    )
+    assert payloads == [{"type": "error", "error": "boom"}]
+
+
+def test_query_stream_relays_local_adk_events(monkeypatch):
+    upstream = _FakeStream(
+        [
+            b'data: {"content": {"parts": [{"text": "thinking"}]}}',
+            b'data: {"output": {"status": "sql_executed", "sql": "SELECT 1"}}',
+        ]
+    )
+    posts: list[tuple[str, dict]] = []
+
+    def fake_post(url, json=None, timeout=None, stream=False):
+        posts.append((url, json))
+        if url.endswith("/sessions"):
+            return _FakeResp({"id": "sess-1"})
+        assert stream is True
+        return upstream
+
+    monkeypatch.setattr(web_app, "_http", lambda: _FakeHttp(fake_post))
+    future = (datetime.now(UTC) + timedelta(hours=1)).isoformat()
+    monkeypatch.setitem(
+        web_app._SESSIONS,
+        "sid-stream",
+        {"access_token": "tok", "token_expiry": future, "user_email": "u@x"},
+    )
+    client = web_app.app.test_client()
+    with client.session_transaction() as sess:
+        sess["sid"] = "sid-stream"
+
+    response = client.post("/api/query/stream", json={"message": "hi"})
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    payloads = _sse_payloads(response.get_data(as_text=True))
+    assert payloads[0] == {"type": "delta", "text": "thinking"}
+    assert payloads[-1]["type"] == "done"
+    assert payloads[-1]["provenance"]["sql"] == "SELECT 1"
+    assert payloads[-1]["session_id"] == "sess-1"
+    assert posts[-1][0].endswith("/run_sse")
+    assert upstream.closed is True
+
+
+def test_gcp_access_token_is_cached_until_near_expiry(monkeypatch):
+    class _FakeGcpCreds:
+        def __init__(self):
+            self.token = None
+            self.expiry = None
+            self.refreshes = 0
+
+        def refresh(self, _request):
+            self.refreshes += 1
+            self.token = f"gcp-{self.refreshes}"
+            self.expiry = datetime.now(UTC).replace(tzinfo=None) + timedelta(hours=1)
+
+    creds = _FakeGcpCreds()
+    monkeypatch.setattr(web_app, "_gcp_credentials", creds)
+
+    assert web_app._get_gcp_access_token() == "gcp-1"
+    assert web_app._get_gcp_access_token() == "gcp-1"
+    assert creds.refreshes == 1
+
+    creds.expiry = datetime.now(UTC).replace(tzinfo=None)
+    assert web_app._get_gcp_access_token() == "gcp-2"
+
+
 # --- routes -----------------------------------------------------------------
 
 
@@ -8,20 +8,30 @@ The customer cannot share sample data (only the DDL and null ratios), so we
 recreate the *shape* of the problem - wide, mostly-null, one partition per day,
 nanosecond timestamps - and run the real pipeline against it.
 
+Partitions are written GENERATE_CHUNK_ROWS rows at a time: each block is
+generated, enumerated, and appended to the splayed partition on disk, so peak RAM
+follows the block size rather than POC_ROWS. With GENERATE_WORKERS > 1, dates
+are generated by a pool of spawned processes, each with its own embedded q.
+Together with POC_DATES ranges (``2022.01.03..2024.12.31``) this reproduces a
+multi-year, tens-of-millions-of-rows-per-day HDB for scale testing.
+
 Run:
     uv run python 00_generate_synthetic_hdb.py
 
-Knobs (via .env): POC_ROWS, POC_DATES.
+Knobs (via .env): POC_ROWS, POC_DATES, GENERATE_CHUNK_ROWS, GENERATE_WORKERS.
 """
 
 from __future__ import annotations
 
 import logging
+import multiprocessing
+import os
 import shutil
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 import config
-from kdb_utils import ensure_licensed_pykx, peak_rss_mb
+from kdb_utils import chunk_ranges, ensure_licensed_pykx, peak_rss_mb
 from schema import build_schema
 
 logger = logging.getLogger(__name__)
@@ -36,13 +46,16 @@ STORED = [c for c in SCHEMA if c.name != "date"]
 
 # q helper: set null value `nv` at the positions where mask `m` is true.
 kx.q("applyNull:{[c;m;nv] @[c;where m;:;nv]}")
+# q helper: enumerate block `t` against the HDB's sym file and append it to the
+# splayed partition directory `d` (created, with its .d file, on first append).
+kx.q("appendBlock:{[hdb;d;t] d upsert .Q.en[hdb;t]}")
 
 _NULLS = {"j": kx.q("0Nj"), "s": kx.q("`"), "p": kx.q("0Np")}
 _SYM_POOL = ["AAA", "BBB", "CCC", "DDD", "EEE", "FFF", "GGG", "HHH"]
 _MESSAGE_TYPES = [f"mt{group:02d}" for group in range(1, 13)]
 
 
-def _make_column(col, n: int, day: str, message_types):
+def _make_column(col, n: int, day: str, message_types, start: int = 0):
     """Generate one kdb+ column vector of length ``n`` with the right null ratio.
 
     Args:
@@ -50,6 +63,7 @@ def _make_column(col, n: int, day: str, message_types):
         n: Number of rows.
         day: Partition date in kdb+ form (e.g. "2024.01.02").
         message_types: One generated message type per row.
+        start: Index of the block's first row in the partition (for ``seq_no``).
 
     Returns:
         A PyKX vector.
@@ -57,7 +71,7 @@ def _make_column(col, n: int, day: str, message_types):
     if col.name == "message_type":
         return message_types
     if col.name == "seq_no":
-        return kx.q("til", n)
+        return kx.q("{x+til y}", start, n)
 
     if col.kdb_type == "j":
         base = kx.random.random(n, 1_000_000)
@@ -86,33 +100,92 @@ def _make_column(col, n: int, day: str, message_types):
     return base
 
 
-def generate_partition(db, day: str, n: int) -> None:
-    """Generate and persist one day partition to the HDB.
+def _hsym(path) -> kx.SymbolAtom:
+    return kx.SymbolAtom(f":{path}")
+
+
+def seed_sym_file() -> None:
+    """Write every symbol the generator can emit to the HDB's ``sym`` file.
+
+    With the enumeration domain complete up front, ``.Q.en`` in each worker only
+    reads ``sym`` and never appends to it, so parallel workers cannot race on it.
+    The null symbol is included: ``_make_column`` writes it into symbol columns.
+    """
+    kx.q(
+        "{x set y}",
+        _hsym(config.HDB_DIR / "sym"),
+        kx.SymbolVector([""] + _SYM_POOL + _MESSAGE_TYPES),
+    )
+
+
+def generate_partition(day: str, n: int, chunk_rows: int) -> dict:
+    """Generate one day partition block by block, appending each to the HDB.
 
     Args:
-        db: An open ``pykx.DB``.
         day: Partition date in kdb+ form.
         n: Number of rows to generate.
+        chunk_rows: Rows generated (and held in memory) per block.
+
+    Returns:
+        A metrics dict (date, rows, seconds, peak RSS, worker pid).
     """
     t0 = time.time()
-    message_types = kx.random.random(n, _MESSAGE_TYPES)
-    data = {col.name: _make_column(col, n, day, message_types) for col in STORED}
-    tab = kx.Table(data=data)
-    db.create(
-        tab,
-        config.BQ_TABLE,
-        kx.q(day),
-        sym_enum="sym",
-        log=False,
-        load_scripts=False,
-    )
+    # Seed from the date so each partition's data is the same whichever worker
+    # (each starting from q's default seed) generates it, and in whatever order.
+    kx.random.seed(int(day.replace(".", "")))
+    part_dir = _hsym(f"{config.HDB_DIR / day / config.BQ_TABLE}/")
+    for start, end in chunk_ranges(n, chunk_rows):
+        rows = end - start + 1
+        message_types = kx.random.random(rows, _MESSAGE_TYPES)
+        data = {
+            col.name: _make_column(col, rows, day, message_types, start)
+            for col in STORED
+        }
+        kx.q("appendBlock", _hsym(config.HDB_DIR), part_dir, kx.Table(data=data))
+        logger.debug("  %s: appended rows %s..%s", day, f"{start:,}", f"{end:,}")
+    dt = time.time() - t0
     logger.info(
-        "partition %s: %s rows x %s cols in %.1fs",
+        "partition %s: %s rows x %s cols in %.1fs (pid %s)",
         day,
         f"{n:,}",
         len(STORED),
-        time.time() - t0,
+        dt,
+        os.getpid(),
     )
+    return {
+        "date": day,
+        "rows": n,
+        "seconds": round(dt, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "worker_pid": os.getpid(),
+    }
+
+
+def _init_worker() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+
+def generate_all(days: list[str], n: int, chunk_rows: int, workers: int) -> list[dict]:
+    """Generate every partition, in a pool of spawned processes when ``workers > 1``.
+
+    Args:
+        days: Partition dates in kdb+ form.
+        n: Rows per partition.
+        chunk_rows: Rows per appended block.
+        workers: Worker processes; 1 generates the dates serially in-process.
+
+    Returns:
+        Per-partition metrics in ``days`` order.
+    """
+    if workers <= 1:
+        return [generate_partition(day, n, chunk_rows) for day in days]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    ) as pool:
+        futures = [pool.submit(generate_partition, day, n, chunk_rows) for day in days]
+        return [future.result() for future in futures]
 
 
 def main() -> None:
@@ -125,24 +198,38 @@ def main() -> None:
             f"Refusing to delete {config.HDB_DIR}: step 0 only manages the "
             f"generated demo HDB at {config.DATA_DIR / 'hdb'}."
         )
+    if config.GENERATE_CHUNK_ROWS < 1 or config.GENERATE_WORKERS < 1:
+        raise SystemExit("GENERATE_CHUNK_ROWS and GENERATE_WORKERS must be >= 1.")
     if config.HDB_DIR.exists():
         shutil.rmtree(config.HDB_DIR)
     config.HDB_DIR.mkdir(parents=True)
     logger.info("Generating synthetic HDB at: %s", config.HDB_DIR)
+    workers = min(config.GENERATE_WORKERS, max(len(config.POC_DATES), 1))
     logger.info(
-        "Table: %s | rows/partition: %s | partitions: %s",
+        "Table: %s | rows/partition: %s | partitions: %s (%s .. %s)",
         config.BQ_TABLE,
         f"{config.POC_ROWS:,}",
-        config.POC_DATES,
+        len(config.POC_DATES),
+        config.POC_DATES[0],
+        config.POC_DATES[-1],
+    )
+    logger.info(
+        "Blocks of %s rows | %s worker(s)", f"{config.GENERATE_CHUNK_ROWS:,}", workers
     )
     logger.info("Columns: %s (stored: %s, +1 virtual `date`)", len(SCHEMA), len(STORED))
 
-    db = kx.DB(path=str(config.HDB_DIR), load_scripts=False)
     t0 = time.time()
-    for day in config.POC_DATES:
-        generate_partition(db, day, config.POC_ROWS)
+    seed_sym_file()
+    metrics = generate_all(
+        config.POC_DATES, config.POC_ROWS, config.GENERATE_CHUNK_ROWS, workers
+    )
 
-    logger.info("Done in %.1fs | peak RAM %.0f MB", time.time() - t0, peak_rss_mb())
+    logger.info(
+        "Done in %.1fs | peak RAM %.0f MB per process",
+        time.time() - t0,
+        max(m["peak_rss_mb"] for m in metrics),
+    )
+    kx.DB(path=str(config.HDB_DIR), load_scripts=False)
     logger.info(
         "Row counts by partition:\n%s",
         str(kx.q(f"select count i by date from {config.BQ_TABLE}")),
@@ -4,12 +4,23 @@
 Authentication is your current gcloud/ADC login; no service-account keys are used.
 
 Flow:
-    local .parquet --(upload)--> gs://BUCKET/PREFIX/ --(load job)--> BigQuery
+    local .parquet --(parallel upload)--> gs://BUCKET/PREFIX/
+                   --(one load job per partition)--> BigQuery table$YYYYMMDD
 
 Notes:
-    * source_format=PARQUET: BigQuery reads the schema straight from the file.
-    * The target table is time-partitioned on `date` and clustered on sym/type,
-      matching PARTITION BY date in the customer DDL.
+    * At most UPLOAD_WORKERS uploads run at once: the budget is shared between
+      partition files and, for files larger than UPLOAD_CHUNK_MB, the parallel
+      parts of each file.
+    * Each partition's load job starts as soon as its own upload finishes and
+      targets the ``$YYYYMMDD`` partition decorator with WRITE_TRUNCATE, so the
+      load overlaps the remaining uploads and a rerun replaces only that day.
+    * The target table is created from ``schema.bq_ddl`` (time-partitioned on
+      `date`, clustered on sym/type, matching PARTITION BY date in the customer
+      DDL). If an existing table's columns no longer match TABLE_LAYOUT, the
+      step stops; RECREATE_TABLE=1 drops and recreates it instead.
+    * With INCREMENTAL=1, only partitions whose Parquet checksum in the step 1
+      manifest differs from the one last loaded are uploaded and loaded; a
+      recreated table reloads everything (see manifest.py).
     * All Parquet columns load as NULLABLE, matching a "keep the original
       (mostly-null) schema" migration.
 
@@ -20,47 +31,48 @@ Run:
 from __future__ import annotations
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 
+from google.api_core.exceptions import NotFound
 from google.cloud import bigquery, storage
 
 import config
-from schema import bq_clustering_columns, partition_column
+from gcs_load import (
+    partition_decorator,
+    split_upload_workers,
+    upload_file,
+    wait_for_jobs,
+)
+from manifest import Manifest
+from schema import (
+    bq_clustering_columns,
+    bq_ddl,
+    build_schema,
+    partition_column,
+    top_level_columns,
+)
 
 logger = logging.getLogger(__name__)
 
 PROJECT = config.resolve_gcp_project()
+TABLE_ID = f"{PROJECT}.{config.BQ_DATASET}.{config.BQ_TABLE}"
 
 
-def upload_to_gcs() -> list[str]:
-    """Upload local Parquet files to GCS.
-
-    Returns:
-        The list of ``gs://`` URIs uploaded.
+def parquet_files(days: list[str]) -> dict[str, Path]:
+    """Return the local Parquet file for each of ``days``.
 
     Raises:
-        SystemExit: If GCS_BUCKET is unset or no Parquet files are found.
+        SystemExit: If any Parquet file is missing.
     """
-    if not config.GCS_BUCKET:
-        raise SystemExit("Set GCS_BUCKET in .env first.")
-    client = storage.Client(project=PROJECT)
-    bucket = client.bucket(config.GCS_BUCKET)
-    parquet_files = [
-        config.PARQUET_DIR / f"{config.BQ_TABLE}__{day}.parquet"
-        for day in config.POC_DATES
-    ]
-    missing = [path.name for path in parquet_files if not path.is_file()]
+    files = {
+        day: config.PARQUET_DIR / f"{config.BQ_TABLE}__{day}.parquet" for day in days
+    }
+    missing = [path.name for path in files.values() if not path.is_file()]
     if missing:
         raise SystemExit(f"Missing Parquet files: {', '.join(missing)}")
-
-    uris = []
-    for pq_file in parquet_files:
-        blob_name = f"{config.GCS_PREFIX}/{pq_file.name}"
-        logger.info(
-            "uploading %s -> gs://%s/%s", pq_file.name, config.GCS_BUCKET, blob_name
-        )
-        bucket.blob(blob_name).upload_from_filename(str(pq_file))
-        uris.append(f"gs://{config.GCS_BUCKET}/{blob_name}")
-    return uris
+    return files
 
 
 def ensure_dataset(bq: bigquery.Client) -> None:
@@ -77,16 +89,56 @@ def ensure_dataset(bq: bigquery.Client) -> None:
     )
 
 
-def load(uris: list[str]) -> None:
-    """Load Parquet URIs into a partitioned + clustered BigQuery table.
+def ensure_table(bq: bigquery.Client) -> bool:
+    """Create the partitioned/clustered table if it does not exist.
+
+    A table of another layout is only replaced with RECREATE_TABLE=1, since
+    dropping it deletes every partition already loaded.
 
     Args:
-        uris: The ``gs://`` Parquet URIs to load.
+        bq: A BigQuery client.
+
+    Returns:
+        True if the table was created or recreated (so it holds no partitions).
+
+    Raises:
+        SystemExit: If the table's columns differ from TABLE_LAYOUT and
+            RECREATE_TABLE is not set.
     """
-    bq = bigquery.Client(project=PROJECT)
-    ensure_dataset(bq)
-    table_id = f"{PROJECT}.{config.BQ_DATASET}.{config.BQ_TABLE}"
+    schema = build_schema()
+    expected = top_level_columns(schema, config.TABLE_LAYOUT)
+    try:
+        existing = [field.name for field in bq.get_table(TABLE_ID).schema]
+    except NotFound:
+        existing = None
+    if existing is not None and existing != expected:
+        if not config.RECREATE_TABLE:
+            raise SystemExit(
+                f"{TABLE_ID} does not match the {config.TABLE_LAYOUT} layout. "
+                "Set RECREATE_TABLE=1 to drop and recreate it (deletes every "
+                "loaded partition), or point BQ_TABLE at another table."
+            )
+        logger.warning(
+            "recreating %s: columns differ from %s layout",
+            TABLE_ID,
+            config.TABLE_LAYOUT,
+        )
+        bq.delete_table(TABLE_ID)
+    bq.query(bq_ddl(TABLE_ID, schema, config.TABLE_LAYOUT)).result()
+    return existing != expected
+
 
+def start_partition_load(bq: bigquery.Client, uri: str, day: str):
+    """Start a WRITE_TRUNCATE load of one Parquet file into its partition.
+
+    Args:
+        bq: A BigQuery client.
+        uri: The partition's ``gs://`` Parquet URI.
+        day: Partition date in kdb+ form.
+
+    Returns:
+        The running ``bigquery.LoadJob``.
+    """
     job_config = bigquery.LoadJobConfig(
         source_format=bigquery.SourceFormat.PARQUET,
         write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
@@ -96,15 +148,78 @@ def load(uris: list[str]) -> None:
         ),
         clustering_fields=bq_clustering_columns(),
     )
-    logger.info("replacing PoC table %s from %s file(s)", table_id, len(uris))
-    bq.load_table_from_uri(uris, table_id, job_config=job_config).result()
+    destination = TABLE_ID + partition_decorator(day)
+    logger.info("  load %s -> %s", uri.rsplit("/", 1)[-1], destination)
+    return bq.load_table_from_uri(uri, destination, job_config=job_config)
+
+
+def upload_and_load() -> None:
+    """Upload every pending partition file in parallel and load each as it lands."""
+    if not config.GCS_BUCKET:
+        raise SystemExit("Set GCS_BUCKET in .env first.")
+    bq = bigquery.Client(project=PROJECT)
+    ensure_dataset(bq)
+    fresh_table = ensure_table(bq)
+    manifest = Manifest(config.MANIFEST_PATH)
+    if fresh_table:
+        manifest.forget_loads()
+        manifest.save()
+    days = config.POC_DATES
+    if config.INCREMENTAL:
+        days = manifest.pending_loads(config.POC_DATES)
+        if not days:
+            logger.info("All %s partition(s) already loaded", len(config.POC_DATES))
+            return
+        logger.info(
+            "%s of %s partition(s) changed since the last load",
+            len(days),
+            len(config.POC_DATES),
+        )
+    files = parquet_files(days)
+    bucket = storage.Client(project=PROJECT).bucket(config.GCS_BUCKET)
+    chunk_bytes = int(config.UPLOAD_CHUNK_MB * 1024 * 1024)
+    file_workers, part_workers = split_upload_workers(config.UPLOAD_WORKERS, len(files))
+
+    t0 = time.time()
+    jobs = {}
+    with ThreadPoolExecutor(max_workers=file_workers) as pool:
+        uploads = {
+            pool.submit(
+                upload_file,
+                bucket,
+                path,
+                f"{config.GCS_PREFIX}/{path.name}",
+                chunk_bytes=chunk_bytes,
+                workers=part_workers,
+            ): day
+            for day, path in files.items()
+        }
+        for future in as_completed(uploads):
+            day = uploads[future]
+            uri = future.result()
+            logger.info("uploaded %s (%.1fs)", uri, time.time() - t0)
+            jobs[day] = start_partition_load(bq, uri, day)
+
+    def done(day: str, job) -> None:
+        logger.info(
+            "  loaded %s: %s rows (%.1fs)",
+            day,
+            f"{job.output_rows:,}",
+            time.time() - t0,
+        )
+        manifest.record_load(day)
+        manifest.save()
+
+    wait_for_jobs(jobs, on_done=done)
 
-    table = bq.get_table(table_id)
+    table = bq.get_table(TABLE_ID)
     logger.info(
-        "Loaded %s rows, %s columns into %s",
+        "Loaded %s partition(s) in %.1fs; %s now has %s rows, %s columns",
+        len(jobs),
+        time.time() - t0,
+        TABLE_ID,
         f"{table.num_rows:,}",
         len(table.schema),
-        table_id,
     )
     logger.info(
         "partitioned by: %s | clustered by: %s",
@@ -117,7 +232,10 @@ def main() -> None:
     """Upload Parquet to GCS and load it into BigQuery."""
     logging.basicConfig(level=logging.INFO, format="%(message)s")
     logger.info("Project: %s", PROJECT)
-    load(upload_to_gcs())
+    if config.SINK == "bigquery":
+        logger.info("SINK=bigquery: step 1 already streamed into BigQuery; skipping")
+        return
+    upload_and_load()
 
 
 if __name__ == "__main__":
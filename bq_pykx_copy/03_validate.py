@@ -3,8 +3,13 @@
 
 Checks:
     1. Row count per partition (kdb vs BQ).
-    2. Null count for a sample of columns (sparsity preserved?).
-    3. Nanosecond timestamp fidelity: confirm event timestamps survived the
+    2. Schema width for the configured table layout.
+    3. Full-column parity: null count, min/max, and an order-independent
+       checksum for every column of every partition (see parity.py). The source
+       side is one Arrow pass over the HDB (or the written Parquet, with
+       PARITY_SOURCE=parquet); the target side is one aggregate query per
+       partition, all submitted up front so they run while the source is read.
+    4. Nanosecond timestamp fidelity: confirm event timestamps survived the
        round-trip as INT64 with no truncation.
 
 Run:
@@ -14,12 +19,17 @@ Run:
 from __future__ import annotations
 
 import logging
+import time
 
+import pyarrow as pa
+import pyarrow.parquet as pq
 from google.cloud import bigquery
 
 import config
-from kdb_utils import ensure_licensed_pykx
-from schema import build_schema
+from hdb_reader import SplayedPartition, UnsupportedColumnFile
+from kdb_utils import chunk_ranges, chunk_to_arrow, ensure_licensed_pykx
+from parity import compare_stats, source_stats, target_query, target_stats
+from schema import build_schema, top_level_columns
 
 logger = logging.getLogger(__name__)
 
@@ -31,11 +41,13 @@ SCHEMA = build_schema()
 
 def check_schema(bq: bigquery.Client) -> bool:
     """Check that BigQuery loaded the complete wide schema."""
+    expected = len(top_level_columns(SCHEMA, config.TABLE_LAYOUT))
     columns = len(bq.get_table(TABLE_ID).schema)
-    ok = columns == len(SCHEMA)
+    ok = columns == expected
     logger.info(
-        "[2] Schema width: expected=%s bq=%s [%s]",
-        len(SCHEMA),
+        "[2] Schema width (%s layout): expected=%s bq=%s [%s]",
+        config.TABLE_LAYOUT,
+        expected,
         columns,
         "OK" if ok else "MISMATCH",
     )
@@ -77,44 +89,77 @@ def check_row_counts(bq: bigquery.Client) -> bool:
     return ok
 
 
-def check_null_counts(bq: bigquery.Client) -> bool:
-    """Compare null counts for a sample of columns in the first partition.
+def _source_chunks(day: str):
+    """Yield one partition's source chunks as flat, schema-aligned Arrow tables."""
+    if config.PARITY_SOURCE == "parquet":
+        path = config.PARQUET_DIR / f"{config.BQ_TABLE}__{day}.parquet"
+        for batch in pq.ParquetFile(path).iter_batches(
+            batch_size=config.PARQUET_ROW_GROUP
+        ):
+            yield pa.Table.from_batches([batch])
+        return
+    try:
+        partition = SplayedPartition(config.HDB_DIR, config.BQ_TABLE, day, SCHEMA)
+    except (UnsupportedColumnFile, FileNotFoundError) as exc:
+        logger.warning("  mmap reader unavailable for %s (%s); using q", day, exc)
+        n = int(
+            kx.q(
+                f"first exec n from select n:count i from {config.BQ_TABLE} "
+                f"where date={day}"
+            ).py()
+        )
+        for start, end in chunk_ranges(n, config.PARQUET_ROW_GROUP):
+            yield chunk_to_arrow(
+                kx.q(
+                    f"select from {config.BQ_TABLE} "
+                    f"where date={day}, i within ({start};{end})"
+                ),
+                SCHEMA,
+            )
+        return
+    for start, end in chunk_ranges(partition.count, config.PARQUET_ROW_GROUP):
+        yield partition.chunk(start, end)
+
+
+def check_column_parity(bq: bigquery.Client) -> bool:
+    """Compare per-column statistics for every column of every partition.
 
     Args:
         bq: A BigQuery client.
 
     Returns:
-        True if all sampled null counts match.
+        True if every partition's statistics match.
     """
-    logger.info("[3] Null-count parity (sample of columns)")
-    sample = [c for c in SCHEMA if c.name != "date"][:6]
-    day = config.POC_DATES[0]
-    iso = day.replace(".", "-")
-    sel = ", ".join(f"COUNTIF({c.name} IS NULL) AS `{c.name}`" for c in sample)
-    bqrow = next(
-        iter(
-            bq.query(
-                f"SELECT {sel} FROM `{TABLE_ID}` WHERE date = DATE('{iso}')"
-            ).result()
-        )
+    logger.info(
+        "[3] Full-column parity (%s columns x %s partitions, source: %s)",
+        len(SCHEMA),
+        len(config.POC_DATES),
+        config.PARITY_SOURCE,
     )
-    ok = True
-    for c in sample:
-        kdb_nulls = int(
-            kx.q(
-                f"first exec n from select n:count i from {config.BQ_TABLE} "
-                f"where date={day}, null {c.name}"
-            ).py()
+    jobs = {
+        day: bq.query(
+            target_query(TABLE_ID, SCHEMA, config.TABLE_LAYOUT, day.replace(".", "-"))
         )
-        bq_nulls = bqrow[c.name]
-        ok &= kdb_nulls == bq_nulls
+        for day in config.POC_DATES
+    }
+    ok = True
+    for day, job in jobs.items():
+        t0 = time.time()
+        source = source_stats(_source_chunks(day), SCHEMA)
+        source_seconds = time.time() - t0
+        target = target_stats(next(iter(job.result())), SCHEMA)
+        problems = compare_stats(source, target)
+        ok &= not problems
         logger.info(
-            "  %-28s kdb_nulls=%s bq_nulls=%s [%s]",
-            c.name,
-            f"{kdb_nulls:,}",
-            f"{bq_nulls:,}",
-            "OK" if kdb_nulls == bq_nulls else "MISMATCH",
+            "  %s: %s rows, %s columns (source pass %.1fs) [%s]",
+            day,
+            f"{source.rows:,}",
+            len(SCHEMA),
+            source_seconds,
+            "OK" if not problems else f"{len(problems)} MISMATCHES",
         )
+        for problem in problems[:20]:
+            logger.info("    %s", problem)
     return ok
 
 
@@ -168,7 +213,7 @@ def main() -> None:
     results = {
         "row_counts": check_row_counts(bq),
         "schema": check_schema(bq),
-        "null_counts": check_null_counts(bq),
+        "column_parity": check_column_parity(bq),
         "timestamp_precision": check_timestamp_precision(bq),
     }
     logger.info("=== SUMMARY ===")
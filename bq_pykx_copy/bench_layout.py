@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Benchmark the flat and STRUCT table layouts on a synthetic partition.
+
+For each layout this measures, on the same in-process synthetic partition (see
+``synthetic.py``; no kdb+ license needed):
+
+    * conversion time: layout packing + cast + Snappy Parquet write,
+    * Parquet file size,
+    * BigQuery bytes scanned for a few typical queries.
+
+Bytes scanned are estimated from BigQuery's logical-size rules (8 bytes per
+non-null INT64/DATE/TIMESTAMP value, 2 + UTF-8 length per non-null STRING, 0 for
+NULL; a STRUCT costs the sum of the fields read). With ``--dry-run FLAT STRUCT``
+the same queries are also dry-run against two loaded BigQuery tables for the
+billed figure.
+
+Run:
+    uv run python bench_layout.py --rows 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+import config
+from kdb_utils import arrow_schema, pack_struct_layout, peak_rss_mb
+from schema import bq_column_expr, build_schema, message_groups
+from synthetic import synthetic_table
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = build_schema()
+_BY_NAME = {c.name: c for c in SCHEMA}
+_FIXED_BYTES = {"INT64": 8, "DATE": 8, "TIMESTAMP": 8}
+
+
+def typical_queries() -> dict[str, tuple[list[str], str | None]]:
+    """Return ``name -> (columns read, message_type filter)`` query shapes."""
+    group = "mt03"
+    group_cols = [c.name for c in message_groups(SCHEMA)[group]]
+    return {
+        "one_message_type": (["sym", "message_type", *group_cols], group),
+        "event_lookup": (["sym", "seq_no", "timestamp_nanos"], None),
+        "full_scan": ([c.name for c in SCHEMA], None),
+    }
+
+
+def logical_bytes(table: pa.Table, columns: list[str]) -> int:
+    """Estimate BigQuery bytes scanned for reading ``columns`` of a flat table."""
+    total = 0
+    for name in columns:
+        column = table.column(name)
+        bq_type = _BY_NAME[name].bq_type
+        valid = len(column) - column.null_count
+        if bq_type in _FIXED_BYTES:
+            total += _FIXED_BYTES[bq_type] * valid
+        else:
+            lengths = pc.binary_length(column.cast(pa.string()))
+            total += 2 * valid + int(pc.sum(lengths).as_py() or 0)
+    return total
+
+
+def query_sql(
+    table_id: str, columns: list[str], filter_type: str | None, layout: str
+) -> str:
+    """Render a typical query's SQL for ``layout``."""
+    exprs = ", ".join(bq_column_expr(_BY_NAME[name], layout) for name in columns)
+    where = f" WHERE message_type = '{filter_type}'" if filter_type else ""
+    return f"SELECT {exprs} FROM `{table_id}`{where}"
+
+
+def dry_run_bytes(table_ids: dict[str, str]) -> dict[str, dict[str, int]]:
+    """Dry-run each typical query against loaded tables and return bytes billed."""
+    from google.cloud import bigquery
+
+    bq = bigquery.Client(project=config.resolve_gcp_project())
+    job_config = bigquery.QueryJobConfig(dry_run=True, use_query_cache=False)
+    results: dict[str, dict[str, int]] = {}
+    for layout, table_id in table_ids.items():
+        results[layout] = {
+            name: bq.query(
+                query_sql(table_id, columns, filter_type, layout),
+                job_config=job_config,
+            ).total_bytes_processed
+            for name, (columns, filter_type) in typical_queries().items()
+        }
+    return results
+
+
+def bench_layout(flat: pa.Table, layout: str, out_dir: Path, row_group: int) -> dict:
+    """Convert ``flat`` to ``layout`` and write it to Parquet, timing both."""
+    target = arrow_schema(SCHEMA, layout=layout)
+    path = out_dir / f"layout_{layout}.parquet"
+    t0 = time.perf_counter()
+    table = pack_struct_layout(flat, SCHEMA) if layout == "struct" else flat
+    table = table.cast(target)
+    pack_seconds = time.perf_counter() - t0
+    pq.write_table(table, path, compression="snappy", row_group_size=row_group)
+    seconds = time.perf_counter() - t0
+    return {
+        "layout": layout,
+        "top_level_columns": len(target),
+        "convert_seconds": round(seconds, 3),
+        "pack_seconds": round(pack_seconds, 3),
+        "parquet_mb": round(path.stat().st_size / (1024 * 1024), 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def main() -> None:
+    """Run the layout benchmark and write ``metrics_layout.json``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--row-group", type=int, default=config.PARQUET_ROW_GROUP)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--dry-run",
+        nargs=2,
+        metavar=("FLAT_TABLE", "STRUCT_TABLE"),
+        help="also dry-run the typical queries against two loaded tables",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    logger.info(
+        "Generating %s synthetic rows x %s columns", f"{args.rows:,}", len(SCHEMA)
+    )
+    flat = synthetic_table(SCHEMA, args.rows, seed=args.seed)
+    queries = typical_queries()
+    scanned = {name: logical_bytes(flat, cols) for name, (cols, _) in queries.items()}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [
+            bench_layout(flat, layout, Path(tmp), args.row_group)
+            for layout in ("flat", "struct")
+        ]
+    summary = {
+        "rows": args.rows,
+        "row_group_size": args.row_group,
+        "layouts": results,
+        # Logical bytes only depend on the leaf fields read, so the estimate is
+        # the same for both layouts; dry runs report what BigQuery bills.
+        "estimated_bytes_scanned": scanned,
+    }
+    if args.dry_run:
+        summary["dry_run_bytes"] = dry_run_bytes(
+            {"flat": args.dry_run[0], "struct": args.dry_run[1]}
+        )
+
+    logger.info(
+        "%-8s %8s %12s %12s", "layout", "columns", "convert (s)", "parquet (MB)"
+    )
+    for r in results:
+        logger.info(
+            "%-8s %8s %12.2f %12.2f",
+            r["layout"],
+            r["top_level_columns"],
+            r["convert_seconds"],
+            r["parquet_mb"],
+        )
+    for name, nbytes in scanned.items():
+        logger.info("query %-18s ~%.1f MB scanned", name, nbytes / (1024 * 1024))
+    out = config.DATA_DIR / "metrics_layout.json"
+    out.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    logger.info("Metrics -> %s", out)
+
+
+if __name__ == "__main__":
+    main()
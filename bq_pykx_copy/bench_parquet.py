@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Sweep Parquet encoding settings on a synthetic partition and recommend one.
+
+Every combination of row-group size, compression codec, dictionary encoding, and
+data page size is written from the same in-process synthetic partition (see
+``synthetic.py``; no kdb+ license needed), the way step 1 writes it: cast to the
+file schema one row group at a time and streamed through a ``ParquetWriter``.
+For each combination this records:
+
+    * conversion throughput (cast + encode + write, rows per second),
+    * peak RSS, measured in a fresh process per combination (the mapped source
+      partition adds the same baseline to every row),
+    * Parquet file size,
+    * read-back time (a local stand-in for the load's decode cost), and
+    * BigQuery load time, when ``--load-table`` names a scratch table.
+
+The recommendation is the fastest end-to-end combination (write plus load, or
+read-back without a target) among those within ``--size-slack`` of the smallest
+file and, optionally, under ``--rss-budget-mb``.
+
+Run:
+    uv run python bench_parquet.py --rows 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import logging
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import config
+from kdb_utils import arrow_schema, peak_rss_mb
+from schema import build_schema
+from synthetic import synthetic_table
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = build_schema()
+
+
+class Encoding(NamedTuple):
+    """One Parquet writer configuration under test."""
+
+    row_group: int
+    compression: str
+    dictionary: bool
+    page_kb: int
+
+    @property
+    def label(self) -> str:
+        """Short, file-name-safe name, e.g. ``rg250k-zstd-dict-p1024k``."""
+        dictionary = "dict" if self.dictionary else "plain"
+        return (
+            f"rg{self.row_group // 1000}k-{self.compression}-{dictionary}"
+            f"-p{self.page_kb}k"
+        )
+
+    def env(self) -> dict[str, str]:
+        """Return the ``.env`` settings that select this configuration."""
+        return {
+            "PARQUET_ROW_GROUP": str(self.row_group),
+            "PARQUET_COMPRESSION": self.compression,
+            "PARQUET_DICTIONARY": "1" if self.dictionary else "0",
+            "PARQUET_PAGE_KB": str(self.page_kb),
+        }
+
+
+def encoding_matrix(
+    row_groups: list[int],
+    codecs: list[str],
+    dictionary: list[bool],
+    page_kbs: list[int],
+) -> list[Encoding]:
+    """Return every combination of the swept parameters."""
+    return [
+        Encoding(*combo)
+        for combo in itertools.product(row_groups, codecs, dictionary, page_kbs)
+    ]
+
+
+def bench_encoding(
+    source_path: Path, encoding: Encoding, out_dir: Path, load_table: str | None
+) -> dict:
+    """Write the memory-mapped source partition with ``encoding`` and time it.
+
+    Args:
+        source_path: Arrow IPC file holding the flat synthetic partition.
+        encoding: The configuration to write with.
+        out_dir: Where the Parquet file goes.
+        load_table: ``project.dataset.table`` to load the file into, or None.
+
+    Returns:
+        A metrics dict for the configuration.
+    """
+    source = pa.ipc.open_file(pa.memory_map(str(source_path))).read_all()
+    target = arrow_schema(SCHEMA)
+    path = out_dir / f"{encoding.label}.parquet"
+    t0 = time.perf_counter()
+    with pq.ParquetWriter(
+        path,
+        target,
+        compression=encoding.compression,
+        use_dictionary=encoding.dictionary,
+        data_page_size=encoding.page_kb * 1024,
+    ) as writer:
+        for start in range(0, source.num_rows, encoding.row_group):
+            chunk = source.slice(start, encoding.row_group).cast(target)
+            writer.write_table(chunk, row_group_size=encoding.row_group)
+    write_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    pq.read_table(path)
+    read_seconds = time.perf_counter() - t0
+
+    return {
+        **encoding._asdict(),
+        "label": encoding.label,
+        "write_seconds": round(write_seconds, 3),
+        "rows_per_second": round(source.num_rows / write_seconds),
+        "parquet_mb": round(path.stat().st_size / (1024 * 1024), 2),
+        "read_seconds": round(read_seconds, 3),
+        "load_seconds": _load_seconds(path, load_table) if load_table else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def _load_seconds(path: Path, table_id: str) -> float:
+    """Load ``path`` into ``table_id`` and return the job's server-side runtime."""
+    from google.cloud import bigquery
+
+    bq = bigquery.Client(project=config.resolve_gcp_project())
+    job_config = bigquery.LoadJobConfig(
+        source_format=bigquery.SourceFormat.PARQUET,
+        write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+    )
+    with path.open("rb") as f:
+        job = bq.load_table_from_file(f, table_id, job_config=job_config)
+    job.result()
+    return round((job.ended - job.started).total_seconds(), 3)
+
+
+def _bench_isolated(*args) -> dict:
+    """Run ``bench_encoding`` in a fresh process so peak RSS is per configuration."""
+    with multiprocessing.get_context("spawn").Pool(1, maxtasksperchild=1) as pool:
+        return pool.apply(bench_encoding, args)
+
+
+def end_to_end_seconds(result: dict) -> float:
+    """Write time plus load time (or read-back time without a load target)."""
+    downstream = result["load_seconds"]
+    if downstream is None:
+        downstream = result["read_seconds"]
+    return result["write_seconds"] + downstream
+
+
+def recommend(
+    results: list[dict], *, size_slack: float = 0.10, rss_budget_mb: float = 0
+) -> dict:
+    """Pick the fastest configuration whose file is close to the smallest.
+
+    Args:
+        results: Metrics from ``bench_encoding``.
+        size_slack: Allowed size above the smallest file, as a fraction.
+        rss_budget_mb: Exclude configurations above this peak RSS; ``<= 0`` for
+            no limit (ignored if nothing fits).
+
+    Returns:
+        The recommended result.
+    """
+    candidates = [
+        r for r in results if rss_budget_mb <= 0 or r["peak_rss_mb"] <= rss_budget_mb
+    ] or results
+    smallest = min(r["parquet_mb"] for r in candidates)
+    compact = [r for r in candidates if r["parquet_mb"] <= smallest * (1 + size_slack)]
+    return min(compact, key=end_to_end_seconds)
+
+
+def _csv(cast):
+    return lambda value: [cast(v.strip()) for v in value.split(",") if v.strip()]
+
+
+def _on_off(value: str) -> bool:
+    return value.lower() in {"1", "on", "true", "yes"}
+
+
+def main() -> None:
+    """Run the encoding sweep and write ``metrics_parquet.json``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--row-groups", type=_csv(int), default=[50_000, 100_000, 250_000]
+    )
+    parser.add_argument(
+        "--codecs", type=_csv(str), default=["snappy", "zstd", "lz4", "none"]
+    )
+    parser.add_argument("--dictionary", type=_csv(_on_off), default=[True, False])
+    parser.add_argument("--page-kb", type=_csv(int), default=[64, 1024])
+    parser.add_argument("--size-slack", type=float, default=0.10)
+    parser.add_argument("--rss-budget-mb", type=float, default=0)
+    parser.add_argument(
+        "--load-table",
+        help="scratch project.dataset.table to time BigQuery loads (overwritten)",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    matrix = encoding_matrix(
+        args.row_groups, args.codecs, args.dictionary, args.page_kb
+    )
+    logger.info(
+        "Sweeping %s configurations over %s synthetic rows x %s columns",
+        len(matrix),
+        f"{args.rows:,}",
+        len(SCHEMA),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        source_path = Path(tmp) / "partition.arrow"
+        table = synthetic_table(SCHEMA, args.rows, seed=args.seed)
+        with pa.ipc.new_file(source_path, table.schema) as sink:
+            sink.write_table(table)
+        del table
+        results = []
+        for encoding in matrix:
+            results.append(
+                _bench_isolated(source_path, encoding, Path(tmp), args.load_table)
+            )
+            (Path(tmp) / f"{encoding.label}.parquet").unlink()
+
+    best = recommend(
+        results, size_slack=args.size_slack, rss_budget_mb=args.rss_budget_mb
+    )
+    logger.info(
+        "%-26s %12s %10s %10s %10s %10s",
+        "configuration",
+        "rows/s",
+        "size (MB)",
+        "RSS (MB)",
+        "read (s)",
+        "load (s)",
+    )
+    for r in sorted(results, key=end_to_end_seconds):
+        logger.info(
+            "%-26s %12s %10.2f %10.0f %10.3f %10s%s",
+            r["label"],
+            f"{r['rows_per_second']:,}",
+            r["parquet_mb"],
+            r["peak_rss_mb"],
+            r["read_seconds"],
+            "-" if r["load_seconds"] is None else f"{r['load_seconds']:.3f}",
+            "  <- recommended" if r is best else "",
+        )
+    env = Encoding(
+        best["row_group"], best["compression"], best["dictionary"], best["page_kb"]
+    ).env()
+    logger.info("Recommended .env:\n%s", "\n".join(f"{k}={v}" for k, v in env.items()))
+
+    out = config.DATA_DIR / "metrics_parquet.json"
+    out.write_text(
+        json.dumps(
+            {
+                "rows": args.rows,
+                "size_slack": args.size_slack,
+                "rss_budget_mb": args.rss_budget_mb,
+                "results": results,
+                "recommended": {"label": best["label"], "env": env},
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    logger.info("Metrics -> %s", out)
+
+
+if __name__ == "__main__":
+    main()
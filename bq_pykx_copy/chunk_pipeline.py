@@ -0,0 +1,200 @@
+"""Three-stage read -> convert -> write pipeline for partition chunks.
+
+Step 1 used to read a chunk, convert it to Arrow, and compress it into Parquet
+strictly in sequence, so the q read and the Snappy encode never overlapped.
+``run_chunk_pipeline`` runs the stages concurrently with a bounded queue between
+each pair, so chunk N+1 is read while chunk N is converted or written:
+
+    caller thread: read ──queue(depth)──> convert ──queue(depth)──> write
+
+The read stage always runs on the calling thread, because embedded q (PyKX) must
+only be called from the thread that owns it. ``convert_on_reader=True`` keeps
+conversion there too, for converters that still touch q objects; only the
+writer moves to a background thread in that case. Whatever ``convert`` returns
+is dropped on the writer thread, so it must not hold q objects or views of
+q-owned memory (``kdb_utils.chunk_to_arrow`` copies every q buffer for this).
+
+At most ``depth`` chunks wait in each queue, plus one held by each stage, so
+peak memory stays a fixed number of chunks regardless of partition size.
+``depth=0`` runs every stage inline on the caller's thread.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+
+
+@dataclass
+class StageStats:
+    """Busy time and throughput for one pipeline stage.
+
+    Attributes:
+        items: Chunks the stage finished.
+        rows: Rows in those chunks (counted after conversion).
+        seconds: Time spent inside the stage's callable, excluding queue waits.
+    """
+
+    items: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        """Return JSON-ready metrics, including rows per busy second."""
+        return {
+            "items": self.items,
+            "rows": self.rows,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows / self.seconds)
+            if self.seconds
+            else None,
+        }
+
+
+class _Stop(Exception):
+    """Raised inside a stage when another stage has already failed."""
+
+
+def _put(q: queue.Queue, item: Any, failed: threading.Event) -> None:
+    while True:
+        if failed.is_set():
+            raise _Stop
+        try:
+            q.put(item, timeout=_POLL_SECONDS)
+            return
+        except queue.Full:
+            continue
+
+
+def _get(q: queue.Queue, failed: threading.Event) -> Any:
+    while True:
+        if failed.is_set():
+            raise _Stop
+        try:
+            return q.get(timeout=_POLL_SECONDS)
+        except queue.Empty:
+            continue
+
+
+def run_chunk_pipeline(
+    chunks: Iterable[Any],
+    read: Callable[[Any], Any],
+    convert: Callable[[Any], Any],
+    write: Callable[[Any], None],
+    *,
+    depth: int,
+    convert_on_reader: bool = False,
+    rows: Callable[[Any], int] = lambda table: table.num_rows,
+) -> dict[str, dict]:
+    """Read, convert, and write every chunk with the stages overlapped.
+
+    Chunks are written in input order.
+
+    Args:
+        chunks: Chunk descriptors (e.g. ``(start, end)`` windows).
+        read: Loads one chunk; always called on the caller's thread.
+        convert: Turns a read chunk into the value passed to ``write``.
+        write: Persists one converted chunk; runs on a background thread
+            unless ``depth`` is 0.
+        depth: Maximum chunks queued between stages; 0 runs sequentially.
+        convert_on_reader: Run ``convert`` on the caller's thread with ``read``.
+        rows: Row count of a converted chunk, for throughput metrics.
+
+    Returns:
+        Per-stage metrics keyed ``read``, ``convert`` and ``write`` (see
+        ``StageStats.as_dict``), plus ``wall_seconds``.
+
+    Raises:
+        ValueError: If ``depth`` is negative.
+        Exception: The first exception raised by any stage.
+    """
+    if depth < 0:
+        raise ValueError("depth must be non-negative")
+    stats = {name: StageStats() for name in ("read", "convert", "write")}
+    t0 = time.perf_counter()
+
+    def timed(name: str, fn: Callable[[Any], Any], item: Any) -> Any:
+        start = time.perf_counter()
+        result = fn(item)
+        stats[name].seconds += time.perf_counter() - start
+        stats[name].items += 1
+        return result
+
+    def count_rows(converted: Any) -> Any:
+        n = rows(converted)
+        stats["read"].rows += n
+        stats["convert"].rows += n
+        return converted
+
+    if depth == 0:
+        for chunk in chunks:
+            converted = count_rows(
+                timed("convert", convert, timed("read", read, chunk))
+            )
+            timed("write", write, converted)
+            stats["write"].rows += rows(converted)
+        return _report(stats, t0)
+
+    failed = threading.Event()
+    errors: list[BaseException] = []
+    write_q: queue.Queue = queue.Queue(maxsize=depth)
+    convert_q: queue.Queue = queue.Queue(maxsize=depth)
+
+    def guarded(body: Callable[[], None]) -> Callable[[], None]:
+        def run() -> None:
+            try:
+                body()
+            except _Stop:
+                pass
+            except BaseException as exc:  # re-raised on the caller's thread
+                errors.append(exc)
+                failed.set()
+
+        return run
+
+    def writer() -> None:
+        while (item := _get(write_q, failed)) is not _DONE:
+            timed("write", write, item)
+            stats["write"].rows += rows(item)
+
+    def converter() -> None:
+        while (item := _get(convert_q, failed)) is not _DONE:
+            _put(write_q, count_rows(timed("convert", convert, item)), failed)
+        _put(write_q, _DONE, failed)
+
+    threads = [threading.Thread(target=guarded(writer), name="chunk-writer")]
+    if not convert_on_reader:
+        threads.append(
+            threading.Thread(target=guarded(converter), name="chunk-convert")
+        )
+    for thread in threads:
+        thread.start()
+
+    def reader() -> None:
+        for chunk in chunks:
+            item = timed("read", read, chunk)
+            if convert_on_reader:
+                _put(write_q, count_rows(timed("convert", convert, item)), failed)
+            else:
+                _put(convert_q, item, failed)
+        _put(write_q if convert_on_reader else convert_q, _DONE, failed)
+
+    guarded(reader)()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return _report(stats, t0)
+
+
+def _report(stats: dict[str, StageStats], t0: float) -> dict[str, dict]:
+    report: dict[str, Any] = {name: s.as_dict() for name, s in stats.items()}
+    report["wall_seconds"] = round(time.perf_counter() - t0, 3)
+    return report
@@ -9,6 +9,7 @@ its licensing environment variables at import time.  Every script here does
 from __future__ import annotations
 
 import base64
+import datetime
 import os
 import pathlib
 import subprocess
@@ -83,6 +84,7 @@ BQ_LOCATION = os.getenv("BQ_LOCATION", "US").strip()
 DATA_DIR = HERE / "data"
 HDB_DIR = DATA_DIR / "hdb"  # synthetic kdb+ HDB lives here
 PARQUET_DIR = DATA_DIR / "parquet"  # converted parquet files land here
+MANIFEST_PATH = DATA_DIR / "manifest.json"  # per-partition convert/load state
 DATA_DIR.mkdir(exist_ok=True)
 HDB_DIR.mkdir(parents=True, exist_ok=True)
 PARQUET_DIR.mkdir(parents=True, exist_ok=True)
@@ -91,12 +93,117 @@ PARQUET_DIR.mkdir(parents=True, exist_ok=True)
 # Run knobs
 # --------------------------------------------------------------------------- #
 POC_ROWS = int(os.getenv("POC_ROWS", "1000000"))
-POC_DATES = [
-    d.strip()
-    for d in os.getenv("POC_DATES", "2024.01.02,2024.01.03").split(",")
-    if d.strip()
-]
+
+
+def expand_dates(spec: str) -> list[str]:
+    """Expand a POC_DATES value into kdb+ partition dates.
+
+    Entries are comma-separated. Each is a single date (``2024.01.02``) or an
+    inclusive range of weekdays (``2022.01.03..2024.12.31``), so a multi-year,
+    trading-day HDB does not need every date spelled out.
+
+    Args:
+        spec: The comma-separated date specification.
+
+    Returns:
+        Dates in kdb+ form, in the order given.
+
+    Raises:
+        ValueError: If a range ends before it starts.
+    """
+    dates: list[str] = []
+    for entry in (e.strip() for e in spec.split(",")):
+        if not entry:
+            continue
+        if ".." not in entry:
+            dates.append(entry)
+            continue
+        start, end = (
+            datetime.date(*map(int, d.strip().split("."))) for d in entry.split("..")
+        )
+        if end < start:
+            raise ValueError(f"Date range {entry!r} ends before it starts")
+        days = (start + datetime.timedelta(n) for n in range((end - start).days + 1))
+        dates += [d.strftime("%Y.%m.%d") for d in days if d.weekday() < 5]
+    return dates
+
+
+POC_DATES = expand_dates(os.getenv("POC_DATES", "2024.01.02,2024.01.03"))
 PARQUET_ROW_GROUP = int(os.getenv("PARQUET_ROW_GROUP", "250000"))
+# Parquet encoding for step 1 (see bench_parquet.py for measured trade-offs):
+# codec (snappy, zstd, lz4, gzip, none), dictionary pages, and data page size.
+PARQUET_COMPRESSION = os.getenv("PARQUET_COMPRESSION", "snappy").strip().lower()
+PARQUET_DICTIONARY = os.getenv("PARQUET_DICTIONARY", "1").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
+PARQUET_PAGE_KB = int(os.getenv("PARQUET_PAGE_KB", "1024"))
+# Step 0: rows generated and appended to a partition at a time (bounds RAM at
+# roughly rows x 427 stored columns x 8 bytes), and dates generated in parallel.
+GENERATE_CHUNK_ROWS = int(os.getenv("GENERATE_CHUNK_ROWS", "250000"))
+GENERATE_WORKERS = int(os.getenv("GENERATE_WORKERS", "1"))
+# Chunks queued between step 1's read, convert, and write stages; peak memory is
+# roughly (2 x depth + 3) chunks. 0 = fully sequential.
+PIPELINE_DEPTH = int(os.getenv("PIPELINE_DEPTH", "2"))
+# Step 1 process pool: partitions converted concurrently, one embedded q per
+# worker. 1 keeps the original single-process path.
+CONVERT_WORKERS = int(os.getenv("CONVERT_WORKERS", "1"))
+# Global resident-memory budget (MiB) shared by all conversion workers; 0 = no
+# limit. Concurrency is throttled so workers x per-worker peak stays under it.
+CONVERT_RSS_BUDGET_MB = float(os.getenv("CONVERT_RSS_BUDGET_MB", "0"))
+# Step 2 upload parallelism: partition files uploaded at once, and the threads
+# (and part size in MiB) used to upload each large file in parallel parts.
+UPLOAD_WORKERS = int(os.getenv("UPLOAD_WORKERS", "8"))
+UPLOAD_CHUNK_MB = float(os.getenv("UPLOAD_CHUNK_MB", "32"))
+# Step 2: drop and recreate a target table whose columns no longer match
+# TABLE_LAYOUT (deletes every loaded partition). Off: step 2 stops instead.
+RECREATE_TABLE = os.getenv("RECREATE_TABLE", "0").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
+# Target table layout: "flat" (one column per field) or "struct" (each mtXX__*
+# message group packed into one nullable STRUCT column; see schema.py).
+TABLE_LAYOUT = os.getenv("TABLE_LAYOUT", "flat").strip().lower()
+# Where step 1 sends converted chunks: "parquet" (local files for step 2 to
+# upload and load) or "bigquery" (Storage Write API pending streams, committed
+# once per partition; step 2 is then skipped; see storage_write.py).
+SINK = os.getenv("SINK", "parquet").strip().lower()
+# How step 1 reads partition chunks: "q" (select through embedded q) or "mmap"
+# (memory-map the splayed column files directly; see hdb_reader.py).
+HDB_READER = os.getenv("HDB_READER", "q").strip().lower()
+# Source side of step 3's full-column parity check: "hdb" (read the partitions
+# again) or "parquet" (read step 1's files; not available with SINK=bigquery).
+PARITY_SOURCE = os.getenv("PARITY_SOURCE", "hdb").strip().lower()
+# Write kdb+ symbol columns as Parquet dictionary pages (Arrow dictionary arrays)
+# instead of plain strings. BigQuery still loads them as STRING.
+SYMBOL_DICTIONARY = os.getenv("SYMBOL_DICTIONARY", "0").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
+# Skip partitions whose source files, schema, and Parquet output are unchanged
+# since the last run, and load only changed partitions (see manifest.py).
+INCREMENTAL = os.getenv("INCREMENTAL", "1").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
+# How source partitions are fingerprinted: "stat" (sizes + mtimes) or "content".
+MANIFEST_FINGERPRINT = os.getenv("MANIFEST_FINGERPRINT", "stat").strip().lower()
+# Re-hash every up-to-date Parquet output against its recorded checksum instead
+# of trusting an unchanged size and mtime (slow: reads the whole dataset).
+MANIFEST_VERIFY = os.getenv("MANIFEST_VERIFY", "0").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
 
 # --------------------------------------------------------------------------- #
 # Timestamp handling policy  (see README "Timestamp handling")
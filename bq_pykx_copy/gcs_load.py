@@ -0,0 +1,110 @@
+"""Upload and load helpers for step 2 (GCS -> BigQuery), without a GCP runtime.
+
+Step 2 overlaps the two halves of the load: partitions are uploaded in
+parallel, and each partition's load job is started as soon as its own upload
+finishes, while the others are still uploading.
+
+    file A --upload--> gs://.../A --load--> table$20240102
+    file B --upload----------> gs://.../B --load--> table$20240103
+
+Large files are split into ``chunk_bytes`` parts that are uploaded on parallel
+threads by the GCS transfer manager (XML multipart upload). One thread budget is
+shared by both levels (see ``split_upload_workers``). Each load job
+targets its ``$YYYYMMDD`` partition decorator with WRITE_TRUNCATE, so rerunning
+a day replaces exactly that day. ``wait_for_jobs`` polls every running job in one
+loop, so a slow partition does not hide a fast one's failure.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from google.cloud.storage import transfer_manager
+
+
+def split_upload_workers(workers: int, files: int) -> tuple[int, int]:
+    """Split one upload thread budget between files and the parts of each file.
+
+    Args:
+        workers: Total concurrent uploads allowed (UPLOAD_WORKERS).
+        files: Number of files to upload.
+
+    Returns:
+        ``(file_workers, part_workers)``: files uploaded at once, and threads per
+        file for its parts. Their product never exceeds ``workers`` (minimum 1).
+    """
+    workers = max(1, workers)
+    file_workers = max(1, min(workers, files))
+    return file_workers, max(1, workers // file_workers)
+
+
+def partition_decorator(day: str) -> str:
+    """Return the ``$YYYYMMDD`` suffix for a kdb+ date (e.g. "2024.01.02")."""
+    return "$" + day.replace(".", "")
+
+
+def upload_file(
+    bucket, path: Path, blob_name: str, *, chunk_bytes: int, workers: int
+) -> str:
+    """Upload one file, in parallel parts when it is larger than one chunk.
+
+    Args:
+        bucket: A ``google.cloud.storage.Bucket``.
+        path: Local file to upload.
+        blob_name: Destination object name.
+        chunk_bytes: Part size for multipart uploads (GCS minimum is 5 MiB).
+        workers: Threads uploading parts of this file; 1 disables chunking.
+
+    Returns:
+        The ``gs://`` URI of the uploaded object.
+    """
+    blob = bucket.blob(blob_name)
+    if workers > 1 and path.stat().st_size > chunk_bytes:
+        transfer_manager.upload_chunks_concurrently(
+            str(path),
+            blob,
+            chunk_size=chunk_bytes,
+            max_workers=workers,
+            worker_type=transfer_manager.THREAD,
+        )
+    else:
+        blob.upload_from_filename(str(path))
+    return f"gs://{bucket.name}/{blob_name}"
+
+
+def wait_for_jobs(
+    jobs: dict[str, Any],
+    *,
+    poll_seconds: float = 1.0,
+    on_done: Callable[[str, Any], None] | None = None,
+) -> None:
+    """Poll BigQuery jobs together until every one has finished.
+
+    Args:
+        jobs: Running jobs keyed by a label (e.g. the partition date).
+        poll_seconds: Pause between polling rounds.
+        on_done: Called with ``(label, job)`` for each job that succeeds, in
+            completion order.
+
+    Raises:
+        RuntimeError: After all jobs finish, if any of them failed.
+    """
+    pending = dict(jobs)
+    errors = {}
+    while pending:
+        for label, job in list(pending.items()):
+            if not job.done():
+                continue
+            del pending[label]
+            if job.error_result:
+                errors[label] = job.error_result.get("message", job.error_result)
+            elif on_done is not None:
+                on_done(label, job)
+        if pending:
+            time.sleep(poll_seconds)
+    if errors:
+        details = "; ".join(f"{label}: {msg}" for label, msg in errors.items())
+        raise RuntimeError(f"{len(errors)} load job(s) failed: {details}")
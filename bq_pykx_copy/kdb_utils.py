@@ -12,9 +12,18 @@ conversion decisions that matter for this migration:
     3. Ingestion timestamp: plain TIMESTAMP columns are cast to microsecond
        precision, which is what BigQuery's TIMESTAMP type stores.
 
+With ``dictionary_symbols=True``, kdb+ symbol columns (``kdb_type == "s"``) are
+emitted as Arrow dictionary arrays instead of plain strings, so the Parquet
+writer stores them as dictionary pages. The symbol-null rule still applies: an
+empty symbol becomes a null index rather than an empty dictionary value.
+
 ``arrow_align`` takes a plain ``pyarrow.Table`` so it can be unit-tested without
-a running kdb+ instance. ``chunk_to_arrow`` reads raw q timestamp longs first,
-then converts the remaining columns through PyKX's Arrow interface.
+a running kdb+ instance. ``chunk_to_arrow`` converts raw q long and timestamp
+buffers directly (one copy for longs; one epoch-shift pass for timestamps),
+converts the remaining columns through PyKX's Arrow interface, and
+``arrow_align`` then skips every cast whose type already matches. The longs are
+copied because the resulting table outlives the q chunk on the writer thread;
+the memory-mapped reader (``hdb_reader``) wraps its file-backed longs zero-copy.
 """
 
 from __future__ import annotations
@@ -28,7 +37,13 @@ import pyarrow as pa
 import pyarrow.compute as pc
 
 import config  # noqa: F401  (import for PyKX license side-effects before pykx)
-from schema import Column
+from schema import (
+    LAYOUTS,
+    Column,
+    field_name,
+    message_groups,
+    top_level_columns,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +74,37 @@ def peak_rss_mb() -> float:
     return rss / (1024.0**2 if sys.platform == "darwin" else 1024.0)
 
 
+def worker_slots(
+    workers: int, rss_budget_mb: float, worker_peak_mb: float | None
+) -> int:
+    """Return how many conversion workers may run at once under an RSS budget.
+
+    Until one partition has finished there is no per-worker memory estimate, so
+    a budgeted pool starts with a single probe worker and widens once the first
+    peak is known.
+
+    Args:
+        workers: Configured pool size.
+        rss_budget_mb: Total resident-memory budget in MiB; ``<= 0`` disables
+            throttling.
+        worker_peak_mb: Largest peak RSS reported by a worker so far, or
+            ``None`` before any partition has completed.
+
+    Returns:
+        A concurrency limit between 1 and ``workers``.
+
+    Raises:
+        ValueError: If ``workers`` is not positive.
+    """
+    if workers <= 0:
+        raise ValueError("workers must be positive")
+    if rss_budget_mb <= 0:
+        return workers
+    if not worker_peak_mb:
+        return 1
+    return max(1, min(workers, int(rss_budget_mb // worker_peak_mb)))
+
+
 def chunk_ranges(n: int, chunk: int) -> list[tuple[int, int]]:
     """Split ``n`` rows into inclusive ``(start, end)`` index windows.
 
@@ -88,13 +134,63 @@ def _string_empty_to_null(arr: pa.ChunkedArray | pa.Array):
     return pc.if_else(mask, pa.scalar(None, type=pa.string()), arr)
 
 
-def arrow_align(table: pa.Table, schema: list[Column]) -> pa.Table:
+SYMBOL_DICTIONARY_TYPE = pa.dictionary(pa.int32(), pa.string())
+
+
+def _dictionary_empty_to_null(arr: pa.ChunkedArray | pa.Array):
+    """Null out dictionary indices that point at the empty symbol.
+
+    Only the (small) dictionary is compared against ``""``; the row data is an
+    integer membership test on the indices.
+    """
+    if isinstance(arr, pa.ChunkedArray):
+        return pa.chunked_array(
+            [_dictionary_empty_to_null(chunk) for chunk in arr.chunks], type=arr.type
+        )
+    is_empty = pc.fill_null(pc.equal(arr.dictionary, ""), False)
+    empty = np.flatnonzero(is_empty.to_numpy(zero_copy_only=False))
+    if not len(empty):
+        return arr
+    mask = pc.is_in(arr.indices, value_set=pa.array(empty, type=arr.indices.type))
+    indices = pc.if_else(mask, pa.scalar(None, type=arr.indices.type), arr.indices)
+    return pa.DictionaryArray.from_arrays(indices, arr.dictionary)
+
+
+def _symbol_column(a: pa.ChunkedArray | pa.Array, *, dictionary: bool):
+    """Normalise a kdb+ symbol column to nullable strings or a dictionary array."""
+    if pa.types.is_dictionary(a.type):
+        a = _dictionary_empty_to_null(a)
+        if dictionary:
+            return a.cast(SYMBOL_DICTIONARY_TYPE)
+        return a.cast(pa.string())
+    if not pa.types.is_string(a.type):
+        a = a.cast(pa.string())
+    a = _string_empty_to_null(a)
+    if dictionary:
+        return pc.dictionary_encode(a).cast(SYMBOL_DICTIONARY_TYPE)
+    return a
+
+
+def _cast(a: pa.ChunkedArray | pa.Array, target: pa.DataType, *, safe: bool = True):
+    """Cast ``a`` to ``target``, returning it untouched if already that type.
+
+    The fused readers (``q_timestamp_raw_to_arrow``, ``q_long_raw_to_arrow``)
+    already produce final types, so most columns skip the cast kernel.
+    """
+    return a if a.type == target else a.cast(target, safe=safe)
+
+
+def arrow_align(
+    table: pa.Table, schema: list[Column], *, dictionary_symbols: bool = False
+) -> pa.Table:
     """Align an Arrow table's columns/types to the target BigQuery schema.
 
     Args:
         table: Source Arrow table (e.g. from ``PyKX.Table.pa()``) containing all
             columns named in ``schema``.
         schema: Ordered target column definitions.
+        dictionary_symbols: Emit kdb+ symbol columns as dictionary arrays of
+            ``SYMBOL_DICTIONARY_TYPE``; otherwise they are plain strings.
 
     Returns:
         A new Arrow table with columns in schema order and BigQuery-compatible
@@ -108,19 +204,17 @@ def arrow_align(table: pa.Table, schema: list[Column]) -> pa.Table:
 
         if col.is_event_ts_nanos:
             # Arrow timestamp[ns] -> INT64 nanoseconds since epoch (lossless).
-            a = a.cast(pa.int64())
+            a = _cast(a, pa.int64())
         elif col.bq_type == "TIMESTAMP":
             # safe=False: intentionally truncate ns -> us (BigQuery TIMESTAMP is
             # microsecond). Use is_event_ts_nanos + INT64 to keep full precision.
-            a = a.cast(pa.timestamp("us"), safe=False)
+            a = _cast(a, pa.timestamp("us"), safe=False)
         elif col.bq_type == "STRING":
-            if not pa.types.is_string(a.type):
-                a = a.cast(pa.string())
-            a = _string_empty_to_null(a)
+            a = _symbol_column(a, dictionary=dictionary_symbols and col.kdb_type == "s")
         elif col.bq_type == "INT64":
-            a = a.cast(pa.int64())
+            a = _cast(a, pa.int64())
         elif col.bq_type == "DATE":
-            a = a.cast(pa.date32())
+            a = _cast(a, pa.date32())
 
         arrays.append(a)
         names.append(col.name)
@@ -128,48 +222,111 @@ def arrow_align(table: pa.Table, schema: list[Column]) -> pa.Table:
     return pa.table(arrays, names=names)
 
 
-_Q_TIMESTAMP_NULL = np.iinfo(np.int64).min
+_Q_LONG_NULL = np.iinfo(np.int64).min
+_Q_TIMESTAMP_NULL = _Q_LONG_NULL
 _Q_TIMESTAMP_NEG_INF = _Q_TIMESTAMP_NULL + 1
 _Q_TIMESTAMP_POS_INF = np.iinfo(np.int64).max
 _Q_TO_UNIX_EPOCH_NS = 946_684_800_000_000_000
 
 
+def _wrap_longs(
+    values: np.ndarray, nulls: np.ndarray | None, arrow_type: pa.DataType
+) -> pa.Array:
+    """Wrap an int64 buffer as ``arrow_type`` without copying it.
+
+    The validity bitmap is packed straight from the null mask, which is an
+    order of magnitude faster than ``pa.array(..., mask=...)``.
+    """
+    validity = None
+    null_count = 0
+    if nulls is not None:
+        null_count = int(np.count_nonzero(nulls))
+        if null_count:
+            validity = pa.py_buffer(np.packbits(~nulls, bitorder="little"))
+    return pa.Array.from_buffers(
+        arrow_type,
+        len(values),
+        [validity, pa.py_buffer(values)],
+        null_count=null_count,
+    )
+
+
+def q_long_raw_to_arrow(values: np.ndarray) -> pa.Array:
+    """Wrap raw q longs as Arrow int64, mapping ``0Nj`` to null without copying.
+
+    The data buffer is shared with ``values`` (a q vector, or a mapped column
+    file); only a validity bitmap is built, and only when there are nulls.
+    """
+    values = np.ascontiguousarray(values, dtype=np.int64)
+    return _wrap_longs(values, values == _Q_LONG_NULL, pa.int64())
+
+
 def q_timestamp_raw_to_arrow(
     raw_values: np.ndarray, *, preserve_nanoseconds: bool
 ) -> pa.Array:
     """Convert raw q timestamps without overflowing the epoch adjustment.
 
     q stores nanoseconds from 2000, while Arrow uses the Unix 1970 epoch. Event
-    timestamps remain INT64 nanoseconds; regular timestamps become microseconds.
+    timestamps remain INT64 nanoseconds; regular timestamps become microseconds,
+    truncated toward zero.
+
+    Each column is range-checked with one comparison and one ``max``, and the
+    epoch shift (plus the microsecond division) writes a single output buffer
+    in place, which is wrapped as the final Arrow type, so no intermediate
+    copies or later casts are needed.
     """
-    raw = np.asarray(raw_values, dtype=np.int64)
-    if np.any((raw == _Q_TIMESTAMP_NEG_INF) | (raw == _Q_TIMESTAMP_POS_INF)):
+    raw = np.ascontiguousarray(raw_values, dtype=np.int64)
+    arrow_type = pa.int64() if preserve_nanoseconds else pa.timestamp("us")
+    if not len(raw):
+        return pa.array([], type=arrow_type)
+    highest = raw.max()
+    if highest == _Q_TIMESTAMP_POS_INF:
+        raise ValueError("q timestamp infinities are not supported")
+    # 0Np and -0Wp are the two smallest longs: one comparison finds both.
+    nulls = raw <= _Q_TIMESTAMP_NEG_INF
+    if nulls.any() and np.any(raw == _Q_TIMESTAMP_NEG_INF):
         raise ValueError("q timestamp infinities are not supported")
 
-    null_mask = raw == _Q_TIMESTAMP_NULL
-    values = raw.copy()
-    values[null_mask] = 0
     if preserve_nanoseconds:
-        if np.any(values > _Q_TIMESTAMP_POS_INF - _Q_TO_UNIX_EPOCH_NS):
+        if highest > _Q_TIMESTAMP_POS_INF - _Q_TO_UNIX_EPOCH_NS:
             raise ValueError("q timestamp is outside the Unix nanosecond range")
-        arrow_values = pa.array(values, mask=null_mask, type=pa.int64())
-        return pc.add_checked(arrow_values, pa.scalar(_Q_TO_UNIX_EPOCH_NS))
-
-    micros = np.floor_divide(values, 1000)
-    micros[(values < 0) & (np.remainder(values, 1000) != 0)] += 1
-    micros += _Q_TO_UNIX_EPOCH_NS // 1000
-    return pa.array(micros, mask=null_mask, type=pa.timestamp("us"))
+        out = np.add(raw, _Q_TO_UNIX_EPOCH_NS)
+    else:
+        # Truncate toward zero: bias negatives by 999 (x >> 63 is -1 for them,
+        # 0 otherwise), then floor-divide, all within one output buffer.
+        out = np.right_shift(raw, 63)
+        np.bitwise_and(out, 999, out=out)
+        np.add(out, raw, out=out)
+        np.floor_divide(out, 1000, out=out)
+        np.add(out, _Q_TO_UNIX_EPOCH_NS // 1000, out=out)
+    return _wrap_longs(out, nulls, arrow_type)
+
+
+def _owned(a: pa.ChunkedArray | pa.Array) -> pa.ChunkedArray | pa.Array:
+    """Return ``a`` in buffers that share no memory with q.
+
+    PyKX builds string columns (symbols) from scratch, but fixed-width columns
+    may be views of the q vector, so those are copied.
+    """
+    if pa.types.is_string(a.type) or pa.types.is_dictionary(a.type):
+        return a
+    chunks = a.chunks if isinstance(a, pa.ChunkedArray) else [a]
+    return pa.concat_arrays(chunks) if chunks else pa.array([], type=a.type)
 
 
-def chunk_to_arrow(qtab_chunk, schema: list[Column]) -> pa.Table:
+def chunk_to_arrow(
+    qtab_chunk, schema: list[Column], *, dictionary_symbols: bool = False
+) -> pa.Table:
     """Convert a PyKX table chunk to a schema-aligned Arrow table.
 
     Args:
         qtab_chunk: A PyKX table already sliced to a chunk of rows.
         schema: Ordered target column definitions.
+        dictionary_symbols: See ``arrow_align``.
 
     Returns:
-        A schema-aligned Arrow table (see ``arrow_align``).
+        A schema-aligned Arrow table (see ``arrow_align``) whose buffers are
+        all Python-owned, so it can be released on any thread.
     """
     arrays = []
     for col in schema:
@@ -181,32 +338,102 @@ def chunk_to_arrow(qtab_chunk, schema: list[Column]) -> pa.Table:
                     preserve_nanoseconds=col.is_event_ts_nanos,
                 )
             )
+        elif col.kdb_type == "j":
+            # Copy: the table is released off the q thread (see chunk_pipeline).
+            arrays.append(q_long_raw_to_arrow(np.array(q_column.np(raw=True))))
         else:
-            arrays.append(q_column.pa())
-    return arrow_align(pa.table(arrays, names=[col.name for col in schema]), schema)
+            arrays.append(_owned(q_column.pa()))
+    return arrow_align(
+        pa.table(arrays, names=[col.name for col in schema]),
+        schema,
+        dictionary_symbols=dictionary_symbols,
+    )
 
 
-def arrow_schema(schema: list[Column]) -> pa.Schema:
+def arrow_schema(
+    schema: list[Column], *, dictionary_symbols: bool = False, layout: str = "flat"
+) -> pa.Schema:
     """Build the target Arrow schema (also the Parquet file schema).
 
     Args:
         schema: Ordered target column definitions.
+        dictionary_symbols: Type kdb+ symbol columns as
+            ``SYMBOL_DICTIONARY_TYPE`` (see ``arrow_align``).
+        layout: ``"flat"`` for one field per column, or ``"struct"`` to pack
+            each message group into one nullable STRUCT field (see
+            ``pack_struct_layout``).
 
     Returns:
         A ``pyarrow.Schema`` with all fields nullable.
+
+    Raises:
+        ValueError: If ``layout`` is unknown.
     """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}; use one of {LAYOUTS}")
     type_map = {
         "INT64": pa.int64(),
         "STRING": pa.string(),
         "DATE": pa.date32(),
         "TIMESTAMP": pa.timestamp("us"),
     }
-    fields = [
-        pa.field(
-            c.name,
-            pa.int64() if c.is_event_ts_nanos else type_map[c.bq_type],
-            nullable=True,
+
+    def field_type(c: Column) -> pa.DataType:
+        if c.is_event_ts_nanos:
+            return pa.int64()
+        if dictionary_symbols and c.kdb_type == "s" and c.bq_type == "STRING":
+            return SYMBOL_DICTIONARY_TYPE
+        return type_map[c.bq_type]
+
+    if layout == "flat":
+        return pa.schema(
+            [pa.field(c.name, field_type(c), nullable=True) for c in schema]
         )
-        for c in schema
-    ]
+    groups = message_groups(schema)
+    fields = []
+    for name in top_level_columns(schema, layout):
+        if name in groups:
+            members = [
+                pa.field(field_name(c), field_type(c), nullable=True)
+                for c in groups[name]
+            ]
+            fields.append(pa.field(name, pa.struct(members), nullable=True))
+        else:
+            col = next(c for c in schema if c.name == name)
+            fields.append(pa.field(name, field_type(col), nullable=True))
     return pa.schema(fields)
+
+
+def pack_struct_layout(table: pa.Table, schema: list[Column]) -> pa.Table:
+    """Pack each message group of a flat aligned table into a STRUCT column.
+
+    A group's STRUCT is null on rows where every one of its fields is null (the
+    common case: a row only populates its own message type), so the table
+    stores one null per inactive group instead of one per field.
+
+    Args:
+        table: A flat, schema-aligned table (e.g. from ``arrow_align``).
+        schema: Ordered target column definitions.
+
+    Returns:
+        A table with the ``"struct"`` layout's top-level columns.
+    """
+    groups = message_groups(schema)
+    arrays = []
+    names = top_level_columns(schema, "struct")
+    for name in names:
+        if name not in groups:
+            arrays.append(table.column(name))
+            continue
+        children = [table.column(c.name).combine_chunks() for c in groups[name]]
+        active = children[0].is_valid()
+        for child in children[1:]:
+            active = pc.or_(active, child.is_valid())
+        arrays.append(
+            pa.StructArray.from_arrays(
+                children,
+                names=[field_name(c) for c in groups[name]],
+                mask=pc.invert(active),
+            )
+        )
+    return pa.table(arrays, names=names)
@@ -0,0 +1,183 @@
+"""Conversion manifest: which partitions are converted, and which are loaded.
+
+Production HDBs mostly gain one new day and see the occasional correction, so
+reconverting every partition on each run wastes hours. The manifest records, per
+partition:
+
+    * ``source``: a fingerprint of the partition's splayed column files,
+    * ``schema``: a fingerprint of everything that shapes the output (schema,
+      layout, symbol encoding, Parquet settings),
+    * ``output``: the SHA-256 of the Parquet file written, plus its size and
+      mtime (``output_size``, ``output_mtime_ns``), and
+    * ``loaded``: the ``output`` checksum last loaded into BigQuery.
+
+Step 1 skips a partition when its source and schema fingerprints match and the
+Parquet file on disk is unchanged. The file's size and mtime are compared
+first; it is only re-hashed against the recorded checksum when they differ (or
+when ``verify`` is requested), so an up-to-date rerun reads no Parquet data.
+Step 2 loads only the partitions whose ``output`` differs from ``loaded``.
+
+Source fingerprints use file names, sizes, and mtimes by default (``stat``), or
+the file contents (``content``), which also catches rewrites that preserve size
+and mtime. The shared ``sym`` file is not part of any partition's fingerprint:
+kdb+ only appends to it, so existing enumerations keep their meaning.
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import os
+from collections.abc import Iterable
+from dataclasses import asdict
+from pathlib import Path
+
+from schema import Column
+
+FINGERPRINT_MODES = ("stat", "content")
+_READ_BYTES = 1024 * 1024
+
+
+def file_checksum(path: Path) -> str:
+    """Return the hex SHA-256 of a file, read in bounded blocks."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while block := f.read(_READ_BYTES):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_fingerprint(part_dir: Path, mode: str = "stat") -> str:
+    """Fingerprint one splayed partition directory.
+
+    Args:
+        part_dir: The partition's table directory (``hdb/<date>/<table>``).
+        mode: ``"stat"`` (names, sizes, mtimes) or ``"content"`` (file hashes).
+
+    Returns:
+        A hex digest that changes when any column file changes.
+
+    Raises:
+        ValueError: If ``mode`` is unknown.
+        FileNotFoundError: If the partition directory does not exist.
+    """
+    if mode not in FINGERPRINT_MODES:
+        raise ValueError(f"Unknown fingerprint mode {mode!r}; use {FINGERPRINT_MODES}")
+    digest = hashlib.sha256()
+    for path in sorted(p for p in part_dir.iterdir() if p.is_file()):
+        if mode == "content":
+            detail = file_checksum(path)
+        else:
+            stat = path.stat()
+            detail = f"{stat.st_size}:{stat.st_mtime_ns}"
+        digest.update(f"{path.name}\0{detail}\n".encode())
+    return digest.hexdigest()
+
+
+def schema_fingerprint(schema: list[Column], **settings) -> str:
+    """Fingerprint the schema plus any output-shaping settings (layout, codec...)."""
+    payload = {"columns": [asdict(c) for c in schema], "settings": settings}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _output_stat(path: Path) -> dict:
+    stat = path.stat()
+    return {"output_size": stat.st_size, "output_mtime_ns": stat.st_mtime_ns}
+
+
+class Manifest:
+    """Per-partition conversion and load state, persisted as JSON.
+
+    Args:
+        path: The manifest file; a missing file is an empty manifest.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.partitions: dict[str, dict] = {}
+        if path.is_file():
+            self.partitions = json.loads(path.read_text(encoding="utf-8"))["partitions"]
+
+    def is_current(
+        self,
+        day: str,
+        source: str,
+        schema: str,
+        output: Path,
+        *,
+        verify: bool = False,
+    ) -> bool:
+        """Whether ``output`` is an up-to-date conversion of the source partition.
+
+        A file with the recorded size and mtime is trusted without reading it
+        unless ``verify`` is set. Otherwise it is hashed; if the checksum still
+        matches, the entry's size and mtime are refreshed (persisted on the next
+        ``save``) so later runs can skip the hash again.
+        """
+        entry = self.partitions.get(day)
+        if (
+            entry is None
+            or entry["source"] != source
+            or entry["schema"] != schema
+            or not output.is_file()
+        ):
+            return False
+        stat = _output_stat(output)
+        if not verify and all(entry.get(key) == value for key, value in stat.items()):
+            return True
+        if file_checksum(output) != entry["output"]:
+            return False
+        entry.update(stat)
+        return True
+
+    def record_conversion(
+        self, day: str, source: str, schema: str, output: Path, rows: int
+    ) -> None:
+        """Record a freshly written partition (keeping its last-loaded checksum)."""
+        previous = self.partitions.get(day, {})
+        self.partitions[day] = {
+            "source": source,
+            "schema": schema,
+            "output": file_checksum(output),
+            **_output_stat(output),
+            "rows": rows,
+            "converted_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "loaded": previous.get("loaded"),
+        }
+
+    def forget(self, day: str) -> None:
+        """Drop a partition's entry, so it is reconverted and reloaded."""
+        self.partitions.pop(day, None)
+
+    def pending_loads(self, days: Iterable[str]) -> list[str]:
+        """Return the days whose current output has not been loaded yet.
+
+        Days without a manifest entry (converted before the manifest existed)
+        are always pending.
+        """
+        return [
+            day
+            for day in days
+            if (entry := self.partitions.get(day)) is None
+            or entry["loaded"] != entry["output"]
+        ]
+
+    def record_load(self, day: str) -> None:
+        """Mark a partition's current output as loaded."""
+        if day in self.partitions:
+            self.partitions[day]["loaded"] = self.partitions[day]["output"]
+
+    def forget_loads(self) -> None:
+        """Mark every partition as not loaded (e.g. after the table is recreated)."""
+        for entry in self.partitions.values():
+            entry["loaded"] = None
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        temp = self.path.with_suffix(".json.tmp")
+        temp.write_text(
+            json.dumps({"partitions": self.partitions}, indent=2, sort_keys=True),
+            encoding="utf-8",
+        )
+        os.replace(temp, self.path)
@@ -0,0 +1,234 @@
+"""Single-pass, full-column parity statistics for source and BigQuery partitions.
+
+For every column of a partition both sides compute the same four figures:
+
+    * null count,
+    * min and max,
+    * an order-independent checksum (a plain sum, so row order never matters).
+
+Values are compared in a common integer domain where possible: TIMESTAMP as
+microseconds since 1970, DATE as days since 1970, INT64 as is. The checksum of
+an integer column is the exact sum of its values; a STRING column sums a 56-bit
+hash (the first 7 bytes of MD5) of each value, which BigQuery can reproduce with
+``MD5``/``TO_HEX``. Sums are exact on both sides (Python ints locally, NUMERIC in
+BigQuery), so there is no overflow to disagree about.
+
+The source side streams Arrow chunks (from the HDB reader or the written
+Parquet) once, with vectorized Arrow/NumPy kernels per column. The target side
+is one generated aggregate query per partition.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from schema import Column, bq_column_expr, field_name, message_group
+
+_LOW_32 = np.int64(0xFFFFFFFF)
+
+
+def string_hash(value: str) -> int:
+    """Return the 56-bit hash summed for STRING columns (matches ``_target_hash``)."""
+    return int.from_bytes(hashlib.md5(value.encode()).digest()[:7], "big")
+
+
+@dataclass
+class ColumnStats:
+    """Mergeable parity statistics for one column.
+
+    Attributes:
+        nulls: Null count.
+        min: Smallest non-null value in the comparison domain, or ``None``.
+        max: Largest non-null value in the comparison domain, or ``None``.
+        checksum: Order-independent sum (see module docstring).
+    """
+
+    nulls: int = 0
+    min: int | str | None = None
+    max: int | str | None = None
+    checksum: int = 0
+
+    def merge(self, other: ColumnStats) -> None:
+        """Fold another chunk's statistics into this one."""
+        self.nulls += other.nulls
+        self.checksum += other.checksum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+
+@dataclass
+class PartitionStats:
+    """Row count plus ``ColumnStats`` per column name for one partition."""
+
+    rows: int = 0
+    columns: dict[str, ColumnStats] = field(default_factory=dict)
+
+
+def _integer_stats(values: np.ndarray) -> ColumnStats:
+    if not len(values):
+        return ColumnStats()
+    # Split each value into 32-bit halves so the two partial sums cannot
+    # overflow int64, then recombine them as an exact Python int.
+    high = int((values >> 32).sum())
+    low = int((values & _LOW_32).sum())
+    return ColumnStats(
+        min=int(values.min()), max=int(values.max()), checksum=(high << 32) + low
+    )
+
+
+def _string_stats(arr: pa.Array) -> ColumnStats:
+    if not pa.types.is_dictionary(arr.type):
+        arr = arr.dictionary_encode()
+    counts = np.bincount(
+        arr.indices.drop_null().to_numpy(zero_copy_only=False),
+        minlength=len(arr.dictionary),
+    )
+    used = np.flatnonzero(counts)
+    if not len(used):
+        return ColumnStats()
+    values = arr.dictionary.take(pa.array(used)).to_pylist()
+    bounds = pc.min_max(pa.array(values, type=pa.string()))
+    return ColumnStats(
+        min=bounds["min"].as_py(),
+        max=bounds["max"].as_py(),
+        checksum=sum(
+            int(counts[i]) * string_hash(v) for i, v in zip(used, values, strict=True)
+        ),
+    )
+
+
+def column_stats(arr: pa.Array | pa.ChunkedArray, col: Column) -> ColumnStats:
+    """Compute parity statistics for one column chunk.
+
+    Args:
+        arr: The column's values as produced by ``kdb_utils.arrow_align``.
+        col: The column definition (``bq_type`` picks the comparison domain).
+
+    Returns:
+        The chunk's ``ColumnStats``.
+    """
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    if col.bq_type == "STRING":
+        stats = _string_stats(arr)
+    else:
+        # TIMESTAMP -> int64 micros and DATE -> int32 days are zero-copy views.
+        if pa.types.is_timestamp(arr.type):
+            arr = arr.cast(pa.timestamp("us")).view(pa.int64())
+        elif pa.types.is_date32(arr.type):
+            arr = arr.view(pa.int32())
+        values = arr.drop_null().to_numpy(zero_copy_only=False).astype(np.int64)
+        stats = _integer_stats(values)
+    stats.nulls = arr.null_count
+    return stats
+
+
+def flat_columns(table: pa.Table, schema: list[Column]) -> dict[str, pa.Array]:
+    """Return every schema column of a flat or STRUCT-layout table by name."""
+    arrays = {}
+    for col in schema:
+        if col.name in table.column_names:
+            arrays[col.name] = table.column(col.name)
+        else:
+            group = table.column(message_group(col)).combine_chunks()
+            arrays[col.name] = pc.struct_field(group, field_name(col))
+    return arrays
+
+
+def source_stats(tables: Iterable[pa.Table], schema: list[Column]) -> PartitionStats:
+    """Accumulate partition statistics over a stream of Arrow chunks.
+
+    Args:
+        tables: The partition's chunks, in any order and either layout.
+        schema: Ordered column definitions.
+
+    Returns:
+        Statistics for the whole partition, after a single pass.
+    """
+    stats = PartitionStats(columns={col.name: ColumnStats() for col in schema})
+    for table in tables:
+        stats.rows += table.num_rows
+        arrays = flat_columns(table, schema)
+        for col in schema:
+            stats.columns[col.name].merge(column_stats(arrays[col.name], col))
+    return stats
+
+
+def _target_value(col: Column, layout: str) -> str:
+    expr = bq_column_expr(col, layout)
+    if col.bq_type == "TIMESTAMP":
+        return f"UNIX_MICROS({expr})"
+    if col.bq_type == "DATE":
+        return f"UNIX_DATE({expr})"
+    return expr
+
+
+def _target_hash(col: Column, value: str) -> str:
+    if col.bq_type == "STRING":
+        value = f"CAST(CONCAT('0x', TO_HEX(SUBSTR(MD5({value}), 1, 7))) AS INT64)"
+    return f"CAST({value} AS NUMERIC)"
+
+
+def target_query(table_id: str, schema: list[Column], layout: str, iso_day: str) -> str:
+    """Render the one aggregate query that computes a partition's statistics.
+
+    Args:
+        table_id: Fully qualified ``project.dataset.table``.
+        schema: Ordered column definitions.
+        layout: ``"flat"`` or ``"struct"``.
+        iso_day: Partition date as ``YYYY-MM-DD``.
+
+    Returns:
+        SQL returning one row with ``row_count`` and ``c<i>_{nulls,min,max,sum}``.
+    """
+    exprs = ["COUNT(*) AS row_count"]
+    for i, col in enumerate(schema):
+        value = _target_value(col, layout)
+        exprs += [
+            f"COUNTIF({bq_column_expr(col, layout)} IS NULL) AS c{i}_nulls",
+            f"MIN({value}) AS c{i}_min",
+            f"MAX({value}) AS c{i}_max",
+            f"SUM({_target_hash(col, value)}) AS c{i}_sum",
+        ]
+    select = ",\n  ".join(exprs)
+    return f"SELECT\n  {select}\nFROM `{table_id}`\nWHERE date = DATE '{iso_day}'"
+
+
+def target_stats(row, schema: list[Column]) -> PartitionStats:
+    """Parse the row returned by ``target_query`` into ``PartitionStats``."""
+    return PartitionStats(
+        rows=row["row_count"],
+        columns={
+            col.name: ColumnStats(
+                nulls=row[f"c{i}_nulls"],
+                min=row[f"c{i}_min"],
+                max=row[f"c{i}_max"],
+                checksum=int(row[f"c{i}_sum"] or 0),
+            )
+            for i, col in enumerate(schema)
+        },
+    )
+
+
+def compare_stats(source: PartitionStats, target: PartitionStats) -> list[str]:
+    """Return one message per differing figure; empty when the partitions match."""
+    problems = []
+    if source.rows != target.rows:
+        problems.append(f"rows: source={source.rows} target={target.rows}")
+    for name, want in source.columns.items():
+        got = target.columns.get(name)
+        if got is None:
+            problems.append(f"{name}: missing from target")
+            continue
+        for figure in ("nulls", "min", "max", "checksum"):
+            a, b = getattr(want, figure), getattr(got, figure)
+            if a != b:
+                problems.append(f"{name}.{figure}: source={a} target={b}")
+    return problems
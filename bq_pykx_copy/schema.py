@@ -17,6 +17,12 @@ Each Column knows:
   - bq_type  : the intended BigQuery type
   - null_ratio: fraction of rows that should be null (drives realistic sparsity)
   - is_event_ts_nanos: True for nanosecond timestamps we keep as INT64
+
+Two target layouts are supported:
+  - "flat"   : one top-level column per schema column (428 columns)
+  - "struct" : each `mtXX__*` message group packed into one nullable STRUCT
+               named `mtXX`, so a row carries a single null for every group
+               other than its own
 """
 
 from __future__ import annotations
@@ -125,6 +131,86 @@ def build_schema() -> list[Column]:
     return cols
 
 
+LAYOUTS = ("flat", "struct")
+_GROUP_SEPARATOR = "__"
+
+
+def message_group(col: Column) -> str | None:
+    """Return the STRUCT a column packs into under the struct layout, if any."""
+    prefix, sep, _ = col.name.partition(_GROUP_SEPARATOR)
+    if sep and prefix.startswith("mt"):
+        return prefix
+    return None
+
+
+def message_groups(schema: list[Column]) -> dict[str, list[Column]]:
+    """Group the message-type columns by STRUCT name, in schema order."""
+    groups: dict[str, list[Column]] = {}
+    for col in schema:
+        group = message_group(col)
+        if group:
+            groups.setdefault(group, []).append(col)
+    return groups
+
+
+def field_name(col: Column) -> str:
+    """Return a column's name inside its STRUCT (or its top-level name)."""
+    return col.name.split(_GROUP_SEPARATOR, 1)[1] if message_group(col) else col.name
+
+
+def bq_column_expr(col: Column, layout: str = "flat") -> str:
+    """Return the BigQuery expression that reads ``col`` under ``layout``."""
+    group = message_group(col)
+    if layout == "struct" and group:
+        return f"{group}.{field_name(col)}"
+    return col.name
+
+
+def top_level_columns(schema: list[Column], layout: str = "flat") -> list[str]:
+    """Return the table's top-level column names under ``layout``."""
+    if layout == "flat":
+        return [c.name for c in schema]
+    names: list[str] = []
+    for col in schema:
+        name = message_group(col) or col.name
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def bq_ddl(table_id: str, schema: list[Column], layout: str = "flat") -> str:
+    """Render the partitioned/clustered BigQuery DDL for ``layout``.
+
+    Args:
+        table_id: Fully qualified ``project.dataset.table``.
+        schema: Ordered column definitions.
+        layout: ``"flat"`` or ``"struct"``.
+
+    Returns:
+        A ``CREATE TABLE IF NOT EXISTS`` statement.
+
+    Raises:
+        ValueError: If ``layout`` is unknown.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}; use one of {LAYOUTS}")
+    groups = message_groups(schema)
+    lines = []
+    for name in top_level_columns(schema, layout):
+        if name in groups and layout == "struct":
+            fields = ", ".join(f"{field_name(c)} {c.bq_type}" for c in groups[name])
+            lines.append(f"  {name} STRUCT<{fields}>")
+        else:
+            col = next(c for c in schema if c.name == name)
+            lines.append(f"  {name} {col.bq_type}")
+    body = ",\n".join(lines)
+    return (
+        f"CREATE TABLE IF NOT EXISTS `{table_id}` (\n{body}\n)\n"
+        f"PARTITION BY {partition_column()}\n"
+        f"CLUSTER BY {', '.join(bq_clustering_columns())}"
+    )
+
+
 def partition_column() -> str:
     """Return the column BigQuery should partition on (the kdb+ partition key)."""
     return "date"
@@ -136,7 +222,12 @@ def bq_clustering_columns() -> list[str]:
 
 
 if __name__ == "__main__":
+    import sys
+
     s = build_schema()
+    if len(sys.argv) > 1 and sys.argv[1] == "--ddl":
+        print(bq_ddl("PROJECT.DATASET.TABLE", s, *sys.argv[2:3]))
+        raise SystemExit
     from collections import Counter
 
     print(f"Total columns: {len(s)}")
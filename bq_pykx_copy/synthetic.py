@@ -0,0 +1,101 @@
+"""In-process synthetic partition for benchmarks (no kdb+ or PyKX required).
+
+``synthetic_table`` builds the already-converted Arrow form of one partition
+with the same shape as ``00_generate_synthetic_hdb.py``: a random message type
+per row, message-group columns populated only on rows of their own type (plus
+the extra optional-field nulls), and the remaining columns nulled at their
+``null_ratio``. Values are random, so compression figures are pessimistic in
+the same way as the generated HDB.
+"""
+
+from __future__ import annotations
+
+import datetime
+
+import numpy as np
+import pyarrow as pa
+
+from kdb_utils import arrow_align
+from schema import Column, message_group
+
+SYM_POOL = ["AAA", "BBB", "CCC", "DDD", "EEE", "FFF", "GGG", "HHH"]
+MESSAGE_TYPES = [f"mt{group:02d}" for group in range(1, 13)]
+_SYM_ARRAY = pa.array(SYM_POOL)
+_DAY_NS = 86_400_000_000_000
+
+
+def _day_start_ns(day: str) -> int:
+    date = datetime.date(*map(int, day.split(".")))
+    return (date - datetime.date(1970, 1, 1)).days * _DAY_NS
+
+
+def synthetic_table(
+    schema: list[Column],
+    n: int,
+    *,
+    day: str = "2024.01.02",
+    seed: int = 0,
+    dictionary_symbols: bool = False,
+) -> pa.Table:
+    """Generate one schema-aligned synthetic partition as an Arrow table.
+
+    Args:
+        schema: Ordered target column definitions.
+        n: Number of rows.
+        day: Partition date in kdb+ form.
+        seed: Random seed, for repeatable benchmarks.
+        dictionary_symbols: See ``kdb_utils.arrow_align``.
+
+    Returns:
+        A flat table in the form ``arrow_align`` produces.
+    """
+    rng = np.random.default_rng(seed)
+    day_start = _day_start_ns(day)
+    codes = rng.integers(0, len(MESSAGE_TYPES), n)
+    group_code = {name: i for i, name in enumerate(MESSAGE_TYPES)}
+
+    arrays = []
+    for col in schema:
+        if col.name == "date":
+            days = (day_start // _DAY_NS) * np.ones(n, dtype=np.int32)
+            arrays.append(pa.array(days, type=pa.date32()))
+            continue
+        if col.name == "message_type":
+            arrays.append(
+                pa.DictionaryArray.from_arrays(
+                    pa.array(codes.astype(np.int32)), pa.array(MESSAGE_TYPES)
+                ).cast(pa.string())
+            )
+            continue
+        if col.name == "seq_no":
+            arrays.append(pa.array(np.arange(n, dtype=np.int64)))
+            continue
+
+        group = message_group(col)
+        if group:
+            nulls = codes != group_code[group]
+            optional = max(0.0, 1.0 - (1.0 - col.null_ratio) * len(MESSAGE_TYPES))
+            if optional:
+                nulls |= rng.random(n) < optional
+        else:
+            nulls = rng.random(n) < col.null_ratio
+
+        if col.kdb_type == "s":
+            indices = pa.array(
+                rng.integers(0, len(SYM_POOL), n, dtype=np.int32), mask=nulls
+            )
+            symbols = pa.DictionaryArray.from_arrays(indices, _SYM_ARRAY)
+            arrays.append(symbols.cast(pa.string()))
+        elif col.kdb_type == "p":
+            ns = day_start + rng.integers(0, _DAY_NS, n)
+            if col.is_event_ts_nanos:
+                arrays.append(pa.array(ns, mask=nulls, type=pa.int64()))
+            else:
+                arrays.append(pa.array(ns // 1000, mask=nulls, type=pa.timestamp("us")))
+        else:
+            arrays.append(
+                pa.array(rng.integers(0, 1_000_000, n), mask=nulls, type=pa.int64())
+            )
+
+    table = pa.table(arrays, names=[col.name for col in schema])
+    return arrow_align(table, schema, dictionary_symbols=dictionary_symbols)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Micro-benchmark the per-column kdb+ -> Arrow conversion kernels.
+
+Each column type is converted from raw q-layout buffers (int64 longs with
+``0N`` nulls, nanoseconds since 2000, sym-file enumeration indices), exactly as
+the q and mmap readers hand them to ``kdb_utils``, and then passed through
+``arrow_align``. No kdb+ license is needed. Reports rows per second per type, so
+regressions in the conversion core show up next to the code that causes them.
+
+Not collected by pytest (no ``test_`` prefix); ``test_kdb_utils.py`` runs it on a
+tiny input to keep it working.
+
+Run:
+    uv run python -m tests.bench_conversion --rows 2000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+
+import numpy as np
+import pyarrow as pa
+
+from kdb_utils import arrow_align, q_long_raw_to_arrow, q_timestamp_raw_to_arrow
+from schema import Column
+
+logger = logging.getLogger(__name__)
+
+_Q_NULL = np.iinfo(np.int64).min
+_SYMBOLS = pa.array(["", "AAA", "BBB", "CCC", "DDD", "EEE", "FFF", "GGG"])
+
+
+def _cases(rows: int, null_ratio: float, seed: int) -> dict:
+    """Return ``type -> (column, raw buffer, reader)`` benchmark cases."""
+    rng = np.random.default_rng(seed)
+    nulls = rng.random(rows) < null_ratio
+    longs = rng.integers(0, 1_000_000, rows)
+    longs[nulls] = _Q_NULL
+    stamps = rng.integers(7_000 * 86_400 * 10**9, 9_000 * 86_400 * 10**9, rows)
+    stamps[nulls] = _Q_NULL
+    enums = rng.integers(0, len(_SYMBOLS), rows)
+    return {
+        "long": (Column("qty", "j", "INT64", null_ratio), longs, q_long_raw_to_arrow),
+        "timestamp_us": (
+            Column("ts", "p", "TIMESTAMP", null_ratio),
+            stamps,
+            lambda raw: q_timestamp_raw_to_arrow(raw, preserve_nanoseconds=False),
+        ),
+        "timestamp_ns": (
+            Column("ts", "p", "INT64", null_ratio, is_event_ts_nanos=True),
+            stamps,
+            lambda raw: q_timestamp_raw_to_arrow(raw, preserve_nanoseconds=True),
+        ),
+        "symbol": (
+            Column("sym", "s", "STRING", null_ratio),
+            enums,
+            lambda raw: _SYMBOLS.take(pa.array(raw)),
+        ),
+    }
+
+
+def measure(
+    rows: int, *, repeats: int = 5, null_ratio: float = 0.3, seed: int = 0
+) -> dict[str, int]:
+    """Return the best-of-``repeats`` conversion rate per column type.
+
+    Args:
+        rows: Rows per column.
+        repeats: Timed runs per type; the fastest is reported.
+        null_ratio: Fraction of null rows.
+        seed: Random seed for the raw buffers.
+
+    Returns:
+        ``type -> rows per second`` (read + ``arrow_align``).
+    """
+    rates = {}
+    for name, (col, raw, read) in _cases(rows, null_ratio, seed).items():
+        best = float("inf")
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            arrow_align(pa.table({col.name: read(raw)}), [col])
+            best = min(best, time.perf_counter() - t0)
+        rates[name] = round(rows / max(best, 1e-9))
+    return rates
+
+
+def main() -> None:
+    """Print rows per second for each column type."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--null-ratio", type=float, default=0.3)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    rates = measure(args.rows, repeats=args.repeats, null_ratio=args.null_ratio)
+    logger.info("%-14s %16s", "column type", "rows/s")
+    for name, rate in rates.items():
+        logger.info("%-14s %16s", name, f"{rate:,}")
+
+
+if __name__ == "__main__":
+    main()
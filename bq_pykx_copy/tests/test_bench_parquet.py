@@ -0,0 +1,81 @@
+"""Tests for the Parquet encoding sweep (no kdb+ or BigQuery required)."""
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from bench_parquet import (
+    SCHEMA,
+    Encoding,
+    bench_encoding,
+    encoding_matrix,
+    recommend,
+)
+from synthetic import synthetic_table
+
+
+def _result(label, mb, write, read, rss=100.0, load=None):
+    return {
+        "label": label,
+        "parquet_mb": mb,
+        "write_seconds": write,
+        "read_seconds": read,
+        "load_seconds": load,
+        "peak_rss_mb": rss,
+    }
+
+
+def test_encoding_matrix_covers_every_combination():
+    """The sweep is the full cross product, each with a distinct label."""
+    matrix = encoding_matrix([1_000, 2_000], ["snappy", "zstd"], [True, False], [64])
+
+    assert len(matrix) == 8
+    assert len({e.label for e in matrix}) == 8
+    assert Encoding(250_000, "zstd", False, 64).env() == {
+        "PARQUET_ROW_GROUP": "250000",
+        "PARQUET_COMPRESSION": "zstd",
+        "PARQUET_DICTIONARY": "0",
+        "PARQUET_PAGE_KB": "64",
+    }
+
+
+def test_recommend_prefers_fastest_among_compact_files():
+    """A much larger file loses even when faster; within slack, speed wins."""
+    results = [
+        _result("small-slow", 10.0, 3.0, 1.0),
+        _result("small-fast", 10.5, 2.0, 1.0),
+        _result("big-fastest", 20.0, 0.5, 0.5),
+    ]
+
+    assert recommend(results)["label"] == "small-fast"
+    assert recommend(results, size_slack=1.0)["label"] == "big-fastest"
+
+
+def test_recommend_uses_load_time_and_rss_budget():
+    """Measured load time replaces read-back, and over-budget configs drop out."""
+    results = [
+        _result("a", 10.0, 1.0, 0.1, load=5.0),
+        _result("b", 10.0, 2.0, 3.0, load=1.0, rss=900.0),
+        _result("c", 10.0, 2.5, 0.1, load=1.0),
+    ]
+
+    assert recommend(results)["label"] == "b"
+    assert recommend(results, rss_budget_mb=500)["label"] == "c"
+
+
+def test_bench_encoding_writes_readable_row_groups(tmp_path):
+    """One configuration writes the whole partition with the requested layout."""
+    source_path = tmp_path / "partition.arrow"
+    table = synthetic_table(SCHEMA, 1_500, seed=3)
+    with pa.ipc.new_file(source_path, table.schema) as sink:
+        sink.write_table(table)
+
+    result = bench_encoding(
+        source_path, Encoding(1_000, "zstd", False, 64), tmp_path, None
+    )
+
+    meta = pq.ParquetFile(tmp_path / f"{result['label']}.parquet").metadata
+    assert meta.num_rows == 1_500
+    assert meta.num_row_groups == 2
+    assert meta.row_group(0).column(1).compression == "ZSTD"
+    assert result["load_seconds"] is None
+    assert result["rows_per_second"] > 0
@@ -0,0 +1,108 @@
+"""Tests for the bounded read -> convert -> write chunk pipeline."""
+
+import threading
+import time
+
+import pyarrow as pa
+import pytest
+
+from chunk_pipeline import run_chunk_pipeline
+
+
+def _table(window):
+    start, end = window
+    return pa.table({"i": pa.array(range(start, end + 1))})
+
+
+@pytest.mark.parametrize("convert_on_reader", [False, True])
+def test_run_chunk_pipeline_writes_every_chunk_in_order(convert_on_reader):
+    """Overlapped stages still write each chunk exactly once, in input order."""
+    written = []
+
+    stages = run_chunk_pipeline(
+        [(0, 2), (3, 5), (6, 6)],
+        lambda window: window,
+        _table,
+        lambda table: written.append(table.column("i").to_pylist()),
+        depth=1,
+        convert_on_reader=convert_on_reader,
+    )
+
+    assert written == [[0, 1, 2], [3, 4, 5], [6]]
+    assert stages["write"]["items"] == 3
+    assert stages["write"]["rows"] == 7
+    assert stages["convert"]["rows"] == 7
+
+
+def test_run_chunk_pipeline_reads_on_the_calling_thread():
+    """Reads stay on the caller's thread so embedded q is never called elsewhere."""
+    caller = threading.get_ident()
+    read_threads, write_threads = set(), set()
+
+    def read(window):
+        read_threads.add(threading.get_ident())
+        return window
+
+    def write(_table):
+        write_threads.add(threading.get_ident())
+
+    run_chunk_pipeline([(0, 1), (2, 3)], read, _table, write, depth=2)
+
+    assert read_threads == {caller}
+    assert caller not in write_threads
+
+
+def test_run_chunk_pipeline_bounds_chunks_in_flight():
+    """A stalled writer stops the reader after a fixed number of chunks."""
+    reads = []
+    read_ahead = []
+
+    def write(_table):
+        if not read_ahead:
+            time.sleep(0.3)  # let the reader run as far as it can
+            read_ahead.append(len(reads))
+
+    def read(window):
+        reads.append(window)
+        return window
+
+    run_chunk_pipeline([(i, i) for i in range(20)], read, _table, write, depth=1)
+
+    # One chunk held by the writer, one per queue, one in the converter, and one
+    # read chunk the reader is blocked trying to enqueue.
+    assert read_ahead == [5]
+    assert len(reads) == 20
+
+
+def test_run_chunk_pipeline_surfaces_writer_errors():
+    """A failing stage stops the pipeline and re-raises on the caller's thread."""
+    reads = []
+
+    def read(window):
+        reads.append(window)
+        return window
+
+    def write(_table):
+        raise OSError("disk full")
+
+    with pytest.raises(OSError, match="disk full"):
+        run_chunk_pipeline([(i, i) for i in range(100)], read, _table, write, depth=1)
+
+    assert len(reads) < 100
+
+
+def test_run_chunk_pipeline_depth_zero_is_sequential():
+    """Depth 0 runs every stage inline on the caller's thread."""
+    caller = threading.get_ident()
+    threads = set()
+
+    stages = run_chunk_pipeline(
+        [(0, 4)],
+        lambda window: window,
+        _table,
+        lambda _table: threads.add(threading.get_ident()),
+        depth=0,
+    )
+
+    assert threads == {caller}
+    assert stages["read"]["rows"] == 5
@@ -46,3 +46,16 @@ def test_resolve_gcp_project_raises_when_gcloud_missing(monkeypatch):
 
     with pytest.raises(RuntimeError):
         config.resolve_gcp_project()
+
+
+def test_expand_dates_keeps_single_dates_and_expands_weekday_ranges():
+    """Ranges expand to weekdays only; plain dates pass through in order."""
+    dates = config.expand_dates("2024.01.31, 2024.01.05..2024.01.09,")
+
+    assert dates == ["2024.01.31", "2024.01.05", "2024.01.08", "2024.01.09"]
+
+
+def test_expand_dates_rejects_backwards_ranges():
+    """A range whose end precedes its start is a configuration error."""
+    with pytest.raises(ValueError):
+        config.expand_dates("2024.02.01..2024.01.01")
@@ -0,0 +1,111 @@
+"""Tests for the step 2 upload/load helpers (no GCS or BigQuery required)."""
+
+import pytest
+
+import gcs_load
+from gcs_load import (
+    partition_decorator,
+    split_upload_workers,
+    upload_file,
+    wait_for_jobs,
+)
+
+
+class _Blob:
+    def __init__(self, name):
+        self.name = name
+        self.uploaded = None
+
+    def upload_from_filename(self, filename):
+        self.uploaded = filename
+
+
+class _Bucket:
+    name = "bucket"
+
+    def __init__(self):
+        self.blobs = []
+
+    def blob(self, name):
+        self.blobs.append(_Blob(name))
+        return self.blobs[-1]
+
+
+class _Job:
+    def __init__(self, polls_until_done, error=None):
+        self.polls = 0
+        self.polls_until_done = polls_until_done
+        self.error_result = error
+
+    def done(self):
+        self.polls += 1
+        return self.polls >= self.polls_until_done
+
+
+def test_partition_decorator_uses_compact_date():
+    """kdb+ dates map to BigQuery's $YYYYMMDD partition decorator."""
+    assert partition_decorator("2024.01.02") == "$20240102"
+
+
+def test_upload_file_chunks_only_large_files(tmp_path, monkeypatch):
+    """Files above one chunk go through the parallel multipart uploader."""
+    chunked = []
+    monkeypatch.setattr(
+        gcs_load.transfer_manager,
+        "upload_chunks_concurrently",
+        lambda filename, blob, **kwargs: chunked.append((blob.name, kwargs)),
+    )
+    small, large = tmp_path / "small", tmp_path / "large"
+    small.write_bytes(b"x" * 10)
+    large.write_bytes(b"x" * 100)
+    bucket = _Bucket()
+
+    assert upload_file(bucket, small, "p/small", chunk_bytes=50, workers=4) == (
+        "gs://bucket/p/small"
+    )
+    upload_file(bucket, large, "p/large", chunk_bytes=50, workers=4)
+
+    assert bucket.blobs[0].uploaded == str(small)
+    assert [name for name, _ in chunked] == ["p/large"]
+    assert chunked[0][1]["chunk_size"] == 50
+    assert chunked[0][1]["max_workers"] == 4
+
+
+def test_wait_for_jobs_polls_all_jobs_each_round():
+    """Jobs are polled together and reported in completion order."""
+    jobs = {"slow": _Job(3), "fast": _Job(1)}
+    finished = []
+
+    wait_for_jobs(jobs, poll_seconds=0, on_done=lambda day, _job: finished.append(day))
+
+    assert finished == ["fast", "slow"]
+    assert jobs["fast"].polls == 1
+    assert jobs["slow"].polls == 3
+
+
+def test_wait_for_jobs_raises_after_all_jobs_finish():
+    """A failed job is reported only once the other jobs are also done."""
+    jobs = {
+        "bad": _Job(1, error={"message": "schema mismatch"}),
+        "good": _Job(2),
+    }
+    finished = []
+
+    with pytest.raises(RuntimeError, match="bad: schema mismatch"):
+        wait_for_jobs(
+            jobs, poll_seconds=0, on_done=lambda day, _job: finished.append(day)
+        )
+
+    assert finished == ["good"]
+
+
+def test_split_upload_workers_never_exceeds_the_budget():
+    """Files and per-file part threads share one UPLOAD_WORKERS budget."""
+    assert split_upload_workers(8, 2) == (2, 4)
+    assert split_upload_workers(8, 20) == (8, 1)
+    assert split_upload_workers(8, 3) == (3, 2)
+    assert split_upload_workers(0, 5) == (1, 1)
+    for workers in range(1, 17):
+        for files in range(1, 20):
+            file_workers, part_workers = split_upload_workers(workers, files)
+            assert file_workers * part_workers <= workers
@@ -0,0 +1,23 @@
+"""Tests for step 0's parallel-safe HDB generation (needs a licensed PyKX)."""
+
+import importlib
+
+import pykx as kx
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    not kx.licensed, reason="step 0 runs q code, which needs a licensed PyKX"
+)
+
+
+def test_generated_block_does_not_extend_the_seeded_sym_file(tmp_path, monkeypatch):
+    """Every symbol a block enumerates, including the null one, is pre-seeded."""
+    generate = importlib.import_module("00_generate_synthetic_hdb")
+    monkeypatch.setattr(generate.config, "HDB_DIR", tmp_path)
+    sym = kx.SymbolAtom(f":{tmp_path / 'sym'}")
+
+    generate.seed_sym_file()
+    seeded = kx.q("get", sym).py()
+    generate.generate_partition("2024.01.02", 500, 200)
+
+    assert kx.q("get", sym).py() == seeded
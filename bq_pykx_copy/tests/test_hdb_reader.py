@@ -0,0 +1,176 @@
+"""Tests for the memory-mapped splayed-partition reader (no kdb+ runtime required).
+
+Column files are written here in the uncompressed splayed layout the reader
+expects: a 16-byte header (magic, q type, attribute, int64 count) followed by the
+raw vector.
+"""
+
+import datetime
+
+import numpy as np
+import pyarrow as pa
+import pykx as kx
+import pytest
+
+from hdb_reader import (
+    Q_LONG,
+    Q_SYMBOL,
+    Q_TIMESTAMP,
+    SplayedPartition,
+    UnsupportedColumnFile,
+    map_column,
+    read_sym_file,
+)
+from schema import Column
+
+_Q_ENUM = 20
+_Q_NULL = np.iinfo(np.int64).min
+
+
+def _header(q_type: int, count: int, attribute: int = 0) -> bytes:
+    return (
+        b"\xfe\x20"
+        + bytes([q_type, attribute])
+        + bytes(4)
+        + count.to_bytes(8, "little")
+    )
+
+
+def _write_vector(path, q_type: int, values: np.ndarray, attribute: int = 0) -> None:
+    path.write_bytes(_header(q_type, len(values), attribute) + values.tobytes())
+
+
+def _write_sym(path, symbols: list[str]) -> None:
+    body = b"".join(s.encode() + b"\x00" for s in symbols)
+    path.write_bytes(_header(Q_SYMBOL, len(symbols)) + body)
+
+
+def _write_partition(hdb, day: str = "2024.01.02"):
+    part = hdb / day / "t"
+    part.mkdir(parents=True)
+    _write_sym(hdb / "sym", ["", "AAA", "BBB"])
+    _write_vector(part / "sym", _Q_ENUM, np.array([1, 2, 0, 1], dtype=np.int64))
+    _write_vector(part / "qty", Q_LONG, np.array([5, _Q_NULL, 7, 8], dtype=np.int64))
+    _write_vector(
+        part / "ts", Q_TIMESTAMP, np.array([0, 1, _Q_NULL, 123], dtype=np.int64)
+    )
+    return [
+        Column("date", "d", "DATE", 0.0),
+        Column("sym", "s", "STRING", 0.0),
+        Column("qty", "j", "INT64", 0.0),
+        Column("ts", "p", "INT64", 0.0, is_event_ts_nanos=True),
+    ]
+
+
+def test_read_sym_file_returns_enumeration_domain(tmp_path):
+    """The sym file decodes to the enumeration domain in index order."""
+    _write_sym(tmp_path / "sym", ["", "AAA", "é"])
+
+    result = read_sym_file(tmp_path / "sym")
+
+    assert result.type == pa.string()
+    assert result.to_pylist() == ["", "AAA", "é"]
+
+
+def test_map_column_rejects_compressed_files(tmp_path):
+    """Compressed column files are reported so the caller can fall back to q."""
+    path = tmp_path / "col"
+    path.write_bytes(b"kxzipped" + bytes(64))
+
+    with pytest.raises(UnsupportedColumnFile, match="compressed"):
+        map_column(path)
+
+
+def test_map_column_infers_32_bit_enumerations(tmp_path):
+    """Enumeration width follows the file size for older 32-bit layouts."""
+    path = tmp_path / "sym"
+    _write_vector(path, _Q_ENUM, np.array([2, 0, 1], dtype=np.int32))
+
+    column = map_column(path)
+
+    assert column.values.dtype == np.int32
+    assert column.values.tolist() == [2, 0, 1]
+
+
+def test_map_column_refuses_enumerations_of_ambiguous_width(tmp_path):
+    """Sizes that match neither width, and p#/g# index data, are not guessed."""
+    path = tmp_path / "sym"
+    path.write_bytes(_header(_Q_ENUM, 3) + bytes(20))
+    with pytest.raises(UnsupportedColumnFile, match="not 3 4- or 8-byte"):
+        map_column(path)
+
+    # A 32-bit p# vector plus its index data can be exactly 8 bytes per row.
+    values = np.array([0, 0, 1, 1], dtype=np.int32)
+    path.write_bytes(_header(_Q_ENUM, 4, attribute=3) + values.tobytes() * 2)
+    with pytest.raises(UnsupportedColumnFile, match="attribute"):
+        map_column(path)
+
+
+def test_splayed_partition_chunk_matches_schema(tmp_path):
+    """A chunk resolves symbols, nulls, the virtual date, and epoch-shifted ns."""
+    schema = _write_partition(tmp_path)
+
+    partition = SplayedPartition(tmp_path, "t", "2024.01.02", schema)
+    result = partition.chunk(1, 3)
+
+    assert partition.count == 4
+    assert result.column_names == ["date", "sym", "qty", "ts"]
+    assert result.column("date").to_pylist() == [datetime.date(2024, 1, 2)] * 3
+    assert result.column("sym").to_pylist() == ["BBB", None, "AAA"]
+    assert result.column("qty").to_pylist() == [None, 7, 8]
+    assert result.column("ts").to_pylist() == [
+        946_684_800_000_000_001,
+        None,
+        946_684_800_000_000_123,
+    ]
+
+
+def test_splayed_partition_rejects_out_of_range_enumeration(tmp_path):
+    """Enum indices beyond the sym file are an error, not silent garbage."""
+    schema = _write_partition(tmp_path)
+    _write_vector(
+        tmp_path / "2024.01.02" / "t" / "sym",
+        _Q_ENUM,
+        np.array([1, 9, 0, 1], dtype=np.int64),
+    )
+
+    # Refused up front, so the caller falls back to q for the whole partition.
+    with pytest.raises(UnsupportedColumnFile, match="outside"):
+        SplayedPartition(tmp_path, "t", "2024.01.02", schema)
+
+
+def test_splayed_partition_dictionary_symbols_reuse_enumeration(tmp_path):
+    """Dictionary chunks keep only the used symbols and null the empty symbol."""
+    schema = _write_partition(tmp_path)
+
+    partition = SplayedPartition(
+        tmp_path, "t", "2024.01.02", schema, dictionary_symbols=True
+    )
+    sym = partition.chunk(0, 2).column("sym").combine_chunks()
+
+    assert pa.types.is_dictionary(sym.type)
+    assert sym.to_pylist() == ["AAA", "BBB", None]
+    assert sorted(sym.dictionary.to_pylist()) == ["", "AAA", "BBB"]
+    assert sym.null_count == 1
+
+
+@pytest.mark.skipif(not kx.licensed, reason="writing a real splay needs licensed q")
+@pytest.mark.parametrize("attribute", ["", "`s#", "`p#", "`g#"])
+def test_splayed_partition_reads_or_refuses_files_written_by_q(tmp_path, attribute):
+    """Files q itself writes are read exactly, or refused for the q fallback."""
+    hdb = tmp_path.as_posix()
+    kx.q(
+        f"`:{hdb}/2024.01.02/t/ set .Q.en[`:{hdb}] update sym:{attribute}sym "
+        "from ([] sym:`AAA`AAA`BBB`BBB`CCC; qty:5 0N 7 8 9)"
+    )
+    schema = [Column("sym", "s", "STRING", 0.0), Column("qty", "j", "INT64", 0.0)]
+
+    try:
+        partition = SplayedPartition(tmp_path, "t", "2024.01.02", schema)
+    except UnsupportedColumnFile:
+        assert attribute in ("`p#", "`g#")
+        return
+    result = partition.chunk(0, 4)
+
+    assert result.column("sym").to_pylist() == ["AAA", "AAA", "BBB", "BBB", "CCC"]
+    assert result.column("qty").to_pylist() == [5, None, 7, 8, 9]
@@ -9,15 +9,22 @@ from types import SimpleNamespace
 
 import numpy as np
 import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
+from bench_conversion import measure
 
 import kdb_utils
+from chunk_pipeline import run_chunk_pipeline
 from kdb_utils import (
     arrow_align,
     arrow_schema,
     chunk_ranges,
+    chunk_to_arrow,
+    pack_struct_layout,
     peak_rss_mb,
+    q_long_raw_to_arrow,
     q_timestamp_raw_to_arrow,
+    worker_slots,
 )
 from schema import Column
 
@@ -32,6 +39,62 @@ def test_arrow_align_symbol_empty_becomes_null():
     assert result.column("sym").to_pylist() == ["AAA", None, "BBB"]
 
 
+def test_arrow_align_dictionary_symbols_map_empty_to_null_index():
+    """Dictionary symbols keep the symbol-null rule as a null index."""
+    schema = [
+        Column("sym", "s", "STRING", 0.0),
+        Column("note", "c", "STRING", 0.0),
+    ]
+    table = pa.table(
+        {
+            "sym": pa.array(["AAA", "", "AAA", "BBB"]),
+            "note": pa.array(["x", "", "y", "z"]),
+        }
+    )
+
+    result = arrow_align(table, schema, dictionary_symbols=True)
+
+    sym = result.column("sym").combine_chunks()
+    assert sym.type == kdb_utils.SYMBOL_DICTIONARY_TYPE
+    assert sym.to_pylist() == ["AAA", None, "AAA", "BBB"]
+    assert "" not in sym.dictionary.to_pylist()
+    # Only kdb+ symbol columns are dictionary-encoded.
+    assert result.schema.field("note").type == pa.string()
+
+
+def test_arrow_align_nulls_empty_symbol_in_dictionary_input():
+    """Dictionary input is normalised through its dictionary, not per row."""
+    schema = [Column("sym", "s", "STRING", 0.0)]
+    dictionary = pa.DictionaryArray.from_arrays(
+        pa.array([1, 0, 2], type=pa.int32()), pa.array(["", "AAA", "BBB"])
+    )
+    table = pa.table({"sym": dictionary})
+
+    as_dictionary = arrow_align(table, schema, dictionary_symbols=True)
+    as_strings = arrow_align(table, schema)
+
+    assert as_dictionary.column("sym").to_pylist() == ["AAA", None, "BBB"]
+    assert as_strings.schema.field("sym").type == pa.string()
+    assert as_strings.column("sym").to_pylist() == ["AAA", None, "BBB"]
+
+
+def test_dictionary_symbols_write_parquet_dictionary_pages(tmp_path):
+    """Dictionary symbol columns land in Parquet as dictionary-encoded pages."""
+    schema = [Column("sym", "s", "STRING", 0.0)]
+    table = arrow_align(
+        pa.table({"sym": pa.array(["AAA", "BBB"] * 500)}),
+        schema,
+        dictionary_symbols=True,
+    ).cast(arrow_schema(schema, dictionary_symbols=True))
+    path = tmp_path / "sym.parquet"
+    pq.write_table(table, path)
+
+    column = pq.ParquetFile(path).metadata.row_group(0).column(0)
+
+    assert column.dictionary_page_offset is not None
+    assert pq.read_table(path).column("sym").to_pylist() == ["AAA", "BBB"] * 500
+
+
 def test_arrow_align_event_timestamp_becomes_int64_nanos():
     """Event timestamps are stored as INT64 nanoseconds-since-epoch, losslessly."""
     schema = [Column("ts", "p", "INT64", 0.0, is_event_ts_nanos=True)]
@@ -89,6 +152,36 @@ def test_arrow_schema_marks_event_ts_as_int64():
     assert all(result.field(f).nullable for f in result.names)
 
 
+def test_pack_struct_layout_nulls_inactive_groups():
+    """A group's STRUCT is null on rows where none of its fields are set."""
+    schema = [
+        Column("sym", "s", "STRING", 0.0),
+        Column("mt01__qty", "j", "INT64", 0.9),
+        Column("mt01__user", "s", "STRING", 0.9),
+        Column("mt02__qty", "j", "INT64", 0.9),
+    ]
+    table = pa.table(
+        {
+            "sym": ["AAA", "BBB", "CCC"],
+            "mt01__qty": pa.array([1, None, None]),
+            "mt01__user": pa.array([None, None, "u"]),
+            "mt02__qty": pa.array([None, 7, None]),
+        }
+    )
+
+    result = pack_struct_layout(table, schema).cast(
+        arrow_schema(schema, layout="struct")
+    )
+
+    assert result.column_names == ["sym", "mt01", "mt02"]
+    assert result.column("mt01").to_pylist() == [
+        {"qty": 1, "user": None},
+        None,
+        {"qty": None, "user": "u"},
+    ]
+    assert result.column("mt02").to_pylist() == [None, {"qty": 7}, None]
+
+
 def test_chunk_ranges_exact_multiple():
     """When rows divide evenly, windows are full and non-overlapping."""
     assert chunk_ranges(10, 5) == [(0, 4), (5, 9)]
@@ -124,6 +217,27 @@ def test_chunk_ranges_rejects_non_positive_chunk():
         chunk_ranges(100, 0)
 
 
+def test_worker_slots_unbudgeted_uses_full_pool():
+    """Without an RSS budget every configured worker may run at once."""
+    assert worker_slots(8, 0, None) == 8
+    assert worker_slots(8, 0, 4096.0) == 8
+
+
+def test_worker_slots_probes_then_fits_budget():
+    """A budgeted pool probes with one worker, then fits peaks into the budget."""
+    assert worker_slots(8, 10_000, None) == 1
+    assert worker_slots(8, 10_000, 3_000.0) == 3
+    assert worker_slots(2, 10_000, 1_000.0) == 2
+    # A single worker always runs, even when its peak exceeds the budget.
+    assert worker_slots(8, 1_000, 5_000.0) == 1
+
+
+def test_worker_slots_rejects_non_positive_pool():
+    """A zero-sized pool is a configuration error."""
+    with pytest.raises(ValueError):
+        worker_slots(0, 0, None)
+
+
 def test_q_timestamp_raw_to_arrow_preserves_nanos_and_nulls():
     """Raw q timestamps receive the Unix epoch offset without losing nulls."""
     raw = np.array([0, 123_456_789, np.iinfo(np.int64).min], dtype=np.int64)
@@ -161,6 +275,129 @@ def test_q_timestamp_raw_to_arrow_truncates_to_microseconds():
     ]
 
 
+def test_q_timestamp_raw_to_arrow_truncates_pre_2000_toward_zero():
+    """Negative q offsets truncate toward the q epoch, nulls stay null."""
+    raw = np.array([-1, -1_000, -1_001, np.iinfo(np.int64).min, 0])
+
+    result = q_timestamp_raw_to_arrow(raw, preserve_nanoseconds=False)
+
+    epoch_us = kdb_utils._Q_TO_UNIX_EPOCH_NS // 1000
+    assert result.type == pa.timestamp("us")
+    assert result.cast(pa.int64()).to_pylist() == [
+        epoch_us,
+        epoch_us - 1,
+        epoch_us - 1,
+        None,
+        epoch_us,
+    ]
+
+
+def test_q_long_raw_to_arrow_shares_the_q_buffer():
+    """Longs are wrapped without copying; 0Nj becomes a validity-bitmap null."""
+    raw = np.array([5, np.iinfo(np.int64).min, 7], dtype=np.int64)
+
+    result = q_long_raw_to_arrow(raw)
+
+    assert result.to_pylist() == [5, None, 7]
+    assert result.buffers()[1].address == raw.ctypes.data
+
+
+def _q_ranges(q_vectors) -> list[tuple[int, int]]:
+    """Address ranges of the q-owned data behind PyKX vectors."""
+    ranges = []
+    for vector in q_vectors:
+        raw = vector.np(raw=True)
+        ranges.append((raw.ctypes.data, raw.ctypes.data + raw.nbytes))
+    return ranges
+
+
+def _shares_q_memory(table: pa.Table, ranges) -> bool:
+    for column in table.columns:
+        for chunk in column.chunks:
+            for buffer in chunk.buffers():
+                if buffer is None or not buffer.size:
+                    continue
+                end = buffer.address + buffer.size
+                if any(buffer.address < hi and lo < end for lo, hi in ranges):
+                    return True
+    return False
+
+
+def test_chunk_to_arrow_copies_q_longs():
+    """Longs from q are copied: the table may be released off the q thread."""
+    kx = pytest.importorskip("pykx")
+    q_longs = kx.toq(np.array([5, np.iinfo(np.int64).min, 7], dtype=np.int64))
+    schema = [Column("qty", "j", "INT64", 0.0)]
+
+    table = chunk_to_arrow({"qty": q_longs}, schema)
+
+    assert table.column("qty").to_pylist() == [5, None, 7]
+    assert not _shares_q_memory(table, _q_ranges([q_longs]))
+
+
+def test_q_path_hands_the_writer_no_q_memory():
+    """Tables crossing to the writer thread own every buffer (q path)."""
+    kx = pytest.importorskip("pykx")
+    schema = [
+        Column("qty", "j", "INT64", 0.0),
+        Column("sym", "s", "STRING", 0.0),
+        Column("date", "d", "DATE", 0.0),
+        Column("ts", "p", "TIMESTAMP", 0.0),
+    ]
+    chunks = [
+        {
+            "qty": kx.toq(np.arange(start, start + 3, dtype=np.int64)),
+            "sym": kx.SymbolVector(["a", "", "b"]),
+            "date": kx.toq(np.array(["2024-01-02"] * 3, dtype="datetime64[D]")),
+            "ts": kx.toq(np.array(["2024-01-02T00:00:01"] * 3, dtype="datetime64[ns]")),
+        }
+        for start in (0, 3)
+    ]
+    written = []
+
+    run_chunk_pipeline(
+        range(len(chunks)),
+        chunks.__getitem__,
+        lambda qchunk: chunk_to_arrow(qchunk, schema),
+        written.append,
+        depth=2,
+        convert_on_reader=True,
+    )
+
+    assert [t.column("qty").to_pylist() for t in written] == [[0, 1, 2], [3, 4, 5]]
+    ranges = _q_ranges(vector for chunk in chunks for vector in chunk.values())
+    assert not any(_shares_q_memory(table, ranges) for table in written)
+
+
+def test_arrow_align_skips_casts_for_final_typed_columns():
+    """Columns that already have their target type pass through untouched."""
+    raw = np.array([1, 2, 3], dtype=np.int64)
+    schema = [
+        Column("qty", "j", "INT64", 0.0),
+        Column("ts", "p", "TIMESTAMP", 0.0),
+    ]
+    table = pa.table(
+        {
+            "qty": q_long_raw_to_arrow(raw),
+            "ts": q_timestamp_raw_to_arrow(raw, preserve_nanoseconds=False),
+        }
+    )
+
+    result = arrow_align(table, schema)
+
+    for name in ("qty", "ts"):
+        source = table.column(name).chunk(0).buffers()[1]
+        assert result.column(name).chunk(0).buffers()[1].address == source.address
+
+
+def test_conversion_benchmark_reports_every_column_type():
+    """The micro-benchmark runs and reports a rate for each column type."""
+    rates = measure(1_000, repeats=1)
+
+    assert set(rates) == {"long", "timestamp_us", "timestamp_ns", "symbol"}
+    assert all(rate > 0 for rate in rates.values())
+
+
 @pytest.mark.parametrize(
     ("platform", "rss", "expected"),
     [("darwin", 10 * 1024**2, 10.0), ("linux", 10 * 1024, 10.0)],
@@ -0,0 +1,115 @@
+"""Tests for the incremental conversion manifest (no kdb+ required)."""
+
+import os
+
+import pytest
+
+import manifest as manifest_module
+from manifest import Manifest, schema_fingerprint, source_fingerprint
+from schema import Column
+
+
+def _partition(tmp_path):
+    part = tmp_path / "2024.01.02" / "t"
+    part.mkdir(parents=True)
+    (part / ".d").write_bytes(b"cols")
+    (part / "qty").write_bytes(b"\x00" * 64)
+    return part
+
+
+def test_source_fingerprint_tracks_column_files(tmp_path):
+    """stat sees size/mtime changes; content also sees same-size rewrites."""
+    part = _partition(tmp_path)
+    stat, content = source_fingerprint(part), source_fingerprint(part, "content")
+
+    stamp = (part / "qty").stat().st_mtime_ns
+    (part / "qty").write_bytes(b"\x01" * 64)
+    os.utime(part / "qty", ns=(stamp, stamp))
+
+    assert source_fingerprint(part) == stat
+    assert source_fingerprint(part, "content") != content
+    (part / "px").write_bytes(b"\x00" * 8)
+    assert source_fingerprint(part) != stat
+    with pytest.raises(ValueError):
+        source_fingerprint(part, "mtime")
+
+
+def test_schema_fingerprint_covers_settings():
+    """Changing a column or an output setting changes the fingerprint."""
+    schema = [Column("qty", "j", "INT64", 0.0)]
+
+    base = schema_fingerprint(schema, compression="snappy")
+
+    assert base == schema_fingerprint(schema, compression="snappy")
+    assert base != schema_fingerprint(schema, compression="zstd")
+    assert base != schema_fingerprint(
+        [Column("qty", "j", "INT64", 0.5)], compression="snappy"
+    )
+
+
+def test_is_current_requires_untouched_output(tmp_path):
+    """A recorded partition is current until its source, schema, or file changes."""
+    output = tmp_path / "t__2024.01.02.parquet"
+    output.write_bytes(b"PAR1")
+    manifest = Manifest(tmp_path / "manifest.json")
+    manifest.record_conversion("2024.01.02", "src", "sch", output, rows=10)
+
+    assert manifest.is_current("2024.01.02", "src", "sch", output)
+    assert not manifest.is_current("2024.01.02", "src2", "sch", output)
+    assert not manifest.is_current("2024.01.02", "src", "sch2", output)
+    assert not manifest.is_current("2024.01.03", "src", "sch", output)
+    output.write_bytes(b"PAR1 truncated")
+    assert not manifest.is_current("2024.01.02", "src", "sch", output)
+
+
+def test_is_current_hashes_only_when_the_output_stat_changes(tmp_path, monkeypatch):
+    """Unchanged size and mtime skip the hash; a touched file is re-hashed once."""
+    output = tmp_path / "t__2024.01.02.parquet"
+    output.write_bytes(b"PAR1")
+    manifest = Manifest(tmp_path / "manifest.json")
+    manifest.record_conversion("2024.01.02", "src", "sch", output, rows=10)
+    hashed = []
+    checksum = manifest_module.file_checksum
+    monkeypatch.setattr(
+        manifest_module,
+        "file_checksum",
+        lambda path: hashed.append(path) or checksum(path),
+    )
+
+    assert manifest.is_current("2024.01.02", "src", "sch", output)
+    assert hashed == []
+
+    mtime = output.stat().st_mtime_ns + 10**9
+    os.utime(output, ns=(mtime, mtime))
+    assert manifest.is_current("2024.01.02", "src", "sch", output)
+    assert manifest.is_current("2024.01.02", "src", "sch", output)
+    assert hashed == [output]
+
+    assert manifest.is_current("2024.01.02", "src", "sch", output, verify=True)
+    assert hashed == [output, output]
+
+
+def test_pending_loads_follow_conversions_and_persist(tmp_path):
+    """Loads are pending until recorded, again after reconversion or a reset."""
+    path = tmp_path / "manifest.json"
+    output = tmp_path / "out.parquet"
+    output.write_bytes(b"v1")
+    manifest = Manifest(path)
+    manifest.record_conversion("d1", "s", "x", output, rows=1)
+    manifest.record_conversion("d2", "s", "x", output, rows=1)
+    manifest.record_load("d1")
+    manifest.save()
+
+    reloaded = Manifest(path)
+    assert reloaded.pending_loads(["d1", "d2", "d3"]) == ["d2", "d3"]
+
+    output.write_bytes(b"v2")
+    reloaded.record_conversion("d1", "s2", "x", output, rows=1)
+    assert reloaded.pending_loads(["d1"]) == ["d1"]
+    reloaded.record_load("d1")
+    reloaded.record_load("d2")
+    assert reloaded.pending_loads(["d1", "d2"]) == []
+    reloaded.forget_loads()
+    assert reloaded.pending_loads(["d1", "d2"]) == ["d1", "d2"]
+    reloaded.forget("d1")
+    assert "d1" not in reloaded.partitions
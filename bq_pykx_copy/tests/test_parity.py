@@ -0,0 +1,109 @@
+"""Tests for the full-column parity statistics (no kdb+ or BigQuery required)."""
+
+import datetime
+import hashlib
+
+import pyarrow as pa
+
+from kdb_utils import pack_struct_layout
+from parity import (
+    ColumnStats,
+    column_stats,
+    compare_stats,
+    source_stats,
+    string_hash,
+    target_query,
+    target_stats,
+)
+from schema import Column, build_schema
+from synthetic import synthetic_table
+
+_BIG = 2**62
+
+
+def test_column_stats_integer_checksum_is_exact():
+    """Sums beyond int64 stay exact, and nulls are counted, not summed."""
+    col = Column("qty", "j", "INT64", 0.0)
+
+    stats = column_stats(pa.array([_BIG, _BIG, None, -5]), col)
+
+    assert stats == ColumnStats(nulls=1, min=-5, max=_BIG, checksum=2 * _BIG - 5)
+
+
+def test_column_stats_uses_bigquery_domains():
+    """TIMESTAMP compares as epoch micros and DATE as epoch days."""
+    ts = column_stats(
+        pa.array([1_000, None], type=pa.timestamp("us")),
+        Column("ts", "p", "TIMESTAMP", 0.0),
+    )
+    day = column_stats(
+        pa.array([datetime.date(1970, 1, 11)]), Column("date", "d", "DATE", 0.0)
+    )
+
+    assert (ts.min, ts.checksum, ts.nulls) == (1_000, 1_000, 1)
+    assert (day.min, day.max, day.checksum) == (10, 10, 10)
+
+
+def test_string_hash_matches_bigquery_expression():
+    """The local hash is the first 7 MD5 bytes, as TO_HEX(SUBSTR(MD5(x), 1, 7))."""
+    digest = hashlib.md5(b"AAA").hexdigest()
+
+    assert string_hash("AAA") == int(digest[:14], 16)
+
+
+def test_source_stats_ignore_row_order_and_layout():
+    """Shuffled chunks and the STRUCT layout give the same statistics."""
+    schema = build_schema()
+    table = synthetic_table(schema, 3_000, seed=7)
+    struct_table = pack_struct_layout(table, schema)
+
+    forward = source_stats([table.slice(0, 1_000), table.slice(1_000)], schema)
+    backward = source_stats(
+        [struct_table.slice(2_000), struct_table.slice(0, 2_000)], schema
+    )
+
+    assert forward.rows == 3_000
+    assert compare_stats(forward, backward) == []
+
+
+def test_compare_stats_reports_each_difference():
+    """A changed value surfaces as a per-figure mismatch on that column."""
+    schema = [Column("sym", "s", "STRING", 0.0), Column("qty", "j", "INT64", 0.0)]
+    table = pa.table({"sym": ["AAA", None, "BBB"], "qty": [1, 2, 3]})
+    source = source_stats([table], schema)
+    altered = source_stats([table.set_column(1, "qty", pa.array([1, 2, 4]))], schema)
+
+    assert compare_stats(source, altered) == [
+        "qty.max: source=3 target=4",
+        "qty.checksum: source=6 target=7",
+    ]
+
+
+def test_target_query_and_row_round_trip():
+    """One aggregate query covers every column; its row parses back to stats."""
+    schema = [
+        Column("date", "d", "DATE", 0.0),
+        Column("mt01__ref", "s", "STRING", 0.9),
+    ]
+    sql = target_query("p.d.t", schema, "struct", "2024-01-02")
+    row = {
+        "row_count": 2,
+        "c0_nulls": 0,
+        "c0_min": 19724,
+        "c0_max": 19724,
+        "c0_sum": 39448,
+        "c1_nulls": 2,
+        "c1_min": None,
+        "c1_max": None,
+        "c1_sum": None,
+    }
+
+    assert sql.count("FROM `p.d.t`") == 1
+    assert "MIN(UNIX_DATE(date)) AS c0_min" in sql
+    assert "COUNTIF(mt01.ref IS NULL) AS c1_nulls" in sql
+    assert "MD5(mt01.ref)" in sql
+    assert "WHERE date = DATE '2024-01-02'" in sql
+    stats = target_stats(row, schema)
+    assert stats.rows == 2
+    assert stats.columns["mt01__ref"] == ColumnStats(nulls=2)
+    assert stats.columns["date"].checksum == 39448
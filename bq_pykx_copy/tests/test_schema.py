@@ -1,6 +1,14 @@
 """Tests for the anonymised schema definition."""
 
-from schema import bq_clustering_columns, build_schema, partition_column
+from schema import (
+    bq_clustering_columns,
+    bq_column_expr,
+    bq_ddl,
+    build_schema,
+    message_groups,
+    partition_column,
+    top_level_columns,
+)
 
 
 def test_build_schema_is_wide_and_sparse():
@@ -35,3 +43,28 @@ def test_event_timestamps_map_to_int64():
 
     assert event_ts  # there is at least one
     assert all(c.bq_type == "INT64" for c in event_ts)
+
+
+def test_struct_layout_packs_each_message_group():
+    """The struct layout has one STRUCT per message group plus the other columns."""
+    schema = build_schema()
+    groups = message_groups(schema)
+    names = top_level_columns(schema, "struct")
+
+    assert len(groups) == 12
+    assert all(len(cols) == 35 for cols in groups.values())
+    assert len(names) == len(schema) - 12 * 35 + 12
+    assert names[:4] == ["date", "sym", "message_type", "mt01"]
+
+
+def test_bq_column_expr_and_ddl_follow_layout():
+    """Message fields are addressed through their STRUCT only in that layout."""
+    schema = build_schema()
+    col = next(c for c in schema if c.name == "mt03__user_id")
+
+    assert bq_column_expr(col) == "mt03__user_id"
+    assert bq_column_expr(col, "struct") == "mt03.user_id"
+    ddl = bq_ddl("p.d.t", schema, "struct")
+    assert "mt03 STRUCT<country INT64," in ddl
+    assert "mt03__" not in ddl
+    assert ddl.endswith("PARTITION BY date\nCLUSTER BY sym, message_type")
@@ -0,0 +1,239 @@
+"""Tests for the Storage Write API loader against a local gRPC stand-in.
+
+``_FakeBigQueryWrite`` serves the four BigQueryWrite RPCs the loader uses on a
+localhost port, decoding the Arrow payloads the way the service would, so the
+real ``BigQueryWriteClient`` and ``AppendRowsStream`` run end to end.
+"""
+
+import datetime
+import itertools
+from concurrent import futures
+
+import grpc
+import pyarrow as pa
+import pytest
+from google.cloud.bigquery_storage_v1 import BigQueryWriteClient, types
+from google.cloud.bigquery_storage_v1.services.big_query_write.transports import (
+    BigQueryWriteGrpcTransport,
+)
+from google.protobuf import timestamp_pb2, wrappers_pb2
+from google.rpc import code_pb2, status_pb2
+
+from storage_write import (
+    PendingStreamWriter,
+    commit_streams,
+    split_batches,
+    staging_table_id,
+    wire_schema,
+    write_parent,
+)
+
+_SERVICE = "google.cloud.bigquery.storage.v1.BigQueryWrite"
+_PARENT = write_parent("p", "d", "t")
+
+
+class _FakeBigQueryWrite:
+    """In-memory BigQueryWrite service: pending streams become visible on commit."""
+
+    def __init__(self):
+        self._ids = itertools.count()
+        self.streams = {}
+        self.table = []
+
+    def create_write_stream(self, request, context):
+        name = f"{request.parent}/streams/s{next(self._ids)}"
+        self.streams[name] = {"schema": None, "batches": [], "finalized": False}
+        return types.WriteStream(name=name, type_=request.write_stream.type_)
+
+    def append_rows(self, requests, context):
+        name = None
+        for request in requests:
+            name = request.write_stream or name
+            stream = self.streams[name]
+            arrow = request.arrow_rows
+            if arrow.writer_schema.serialized_schema:
+                stream["schema"] = pa.ipc.read_schema(
+                    pa.py_buffer(arrow.writer_schema.serialized_schema)
+                )
+            rows = sum(b.num_rows for b in stream["batches"])
+            if request.offset != rows:
+                yield types.AppendRowsResponse(
+                    error=status_pb2.Status(
+                        code=code_pb2.OUT_OF_RANGE, message="offset mismatch"
+                    ),
+                    write_stream=name,
+                )
+                continue
+            stream["batches"].append(
+                pa.ipc.read_record_batch(
+                    pa.py_buffer(arrow.rows.serialized_record_batch),
+                    stream["schema"],
+                )
+            )
+            yield types.AppendRowsResponse(
+                append_result=types.AppendRowsResponse.AppendResult(
+                    offset=wrappers_pb2.Int64Value(value=request.offset)
+                ),
+                write_stream=name,
+            )
+
+    def finalize_write_stream(self, request, context):
+        stream = self.streams[request.name]
+        stream["finalized"] = True
+        return types.FinalizeWriteStreamResponse(
+            row_count=sum(b.num_rows for b in stream["batches"])
+        )
+
+    def batch_commit_write_streams(self, request, context):
+        errors = [
+            types.StorageError(entity=name, error_message="stream not finalized")
+            for name in request.write_streams
+            if not self.streams[name]["finalized"]
+        ]
+        if errors:
+            return types.BatchCommitWriteStreamsResponse(stream_errors=errors)
+        for name in request.write_streams:
+            self.table.extend(self.streams[name]["batches"])
+        commit_time = timestamp_pb2.Timestamp()
+        commit_time.GetCurrentTime()
+        return types.BatchCommitWriteStreamsResponse(commit_time=commit_time)
+
+    def handler(self):
+        def unary(fn, request_type, response_type):
+            return grpc.unary_unary_rpc_method_handler(
+                fn,
+                request_deserializer=request_type.deserialize,
+                response_serializer=response_type.serialize,
+            )
+
+        return grpc.method_handlers_generic_handler(
+            _SERVICE,
+            {
+                "CreateWriteStream": unary(
+                    self.create_write_stream,
+                    types.CreateWriteStreamRequest,
+                    types.WriteStream,
+                ),
+                "AppendRows": grpc.stream_stream_rpc_method_handler(
+                    self.append_rows,
+                    request_deserializer=types.AppendRowsRequest.deserialize,
+                    response_serializer=types.AppendRowsResponse.serialize,
+                ),
+                "FinalizeWriteStream": unary(
+                    self.finalize_write_stream,
+                    types.FinalizeWriteStreamRequest,
+                    types.FinalizeWriteStreamResponse,
+                ),
+                "BatchCommitWriteStreams": unary(
+                    self.batch_commit_write_streams,
+                    types.BatchCommitWriteStreamsRequest,
+                    types.BatchCommitWriteStreamsResponse,
+                ),
+            },
+        )
+
+
+@pytest.fixture
+def service():
+    """Serve a fresh fake on localhost and yield ``(fake, client)``."""
+    fake = _FakeBigQueryWrite()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    server.add_generic_rpc_handlers((fake.handler(),))
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    channel = grpc.insecure_channel(f"localhost:{port}")
+    client = BigQueryWriteClient(transport=BigQueryWriteGrpcTransport(channel=channel))
+    try:
+        yield fake, client
+    finally:
+        channel.close()
+        server.stop(None)
+
+
+def _chunk(start: int, n: int) -> pa.Table:
+    return pa.table(
+        {
+            "date": pa.array([datetime.date(2024, 1, 2)] * n),
+            "sym": pa.array(["AAA", None] * (n // 2) + ["BBB"] * (n % 2)),
+            "seq_no": pa.array(range(start, start + n), type=pa.int64()),
+            "ts": pa.array([0] * n, type=pa.timestamp("us")),
+        }
+    ).cast(
+        pa.schema(
+            [
+                ("date", pa.date32()),
+                ("sym", pa.dictionary(pa.int32(), pa.string())),
+                ("seq_no", pa.int64()),
+                ("ts", pa.timestamp("us")),
+            ]
+        )
+    )
+
+
+def test_wire_schema_sends_plain_strings_and_utc_timestamps():
+    """Dictionary symbols decode to strings and zone-less timestamps become UTC."""
+    nested = pa.struct([("px", pa.timestamp("us")), ("qty", pa.int64())])
+    schema = pa.schema(
+        [
+            ("sym", pa.dictionary(pa.int32(), pa.string())),
+            ("ts", pa.timestamp("us")),
+            ("mt01", nested),
+        ]
+    )
+
+    result = wire_schema(schema)
+
+    assert result.field("sym").type == pa.string()
+    assert result.field("ts").type == pa.timestamp("us", tz="UTC")
+    assert result.field("mt01").type.field("px").type == pa.timestamp("us", tz="UTC")
+
+
+def test_split_batches_bounds_each_append():
+    """Oversized batches are sliced so no append exceeds the byte budget."""
+    table = pa.table({"v": pa.array(range(1000), type=pa.int64())})
+
+    batches = list(split_batches(table, max_bytes=1000))
+
+    assert all(b.nbytes <= 1000 for b in batches)
+    assert sum(b.num_rows for b in batches) == 1000
+    assert pa.Table.from_batches(batches).equals(table)
+
+
+def test_pending_stream_rows_appear_only_after_commit(service):
+    """Appended chunks stay pending until finalize + commit, then land in order."""
+    fake, client = service
+    schema = _chunk(0, 1).schema
+
+    writer = PendingStreamWriter(client, _PARENT, schema, max_append_bytes=256)
+    writer.append(_chunk(0, 40))
+    writer.append(_chunk(40, 25))
+
+    assert fake.table == []
+    assert writer.finalize() == 65
+    commit_streams(client, _PARENT, [writer.name])
+
+    landed = pa.Table.from_batches(fake.table)
+    assert landed.schema == wire_schema(schema)
+    assert landed.column("seq_no").to_pylist() == list(range(65))
+    assert landed.column("sym").to_pylist()[:3] == ["AAA", None, "AAA"]
+
+
+def test_commit_rejects_unfinalized_streams(service):
+    """A stream that was never finalized is reported and nothing is committed."""
+    fake, client = service
+    writer = PendingStreamWriter(client, _PARENT, _chunk(0, 1).schema)
+    writer.append(_chunk(0, 4))
+
+    with pytest.raises(RuntimeError, match="not finalized"):
+        commit_streams(client, _PARENT, [writer.name])
+    writer.abort()
+
+    assert fake.table == []
+
+
+def test_staging_table_id_is_per_partition():
+    """Each partition streams into its own staging table before the swap."""
+    assert staging_table_id("p.d.t", "2024.01.02") == "p.d.t__stage_20240102"
+    assert write_parent(*staging_table_id("p.d.t", "2024.01.03").split(".")) == (
+        "projects/p/datasets/d/tables/t__stage_20240103"
+    )
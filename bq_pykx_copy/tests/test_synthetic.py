@@ -0,0 +1,26 @@
+"""Tests for the in-process synthetic partition used by the benchmarks."""
+
+from kdb_utils import arrow_schema
+from schema import build_schema
+from synthetic import synthetic_table
+
+
+def test_synthetic_table_matches_target_schema():
+    """The synthetic partition casts cleanly to the Parquet file schema."""
+    schema = build_schema()
+
+    table = synthetic_table(schema, 1_000, seed=1)
+
+    assert table.num_rows == 1_000
+    assert table.cast(arrow_schema(schema)).schema == arrow_schema(schema)
+
+
+def test_synthetic_table_populates_only_the_rows_own_message_group():
+    """Message-group fields are null on rows of any other message type."""
+    table = synthetic_table(build_schema(), 2_000, seed=2)
+
+    types = table.column("message_type").to_pylist()
+    values = table.column("mt05__country").to_pylist()
+
+    assert all(v is None for t, v in zip(types, values, strict=True) if t != "mt05")
+    assert any(v is not None for t, v in zip(types, values, strict=True) if t == "mt05")
@@ -0,0 +1,293 @@
+"""Multi-table batch entry point: many table pipelines in one SparkSession.
+
+pipeline/main.py runs one table per Dataproc Serverless batch, so every table
+pays Spark startup and executor provisioning. This entry point loads the
+cluster YAML once and runs many tables in a single session:
+
+    gcloud dataproc batches submit pyspark gs://<bucket>/pipeline/batch.py \\
+        --region=<region> \\
+        --py-files=gs://<bucket>/wheels/pipeline-0.1.0-py3-none-any.whl \\
+        --jars=gs://<bucket>/jars/postgresql-42.7.3.jar \\
+        --properties=spark.scheduler.mode=FAIR \\
+        -- \\
+        --source_name=demo_cluster \\
+        --gcs_bucket=my-config-bucket \\
+        --project=my-gcp-project \\
+        --tables=thelook.users,thelook.orders \\
+        --parallelism=8
+
+Table selection:
+    --tables lists <db_name>.<tbl_name> entries (tbl_name may itself be dotted,
+    e.g. thelook.public.users). Without --tables every table in the cluster
+    YAML is run; --db_name restricts that to one database.
+
+Concurrency:
+    Up to --parallelism tables run at once, each on its own driver thread.
+    Every table submits its Spark jobs to its own FAIR scheduler pool (named
+    <db_name>.<tbl_name>), so a large table cannot starve the others of
+    executors. The FAIR mode is set when this module creates the session; a
+    pre-existing session in FIFO mode still runs tables concurrently, but
+    jobs are scheduled first-come first-served.
+
+Failure isolation:
+    A failing table (bad config, extraction or write error) is recorded and
+    the remaining tables continue. A summary report is logged at the end and
+    the process exits non-zero if any table failed.
+"""
+
+import argparse
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import BaseModel
+from pyspark.sql import SparkSession
+
+from pipeline.config import (
+    ClusterConfig,
+    _build_pipeline_config,
+    load_cluster_config,
+)
+from pipeline.main import run_config
+
+logger = logging.getLogger(__name__)
+
+#: Default number of tables run concurrently.
+_DEFAULT_PARALLELISM = 4
+
+
+class TableResult(BaseModel):
+    """Outcome of one table pipeline within a batch run."""
+
+    db_name: str
+    tbl_name: str
+    status: str  # "succeeded" | "failed"
+    seconds: float
+    error: str | None = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.db_name}.{self.tbl_name}"
+
+
+def parse_tables(spec: str) -> list[tuple[str, str]]:
+    """Parse a comma-separated list of <db_name>.<tbl_name> entries.
+
+    The first dot separates the database; the rest is the table name, so
+    schema-qualified names such as thelook.public.users are kept intact.
+
+    Raises:
+        ValueError: If an entry has no database part.
+    """
+    tables = []
+    for entry in (item.strip() for item in spec.split(",")):
+        if not entry:
+            continue
+        db_name, sep, tbl_name = entry.partition(".")
+        if not sep or not db_name or not tbl_name:
+            raise ValueError(f"Invalid table '{entry}'. Expected <db_name>.<tbl_name>.")
+        tables.append((db_name, tbl_name))
+    return tables
+
+
+def cluster_tables(
+    cluster: ClusterConfig, db_name: str | None = None
+) -> list[tuple[str, str]]:
+    """Return every (db_name, tbl_name) in a cluster config, in YAML order.
+
+    Args:
+        cluster: Parsed cluster config.
+        db_name: Optional. Only return tables of this database.
+    """
+    return [
+        (db, tbl)
+        for db, db_cfg in cluster.data_config.items()
+        if db_name is None or db == db_name
+        for tbl in db_cfg.tables
+    ]
+
+
+def _run_table(
+    spark: SparkSession,
+    cluster: ClusterConfig,
+    db_name: str,
+    tbl_name: str,
+    project: str,
+    gcs_bucket: str,
+) -> TableResult:
+    """Run one table in its own FAIR pool, capturing any failure."""
+    label = f"{db_name}.{tbl_name}"
+    sc = spark.sparkContext
+    # Local properties are per thread; each table job runs on its own thread.
+    sc.setLocalProperty("spark.scheduler.pool", label)
+    sc.setJobDescription(f"pipeline {label}")
+    start = time.monotonic()
+    try:
+        config = _build_pipeline_config(cluster, db_name, tbl_name, project, gcs_bucket)
+        run_config(spark, config)
+    except Exception as exc:
+        logger.error("Table %s failed", label, exc_info=True)
+        return TableResult(
+            db_name=db_name,
+            tbl_name=tbl_name,
+            status="failed",
+            seconds=round(time.monotonic() - start, 1),
+            error=f"{type(exc).__name__}: {exc}",
+        )
+    finally:
+        sc.setLocalProperty("spark.scheduler.pool", None)
+        sc.setJobDescription(None)
+    logger.info("Table %s succeeded", label)
+    return TableResult(
+        db_name=db_name,
+        tbl_name=tbl_name,
+        status="succeeded",
+        seconds=round(time.monotonic() - start, 1),
+    )
+
+
+def run_batch(
+    spark: SparkSession,
+    cluster: ClusterConfig,
+    tables: list[tuple[str, str]],
+    project: str,
+    gcs_bucket: str,
+    parallelism: int = _DEFAULT_PARALLELISM,
+) -> list[TableResult]:
+    """Run many table pipelines concurrently in one SparkSession.
+
+    Args:
+        spark: Shared SparkSession (ideally with spark.scheduler.mode=FAIR).
+        cluster: Parsed cluster config holding every table in tables.
+        tables: (db_name, tbl_name) pairs to run.
+        project: GCP project ID.
+        gcs_bucket: GCS bucket for BQ indirect write staging.
+        parallelism: Maximum number of tables running at once.
+
+    Returns:
+        One TableResult per table, in the order of tables.
+
+    Raises:
+        ValueError: If parallelism is less than 1.
+    """
+    if parallelism < 1:
+        raise ValueError(f"parallelism must be >= 1, got {parallelism}")
+
+    mode = spark.sparkContext.getConf().get("spark.scheduler.mode", "FIFO")
+    if mode.upper() != "FAIR":
+        logger.warning(
+            "spark.scheduler.mode is %s, not FAIR -- tables still run"
+            " concurrently but their jobs are scheduled first-come first-served.",
+            mode,
+        )
+
+    logger.info(
+        "Batch run started: %s table(s), parallelism=%s", len(tables), parallelism
+    )
+    with ThreadPoolExecutor(
+        max_workers=parallelism, thread_name_prefix="table"
+    ) as pool:
+        futures = [
+            pool.submit(_run_table, spark, cluster, db, tbl, project, gcs_bucket)
+            for db, tbl in tables
+        ]
+        return [future.result() for future in futures]
+
+
+def format_report(results: list[TableResult]) -> str:
+    """Render a plain-text summary of a batch run, failures first."""
+    failed = [r for r in results if r.status == "failed"]
+    lines = [
+        f"Batch summary: {len(results) - len(failed)} succeeded,"
+        f" {len(failed)} failed, {len(results)} total",
+        f"{'table':<48} {'status':<10} {'seconds':>8}  error",
+    ]
+    for r in sorted(results, key=lambda r: (r.status != "failed", -r.seconds)):
+        lines.append(f"{r.label:<48} {r.status:<10} {r.seconds:>8.1f}  {r.error or ''}")
+    return "\n".join(lines)
+
+
+def _parse_cli_args(argv: list[str]) -> argparse.Namespace:
+    """Parse command-line arguments for a multi-table batch submission."""
+    parser = argparse.ArgumentParser(
+        description="Run many table pipelines from one cluster YAML in one session."
+    )
+    parser.add_argument(
+        "--source_name",
+        required=True,
+        help="Source cluster name (YAML file stem in GCS configs).",
+    )
+    parser.add_argument(
+        "--gcs_bucket",
+        required=True,
+        help="GCS bucket for pipeline configs and BigQuery indirect write staging.",
+    )
+    parser.add_argument("--project", required=True, help="GCP project ID.")
+    parser.add_argument(
+        "--tables",
+        default=None,
+        help=(
+            "Optional. Comma-separated <db_name>.<tbl_name> list. "
+            "Default: every table in the cluster YAML."
+        ),
+    )
+    parser.add_argument(
+        "--db_name",
+        default=None,
+        help="Optional. Without --tables, run only this database's tables.",
+    )
+    parser.add_argument(
+        "--parallelism",
+        type=int,
+        default=_DEFAULT_PARALLELISM,
+        help="Maximum number of tables running concurrently.",
+    )
+    parser.add_argument(
+        "--run_id",
+        default=None,
+        help="Optional unique run identifier for tracing.",
+    )
+    parser.add_argument(
+        "--configs_prefix",
+        default="configs",
+        help="Prefix inside --gcs_bucket where YAML configs live.",
+    )
+    parser.add_argument("--source_type", default=None, help="See main.py.")
+    parser.add_argument("--source_group", default=None, help="See main.py.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    """Run a batch from CLI arguments; return the process exit code."""
+    args = _parse_cli_args(argv)
+    logger.info(
+        "Batch started: source=%s run_id=%s", args.source_name, args.run_id or "unset"
+    )
+    cluster = load_cluster_config(
+        args.source_name,
+        args.gcs_bucket,
+        args.configs_prefix,
+        args.source_type,
+        args.source_group,
+    )
+    tables = (
+        parse_tables(args.tables)
+        if args.tables
+        else cluster_tables(cluster, args.db_name)
+    )
+
+    spark = (
+        SparkSession.builder.appName(f"pipeline-batch-{args.source_name}")
+        .config("spark.scheduler.mode", "FAIR")
+        .getOrCreate()
+    )
+    results = run_batch(
+        spark, cluster, tables, args.project, args.gcs_bucket, args.parallelism
+    )
+    logger.info("%s", format_report(results))
+    return 1 if any(r.status == "failed" for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -15,7 +15,8 @@ provided; otherwise the flat path is used.
 
 The pipeline is invoked once per table; source_name, db_name, and tbl_name
 are passed as CLI/procedure arguments and used to select the correct table
-entry from the YAML.
+entry from the YAML. The batch runner (pipeline/batch.py) loads the cluster
+YAML once and builds one PipelineConfig per table it runs.
 
 Secrets (JDBC URLs) are resolved by convention from Secret Manager:
   projects/<project>/secrets/<source_name>-jdbc-url/versions/latest
@@ -24,6 +25,7 @@ Never store credentials inline in config files.
 """
 
 import logging
+import re
 from enum import Enum
 
 import yaml
@@ -43,6 +45,70 @@ _MAX_PARTITIONS = 200
 #: Default number of JDBC partitions when pagination is disabled.
 _DEFAULT_NUM_PARTITIONS = 10
 
+#: How parallel JDBC reads split the pagination key:
+#:   bounds    -- numPartitions equal-width ranges between the key's MIN/MAX,
+#:                discovered automatically from the extraction query.
+#:   quantiles -- one explicit predicate per key quantile, so every task reads
+#:                roughly the same number of rows even when the key is skewed.
+#:   keyset    -- keyset pagination: page_rows-row pages (key > last ... key <=
+#:                next), at most numPartitions of them read concurrently.
+_PARTITION_STRATEGIES = ("bounds", "quantiles", "keyset")
+
+#: Default rows per page for keyset pagination.
+_DEFAULT_PAGE_ROWS = 100_000
+
+#: Default JDBC fetchSize (rows per round-trip).
+_DEFAULT_FETCH_SIZE = 10_000
+
+#: Default auto_tune target: bytes read per Spark task (and per keyset page),
+#: matching Spark's default spark.sql.files.maxPartitionBytes.
+_DEFAULT_TARGET_PARTITION_BYTES = 128 * 1024 * 1024
+
+#: How the writer guarantees a single scan of the JDBC source:
+#:   observe -- rows, bytes, and the max watermark are collected by
+#:              DataFrame.observe inside the write job itself.
+#:   persist -- the source is persisted once at persist_storage_level; the
+#:              metrics and the write both read the persisted copy.
+_SCAN_MODES = ("observe", "persist")
+
+#: How write_mode=merge applies the staged batch to the target:
+#:   full   -- MERGE ... ON merge_keys against the whole target table.
+#:   pruned -- MERGE restricted to the batch's partition_field day range, so
+#:             BigQuery scans only the partitions the batch touches. Batches of
+#:             at least merge_overwrite_min_rows rows rewrite each touched
+#:             partition instead (query job into table$YYYYMMDD).
+#:             Assumes a row's partition_field value does not change.
+_MERGE_STRATEGIES = ("full", "pruned")
+
+#: Spark BigQuery connector write method:
+#:   indirect -- stage to GCS, then a (free) BigQuery load job.
+#:   direct   -- stream through the Storage Write API; no GCS round-trip or
+#:               load-job queueing, billed per byte.
+#:   auto     -- direct when the batch is estimated at or below both
+#:               direct_max_rows and direct_max_bytes, indirect otherwise.
+_WRITE_METHODS = ("indirect", "direct", "auto")
+
+#: Change-data-capture (etl_mode: CDC) metadata columns added by the CDC
+#: extractor and consumed by the merge writer; never written to the target.
+#:   _cdc_op  -- "upsert" or "delete".
+#:   _cdc_lsn -- commit LSN of the change's source transaction, zero-padded
+#:               ("0000000A/0016B374") so string order is LSN order. It
+#:               doubles as the table's watermark column, so `_watermarks`
+#:               holds the last applied commit LSN.
+CDC_OP_COLUMN = "_cdc_op"
+CDC_LSN_COLUMN = "_cdc_lsn"
+
+#: Maximum length of a Postgres replication slot name (NAMEDATALEN - 1).
+_MAX_SLOT_NAME = 63
+
+#: Default cap on the replication slots of one cluster's CDC tables: Postgres's
+#: default max_replication_slots.
+_DEFAULT_CDC_MAX_SLOTS = 10
+
+#: Default write_method=auto thresholds.
+_DEFAULT_DIRECT_MAX_ROWS = 500_000
+_DEFAULT_DIRECT_MAX_BYTES = 100 * 1024 * 1024
+
 
 # ---------------------------------------------------------------------------
 # Enums
@@ -96,7 +162,7 @@ class TableConfig(BaseModel):
     etl_mode: str | None = Field(
         default=None,
         description=(
-            "ETL strategy: FULL_RELOAD or INCREMENTAL. "
+            "ETL strategy: FULL_RELOAD, INCREMENTAL, or CDC (logical replication). "
             "Inferred from backfill_filters when omitted."
         ),
     )
@@ -160,6 +226,152 @@ class TableConfig(BaseModel):
             return _MAX_PARTITIONS
         return v
 
+    partition_strategy: str = Field(
+        default="bounds",
+        description=(
+            "How a paginated read is split: 'bounds' (equal-width ranges "
+            "between the auto-discovered MIN/MAX of pagination_key), "
+            "'quantiles' (equal-row ranges for skewed keys), or 'keyset' "
+            "(page_rows-row keyset pages, pagination_size read at a time)."
+        ),
+    )
+    page_rows: int = Field(
+        default=_DEFAULT_PAGE_ROWS,
+        gt=0,
+        description=(
+            "Rows per page for partition_strategy=keyset. Each page is one "
+            "short indexed range query on pagination_key."
+        ),
+    )
+    partition_sample_percent: float | None = Field(
+        default=None,
+        gt=0,
+        le=100,
+        description=(
+            "Percentage of rows sampled when computing quantiles. "
+            "Omit to compute exact quantiles over the whole extraction query."
+        ),
+    )
+
+    auto_tune: bool = Field(
+        default=False,
+        description=(
+            "Size the read from Postgres table statistics (pg_class.reltuples, "
+            "pg_total_relation_size, pg_stats.avg_width): pagination_size, "
+            "page_rows, and the JDBC fetch size are chosen at run time."
+        ),
+    )
+    target_partition_bytes: int = Field(
+        default=_DEFAULT_TARGET_PARTITION_BYTES,
+        gt=0,
+        description="auto_tune: bytes each JDBC partition (or keyset page) reads.",
+    )
+
+    @field_validator("partition_strategy", mode="after")
+    @classmethod
+    def _check_partition_strategy(cls, v: str) -> str:
+        """Reject unknown strategies at config load rather than mid-extraction."""
+        if v not in _PARTITION_STRATEGIES:
+            raise ValueError(
+                f"Unknown partition_strategy '{v}'. "
+                f"Expected one of: {list(_PARTITION_STRATEGIES)}"
+            )
+        return v
+
+    scan_mode: str = Field(
+        default="observe",
+        description=(
+            "How the source is scanned exactly once: 'observe' (metrics and "
+            "watermark computed during the write) or 'persist' (persisted "
+            "at persist_storage_level, then written)."
+        ),
+    )
+    persist_storage_level: str = Field(
+        default="MEMORY_AND_DISK",
+        description="pyspark StorageLevel name used by scan_mode=persist.",
+    )
+
+    merge_strategy: str = Field(
+        default="full",
+        description=(
+            "Merge scope for upserts: 'full' (whole target) or 'pruned' "
+            "(only the partitions the batch touches; needs partition_keys)."
+        ),
+    )
+    merge_overwrite_min_rows: int | None = Field(
+        default=None,
+        gt=0,
+        description=(
+            "With merge_strategy=pruned: batches with at least this many rows "
+            "overwrite each touched partition instead of running a MERGE."
+        ),
+    )
+
+    cdc_slot: str | None = Field(
+        default=None,
+        description=(
+            "etl_mode=CDC: logical replication slot (wal2json) to read changes "
+            "from. Default: pipeline_<db_name>_<tbl_name>. Created if missing."
+        ),
+    )
+    cdc_max_changes: int | None = Field(
+        default=None,
+        gt=0,
+        description=(
+            "etl_mode=CDC: read at most about this many changes per run "
+            "(whole transactions; BEGIN/COMMIT records count too); the rest "
+            "are picked up by the next run."
+        ),
+    )
+    write_method: str = Field(
+        default="indirect",
+        description=(
+            "BigQuery write method: 'indirect' (GCS + load job), 'direct' "
+            "(Storage Write API), or 'auto' (direct for small batches)."
+        ),
+    )
+    direct_max_rows: int = Field(
+        default=_DEFAULT_DIRECT_MAX_ROWS,
+        gt=0,
+        description="write_method=auto: largest batch (rows) written direct.",
+    )
+    direct_max_bytes: int = Field(
+        default=_DEFAULT_DIRECT_MAX_BYTES,
+        gt=0,
+        description="write_method=auto: largest batch (bytes) written direct.",
+    )
+
+    @field_validator("write_method", mode="after")
+    @classmethod
+    def _check_write_method(cls, v: str) -> str:
+        """Reject unknown write methods at config load."""
+        if v not in _WRITE_METHODS:
+            raise ValueError(
+                f"Unknown write_method '{v}'. Expected one of: {list(_WRITE_METHODS)}"
+            )
+        return v
+
+    @field_validator("merge_strategy", mode="after")
+    @classmethod
+    def _check_merge_strategy(cls, v: str) -> str:
+        """Reject unknown merge strategies at config load."""
+        if v not in _MERGE_STRATEGIES:
+            raise ValueError(
+                f"Unknown merge_strategy '{v}'. "
+                f"Expected one of: {list(_MERGE_STRATEGIES)}"
+            )
+        return v
+
+    @field_validator("scan_mode", mode="after")
+    @classmethod
+    def _check_scan_mode(cls, v: str) -> str:
+        """Reject unknown scan modes at config load."""
+        if v not in _SCAN_MODES:
+            raise ValueError(
+                f"Unknown scan_mode '{v}'. Expected one of: {list(_SCAN_MODES)}"
+            )
+        return v
+
     tbl_name_alias: str | None = Field(
         default=None,
         description=(
@@ -193,9 +405,48 @@ class ClusterConfig(BaseModel):
         default_factory=dict,
         description="Nested mapping of database_name -> DatabaseConfig.",
     )
+    cdc_max_slots: int = Field(
+        default=_DEFAULT_CDC_MAX_SLOTS,
+        gt=0,
+        description=(
+            "Most replication slots the cluster's etl_mode=CDC tables may use "
+            "(one each). Keep it within the server's max_replication_slots, "
+            "less the slots used by anything else."
+        ),
+    )
 
     model_config = {"extra": "allow"}
 
+    @model_validator(mode="after")
+    def _check_cdc_slots(self) -> "ClusterConfig":
+        """Reject shared CDC slots and more slots than cdc_max_slots.
+
+        Each CDC table advances its slot to its own last applied LSN, so two
+        tables on one slot would release each other's unapplied changes.
+        """
+        owners: dict[str, str] = {}
+        for db_name, db_cfg in self.data_config.items():
+            for tbl_name, tbl_cfg in db_cfg.tables.items():
+                if _resolve_etl_mode(tbl_cfg) != "CDC":
+                    continue
+                clean_tbl_name = tbl_name.strip("\"'")
+                slot = tbl_cfg.cdc_slot or _derive_cdc_slot(db_name, clean_tbl_name)
+                label = f"{db_name}.{clean_tbl_name}"
+                if slot in owners:
+                    raise ValueError(
+                        f"CDC tables {owners[slot]} and {label} share replication "
+                        f"slot '{slot}'. Give each table its own cdc_slot."
+                    )
+                owners[slot] = label
+        if len(owners) > self.cdc_max_slots:
+            raise ValueError(
+                f"{len(owners)} etl_mode=CDC tables need one replication slot "
+                f"each, more than cdc_max_slots={self.cdc_max_slots}. Raise "
+                "max_replication_slots on the source and cdc_max_slots here, or "
+                "move tables to INCREMENTAL."
+            )
+        return self
+
 
 # ---------------------------------------------------------------------------
 # Flat runtime model
@@ -237,13 +488,34 @@ class PipelineConfig(BaseModel):
         description="Column used to parallelise JDBC reads via numPartitions.",
     )
     num_partitions: int = Field(default=_DEFAULT_NUM_PARTITIONS)
+    partition_strategy: str = Field(
+        default="bounds",
+        description="Parallel read split: bounds | quantiles | keyset.",
+    )
+    partition_sample_percent: float | None = Field(
+        default=None,
+        description="Sample percentage for quantile discovery (None = exact).",
+    )
+    page_rows: int = Field(
+        default=_DEFAULT_PAGE_ROWS,
+        description="Rows per page for keyset pagination.",
+    )
     fetch_size: int = Field(
-        default=10000,
+        default=_DEFAULT_FETCH_SIZE,
         description=(
             "JDBC fetchSize — number of rows fetched per round-trip from the "
-            "database. Not currently YAML-configurable; change at source if needed."
+            "database. Not YAML-configurable; chosen from the average row "
+            "width when auto_tune is set."
         ),
     )
+    auto_tune: bool = Field(
+        default=False,
+        description=(
+            "Override num_partitions, page_rows, and fetch_size from table "
+            "statistics at extraction time (see TableConfig)."
+        ),
+    )
+    target_partition_bytes: int = Field(default=_DEFAULT_TARGET_PARTITION_BYTES)
 
     # Target
     project: str = Field(description="GCP project ID for target BigQuery dataset.")
@@ -262,15 +534,33 @@ class PipelineConfig(BaseModel):
     write_mode: str = Field(
         description="Write strategy: overwrite | append | merge.",
     )
+    cdc_slot: str | None = Field(default=None)
+    cdc_max_changes: int | None = Field(default=None)
+    write_method: str = Field(
+        default="indirect",
+        description="indirect | direct | auto (see TableConfig).",
+    )
+    direct_max_rows: int = Field(default=_DEFAULT_DIRECT_MAX_ROWS)
+    direct_max_bytes: int = Field(default=_DEFAULT_DIRECT_MAX_BYTES)
     merge_keys: list[str] = Field(default_factory=list)
+    merge_strategy: str = Field(
+        default="full",
+        description="Merge scope: full | pruned (see TableConfig).",
+    )
+    merge_overwrite_min_rows: int | None = Field(default=None)
     partition_field: str | None = Field(default=None)
     clustering_fields: list[str] = Field(default_factory=list)
 
     # Extraction
     extraction_mode: str = Field(
-        description="Extraction strategy: full | incremental.",
+        description="Extraction strategy: full | incremental | cdc.",
     )
     watermark_column: str | None = Field(default=None)
+    scan_mode: str = Field(
+        default="observe",
+        description="Single-pass source scan: observe | persist (see TableConfig).",
+    )
+    persist_storage_level: str = Field(default="MEMORY_AND_DISK")
 
     # Infrastructure
     gcs_bucket: str = Field(
@@ -285,6 +575,8 @@ class PipelineConfig(BaseModel):
     def _validate_merge_keys(self) -> "PipelineConfig":
         if self.write_mode == "merge" and not self.merge_keys:
             raise ValueError("write_mode=merge requires merge_keys to be non-empty.")
+        if self.extraction_mode == "cdc" and self.write_mode != "merge":
+            raise ValueError("extraction_mode=cdc requires write_mode=merge.")
         return self
 
     @property
@@ -300,6 +592,7 @@ class PipelineConfig(BaseModel):
 _ETL_MODE_TO_EXTRACTION = {
     "FULL_RELOAD": "full",
     "INCREMENTAL": "incremental",
+    "CDC": "cdc",
 }
 
 
@@ -315,7 +608,7 @@ def _resolve_etl_mode(tbl_cfg: TableConfig) -> str:
         tbl_cfg: Parsed table configuration entry.
 
     Returns:
-        Resolved ETL mode string: "FULL_RELOAD" or "INCREMENTAL".
+        Resolved ETL mode string: "FULL_RELOAD", "INCREMENTAL", or "CDC".
     """
     if tbl_cfg.etl_mode is not None:
         return tbl_cfg.etl_mode
@@ -336,11 +629,30 @@ def _derive_write_mode(etl_mode: str, upsert_key: list[str]) -> str:
         return "overwrite"
     if etl_mode == "INCREMENTAL":
         return "merge" if upsert_key else "append"
+    if etl_mode == "CDC":
+        # Upserts and deletes are applied by MERGE; merge requires upsert_key.
+        return "merge"
     # Unknown etl_mode -- fall back to overwrite (safe default)
     logger.warning("Unknown etl_mode '%s' -- defaulting to overwrite.", etl_mode)
     return "overwrite"
 
 
+def _derive_cdc_slot(db_name: str, tbl_name: str) -> str:
+    """Derive the default replication slot name for a CDC table.
+
+    Args:
+        db_name: Database name.
+        tbl_name: Table name (dotted names allowed).
+
+    Returns:
+        pipeline_<db_name>_<tbl_name>, lowercased, with every character
+        Postgres does not allow in slot names replaced by "_", truncated to
+        63 characters.
+    """
+    slot = re.sub(r"[^a-z0-9_]", "_", f"pipeline_{db_name}_{tbl_name}".lower())
+    return slot[:_MAX_SLOT_NAME]
+
+
 def _derive_dataset(db_name: str) -> str:
     """Derive the BigQuery dataset name from the database name.
 
@@ -445,6 +757,12 @@ def _build_pipeline_config(
     watermark_column = (
         tbl_cfg.backfill_filters[0].backfill_id if tbl_cfg.backfill_filters else None
     )
+    cdc_slot = None
+    if extraction_mode == "cdc":
+        # The change LSN is the watermark: `_watermarks` stores the last
+        # applied LSN instead of a column value.
+        watermark_column = CDC_LSN_COLUMN
+        cdc_slot = tbl_cfg.cdc_slot or _derive_cdc_slot(db_name, clean_tbl_name)
     partition_field = (
         tbl_cfg.partition_keys[0].col_name if tbl_cfg.partition_keys else None
     )
@@ -469,6 +787,11 @@ def _build_pipeline_config(
         source_table=source_table,
         partition_column=partition_column,
         num_partitions=num_partitions,
+        partition_strategy=tbl_cfg.partition_strategy,
+        partition_sample_percent=tbl_cfg.partition_sample_percent,
+        page_rows=tbl_cfg.page_rows,
+        auto_tune=tbl_cfg.auto_tune,
+        target_partition_bytes=tbl_cfg.target_partition_bytes,
         project=project,
         dataset=_derive_dataset(db_name),
         table=bq_table_name,
@@ -478,6 +801,15 @@ def _build_pipeline_config(
         clustering_fields=tbl_cfg.z_order_by,
         extraction_mode=extraction_mode,
         watermark_column=watermark_column,
+        cdc_slot=cdc_slot,
+        cdc_max_changes=tbl_cfg.cdc_max_changes,
+        write_method=tbl_cfg.write_method,
+        direct_max_rows=tbl_cfg.direct_max_rows,
+        direct_max_bytes=tbl_cfg.direct_max_bytes,
+        merge_strategy=tbl_cfg.merge_strategy,
+        merge_overwrite_min_rows=tbl_cfg.merge_overwrite_min_rows,
+        scan_mode=tbl_cfg.scan_mode,
+        persist_storage_level=tbl_cfg.persist_storage_level,
         gcs_bucket=gcs_bucket,
     )
 
@@ -525,6 +857,35 @@ def _build_blob_path(
     return f"{configs_prefix}/{source_name}.yaml"
 
 
+def load_cluster_config(
+    source_name: str,
+    gcs_bucket: str,
+    configs_prefix: str = "configs",
+    source_type: str | None = None,
+    source_group: str | None = None,
+) -> ClusterConfig:
+    """Load and validate a cluster-level YAML file from GCS.
+
+    Args:
+        source_name: Source cluster name (YAML file stem).
+        gcs_bucket: GCS bucket name (without gs:// prefix).
+        configs_prefix: Prefix inside the bucket where configs live.
+        source_type: Optional. See load_config.
+        source_group: Optional. See load_config.
+
+    Returns:
+        Validated ClusterConfig instance.
+
+    Raises:
+        google.cloud.exceptions.NotFound: If the config file does not exist.
+        pydantic.ValidationError: If the YAML does not match the schema.
+    """
+    blob_path = _build_blob_path(source_name, configs_prefix, source_type, source_group)
+    logger.info("Loading config from gs://%s/%s", gcs_bucket, blob_path)
+    raw = _read_gcs_yaml(gcs_bucket, blob_path)
+    return ClusterConfig.model_validate(raw)
+
+
 def load_config(
     source_name: str,
     db_name: str,
@@ -561,11 +922,9 @@ def load_config(
         pydantic.ValidationError: If the YAML does not match the schema.
         KeyError: If db_name or tbl_name is not present in the cluster YAML.
     """
-    blob_path = _build_blob_path(source_name, configs_prefix, source_type, source_group)
-    logger.info("Loading config from gs://%s/%s", gcs_bucket, blob_path)
-    raw = _read_gcs_yaml(gcs_bucket, blob_path)
-
-    cluster = ClusterConfig.model_validate(raw)
+    cluster = load_cluster_config(
+        source_name, gcs_bucket, configs_prefix, source_type, source_group
+    )
     return _build_pipeline_config(cluster, db_name, tbl_name, project, gcs_bucket)
 
 
@@ -11,22 +11,171 @@ Or include it in jar_uris for a BQ Spark stored procedure.
 Supports:
 - Full table extraction
 - Incremental extraction via a watermark column and GCP Secret Manager
-- Parallel JDBC reads via partition_column / num_partitions
+- Parallel JDBC reads via partition_column / num_partitions, split either into
+  equal-width ranges between the key's auto-discovered MIN/MAX ("bounds"),
+  into equal-row ranges at the key's quantiles ("quantiles", for skewed keys),
+  or into fixed-size keyset pages ("keyset", for keys without a usable range)
+- Optional auto-tuning (auto_tune) of the partition count, keyset page size,
+  and fetch size from the table's planner statistics
 """
 
 import logging
+import math
+from decimal import Decimal
 
 from google.api_core.exceptions import NotFound
 from google.cloud import bigquery as _bq
 from pyspark.sql import DataFrame, SparkSession
 
-from pipeline.config import PipelineConfig, resolve_secret
+from pipeline.config import _MAX_PARTITIONS, PipelineConfig, resolve_secret
 from pipeline.extractors.base import BaseExtractor
 
 logger = logging.getLogger(__name__)
 
 _JDBC_DRIVER = "org.postgresql.Driver"
 
+#: auto_tune: bytes buffered per JDBC round-trip, and the fetch size bounds.
+_FETCH_BUFFER_BYTES = 8 * 1024 * 1024
+_MIN_FETCH_SIZE = 1_000
+_MAX_FETCH_SIZE = 100_000
+
+
+def _sql_literal(value) -> str:
+    """Render a partition-key value as a Postgres literal."""
+    if isinstance(value, int | float | Decimal) and not isinstance(value, bool):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def quantile_predicates(column: str, cuts: list) -> list[str]:
+    """Build one JDBC predicate per range between consecutive quantile cuts.
+
+    The first range also takes NULL keys and the last is open-ended, so every
+    row is read exactly once.
+
+    Args:
+        column: Partition column.
+        cuts: Sorted, distinct cut points.
+
+    Returns:
+        ``len(cuts) + 1`` WHERE-clause predicates, one per Spark partition.
+    """
+    literals = [_sql_literal(c) for c in cuts]
+    predicates = [f"({column} < {literals[0]} OR {column} IS NULL)"]
+    predicates += [
+        f"{column} >= {lo} AND {column} < {hi}"
+        for lo, hi in zip(literals, literals[1:], strict=False)
+    ]
+    predicates.append(f"{column} >= {literals[-1]}")
+    return predicates
+
+
+def keyset_predicates(column: str, boundaries: list) -> list[str]:
+    """Build one JDBC predicate per keyset page.
+
+    Page ``i`` is ``key > boundaries[i-1] AND key <= boundaries[i]``: the rows a
+    ``WHERE key > last ORDER BY key LIMIT page_rows`` walk would return, but
+    addressable independently so pages can be read in parallel. The first page
+    also takes NULL keys and the last is open-ended, so rows added after the
+    boundary scan are still read.
+
+    Args:
+        column: Pagination key.
+        boundaries: Sorted last keys of each full page.
+
+    Returns:
+        ``len(boundaries) + 1`` WHERE-clause predicates, one per page.
+    """
+    literals = [_sql_literal(b) for b in boundaries]
+    if not literals:
+        return []
+    predicates = [f"({column} <= {literals[0]} OR {column} IS NULL)"]
+    predicates += [
+        f"{column} > {lo} AND {column} <= {hi}"
+        for lo, hi in zip(literals, literals[1:], strict=False)
+    ]
+    predicates.append(f"{column} > {literals[-1]}")
+    return predicates
+
+
+def keyset_step_sql(query: str, column: str, page_rows: int, after=None) -> str:
+    """SQL returning the last key of the keyset page that starts after ``after``.
+
+    One short, index-backed step: ``WHERE key > after ORDER BY key`` skipped
+    ahead ``page_rows - 1`` keys. No row means the rest fits in one page.
+
+    Args:
+        query: The extraction query (see PostgresExtractor._build_query).
+        column: Pagination key.
+        page_rows: Rows per page.
+        after: The previous page's last key; None for the first page.
+    """
+    start = "IS NOT NULL" if after is None else f"> {_sql_literal(after)}"
+    return (
+        f"SELECT {column} AS boundary FROM ({query}) AS _subq "
+        f"WHERE {column} {start} ORDER BY {column} "
+        f"OFFSET {page_rows - 1} LIMIT 1"
+    )
+
+
+def table_stats_sql(source_table: str) -> str:
+    """SQL reading the planner statistics auto_tune sizes the read from.
+
+    Returns one row (none if the table does not exist) with row_estimate
+    (pg_class.reltuples; -1 if the table was never analyzed), total_bytes
+    (pg_total_relation_size, including indexes and TOAST), and row_width (sum
+    of pg_stats.avg_width; NULL until the table is analyzed).
+    """
+    return (
+        "SELECT c.reltuples::bigint AS row_estimate, "
+        "pg_total_relation_size(c.oid) AS total_bytes, "
+        "(SELECT SUM(s.avg_width) FROM pg_stats AS s "
+        "WHERE s.schemaname = n.nspname AND s.tablename = c.relname)::bigint "
+        "AS row_width "
+        "FROM pg_class AS c JOIN pg_namespace AS n ON n.oid = c.relnamespace "
+        f"WHERE c.oid = to_regclass({_sql_literal(source_table)})"
+    )
+
+
+def tune_read(
+    row_estimate: int | None,
+    total_bytes: int,
+    row_width: int | None,
+    target_bytes: int,
+) -> dict:
+    """Choose JDBC read settings so every task reads about target_bytes.
+
+    The table size is row_estimate * row_width when both are known, and
+    total_bytes otherwise. Without pg_stats, the row width is estimated as
+    total_bytes / row_estimate.
+
+    Args:
+        row_estimate: pg_class.reltuples (negative or None when unknown).
+        total_bytes: pg_total_relation_size of the table.
+        row_width: Average row width in bytes (None when unknown).
+        target_bytes: Bytes each partition or keyset page should read.
+
+    Returns:
+        num_partitions (1 to _MAX_PARTITIONS), plus fetch_size and page_rows
+        when a row width is known.
+    """
+    rows = row_estimate if row_estimate is not None and row_estimate >= 0 else None
+    if not row_width and rows:
+        row_width = max(1, total_bytes // rows)
+    table_bytes = rows * row_width if rows is not None and row_width else total_bytes
+
+    tuned = {
+        "num_partitions": min(
+            _MAX_PARTITIONS, max(1, math.ceil(table_bytes / target_bytes))
+        )
+    }
+    if row_width:
+        tuned["fetch_size"] = min(
+            _MAX_FETCH_SIZE, max(_MIN_FETCH_SIZE, _FETCH_BUFFER_BYTES // row_width)
+        )
+        tuned["page_rows"] = max(1, target_bytes // row_width)
+    return tuned
+
 
 class PostgresExtractor(BaseExtractor):
     """Extract data from a PostgreSQL database using Spark JDBC."""
@@ -48,6 +197,9 @@ class PostgresExtractor(BaseExtractor):
             "driver": _JDBC_DRIVER,
             "fetchsize": str(config.fetch_size),
         }
+        if config.auto_tune:
+            config = self._auto_tune(spark, base_options, config)
+            base_options["fetchsize"] = str(config.fetch_size)
 
         query = self._build_query(spark, config)
         logger.info(
@@ -58,26 +210,247 @@ class PostgresExtractor(BaseExtractor):
             config.extraction_mode,
         )
 
-        if config.partition_column:
-            options = {
-                **base_options,
-                "dbtable": f"({query}) AS _subq",
-                "partitionColumn": config.partition_column,
-                "numPartitions": str(config.num_partitions),
-            }
-            logger.info(
-                "Using parallel JDBC read: partitionColumn=%s partitions=%d",
-                config.partition_column,
-                config.num_partitions,
-            )
+        dbtable = f"({query}) AS _subq"
+        options = {**base_options, "dbtable": dbtable}
+        if not config.partition_column:
+            return spark.read.format("jdbc").options(**options).load()
+
+        if config.partition_strategy == "keyset":
+            boundaries = self._keyset_boundaries(spark, base_options, query, config)
+            if boundaries:
+                predicates = keyset_predicates(config.partition_column, boundaries)
+                logger.info(
+                    "Using keyset-paginated JDBC read: key=%s pages=%d "
+                    "page_rows=%d max_connections=%d",
+                    config.partition_column,
+                    len(predicates),
+                    config.page_rows,
+                    config.num_partitions,
+                )
+                properties = {k: v for k, v in base_options.items() if k != "url"}
+                pages = spark.read.jdbc(
+                    url=jdbc_url,
+                    table=dbtable,
+                    predicates=predicates,
+                    properties=properties,
+                )
+                # coalesce() without a shuffle packs several pages into one
+                # task, which reads them one after another: at most
+                # num_partitions pages (JDBC connections) are open at once.
+                return pages.coalesce(config.num_partitions)
+        elif config.partition_strategy == "quantiles":
+            cuts = self._partition_quantiles(spark, base_options, query, config)
+            if cuts:
+                predicates = quantile_predicates(config.partition_column, cuts)
+                logger.info(
+                    "Using skew-aware JDBC read: partitionColumn=%s "
+                    "predicates=%d (quantile cuts %s .. %s)",
+                    config.partition_column,
+                    len(predicates),
+                    cuts[0],
+                    cuts[-1],
+                )
+                properties = {k: v for k, v in base_options.items() if k != "url"}
+                return spark.read.jdbc(
+                    url=jdbc_url,
+                    table=dbtable,
+                    predicates=predicates,
+                    properties=properties,
+                )
         else:
-            options = {
-                **base_options,
-                "dbtable": f"({query}) AS _subq",
-            }
+            bounds = self._partition_bounds(
+                spark, base_options, query, config.partition_column
+            )
+            if bounds is not None:
+                options.update(
+                    {
+                        "partitionColumn": config.partition_column,
+                        "numPartitions": str(config.num_partitions),
+                        "lowerBound": str(bounds[0]),
+                        "upperBound": str(bounds[1]),
+                    }
+                )
+                logger.info(
+                    "Using parallel JDBC read: partitionColumn=%s partitions=%d "
+                    "bounds=[%s, %s]",
+                    config.partition_column,
+                    config.num_partitions,
+                    bounds[0],
+                    bounds[1],
+                )
+                return spark.read.format("jdbc").options(**options).load()
 
+        logger.info(
+            "No non-null %s values to split on -- reading as a single partition.",
+            config.partition_column,
+        )
         return spark.read.format("jdbc").options(**options).load()
 
+    # ------------------------------------------------------------------
+    # Partition discovery
+    # ------------------------------------------------------------------
+
+    def _probe(self, spark: SparkSession, base_options: dict, sql: str) -> list:
+        """Run a small metadata query over JDBC and collect its rows."""
+        return (
+            spark.read.format("jdbc")
+            .options(**base_options, dbtable=f"({sql}) AS _probe")
+            .load()
+            .collect()
+        )
+
+    def _auto_tune(
+        self, spark: SparkSession, base_options: dict, config: PipelineConfig
+    ) -> PipelineConfig:
+        """Return config with read settings sized from the table's statistics.
+
+        The statistics describe the whole table, so incremental runs are
+        sized for a full read; their bounds and quantiles still cover only
+        the rows past the watermark.
+        """
+        rows = self._probe(spark, base_options, table_stats_sql(config.source_table))
+        if not rows:
+            logger.warning(
+                "auto_tune: no statistics for %s -- keeping num_partitions=%d "
+                "fetch_size=%d page_rows=%d.",
+                config.source_table,
+                config.num_partitions,
+                config.fetch_size,
+                config.page_rows,
+            )
+            return config
+
+        stats = rows[0]
+        tuned = tune_read(
+            stats["row_estimate"],
+            stats["total_bytes"],
+            stats["row_width"],
+            config.target_partition_bytes,
+        )
+        tuned_config = config.model_copy(update=tuned)
+        logger.info(
+            "auto_tune %s: row_estimate=%s total_bytes=%s row_width=%s "
+            "target_partition_bytes=%d -> num_partitions=%d fetch_size=%d "
+            "page_rows=%d",
+            config.source_table,
+            stats["row_estimate"],
+            stats["total_bytes"],
+            stats["row_width"],
+            config.target_partition_bytes,
+            tuned_config.num_partitions,
+            tuned_config.fetch_size,
+            tuned_config.page_rows,
+        )
+        if tuned_config.num_partitions > 1 and not config.partition_column:
+            logger.warning(
+                "auto_tune: %s would read best as %d partitions, but it has no "
+                "pagination_key -- reading it as a single partition.",
+                config.source_table,
+                tuned_config.num_partitions,
+            )
+        return tuned_config
+
+    def _partition_bounds(
+        self, spark: SparkSession, base_options: dict, query: str, column: str
+    ) -> tuple | None:
+        """Discover lowerBound/upperBound for a range-partitioned JDBC read.
+
+        The MIN/MAX runs over the extraction subquery itself, so incremental
+        runs only split the rows past the watermark. Rows written between this
+        probe and the read are not lost: Spark leaves the first and last
+        ranges open-ended.
+
+        Args:
+            spark: Active SparkSession.
+            base_options: JDBC url/driver options.
+            query: The extraction query (see _build_query).
+            column: Partition column.
+
+        Returns:
+            ``(min, max)`` of the column, or None when it has no non-null values.
+        """
+        rows = self._probe(
+            spark,
+            base_options,
+            f"SELECT MIN({column}) AS lo, MAX({column}) AS hi FROM ({query}) AS _subq",
+        )
+        if not rows or rows[0]["lo"] is None:
+            return None
+        return rows[0]["lo"], rows[0]["hi"]
+
+    def _keyset_boundaries(
+        self,
+        spark: SparkSession,
+        base_options: dict,
+        query: str,
+        config: PipelineConfig,
+    ) -> list:
+        """Find the last key of every full keyset page, one short step per page.
+
+        Each step is its own keyset_step_sql query (an index range scan of
+        page_rows keys when the key is indexed), so no statement on the
+        primary runs, or holds a snapshot, for longer than one page. The
+        trade-off is one probe round-trip per page instead of a single
+        whole-table pass.
+
+        Returns:
+            Sorted, distinct page boundaries (empty when everything fits in one
+            page). A key repeated across a boundary stays in one page.
+        """
+        column = config.partition_column
+        boundaries: list = []
+        while rows := self._probe(
+            spark,
+            base_options,
+            keyset_step_sql(
+                query,
+                column,
+                config.page_rows,
+                boundaries[-1] if boundaries else None,
+            ),
+        ):
+            boundaries.append(rows[0]["boundary"])
+        return boundaries
+
+    def _partition_quantiles(
+        self,
+        spark: SparkSession,
+        base_options: dict,
+        query: str,
+        config: PipelineConfig,
+    ) -> list:
+        """Compute num_partitions - 1 quantile cut points of the partition column.
+
+        Uses percentile_disc, so cuts are real key values and work for any
+        orderable type. With partition_sample_percent, quantiles are estimated
+        from a random row sample of the extraction query, which avoids sorting
+        the whole key.
+
+        Returns:
+            Sorted, distinct cut points (empty for an empty or all-null column).
+        """
+        column = config.partition_column
+        fractions = ", ".join(
+            f"{i / config.num_partitions:.6f}" for i in range(1, config.num_partitions)
+        )
+        if not fractions:
+            return []
+        sample = (
+            f" WHERE random() < {config.partition_sample_percent / 100:.6f}"
+            if config.partition_sample_percent
+            else ""
+        )
+        rows = self._probe(
+            spark,
+            base_options,
+            "SELECT DISTINCT cut FROM unnest(("
+            f"SELECT percentile_disc(ARRAY[{fractions}]) "
+            f"WITHIN GROUP (ORDER BY {column}) "
+            f"FROM ({query}) AS _subq{sample}"
+            ")) AS cut",
+        )
+        return sorted(row["cut"] for row in rows if row["cut"] is not None)
+
     def _build_query(self, spark: SparkSession, config: PipelineConfig) -> str:
         """Build the extraction SQL query.
 
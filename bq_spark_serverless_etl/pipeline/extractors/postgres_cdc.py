@@ -0,0 +1,540 @@
+"""PostgreSQL change-data-capture extractor using logical replication.
+
+Used for tables with etl_mode: CDC. Changes are read from a logical
+replication slot with the wal2json output plugin (format-version 2) through
+the SQL interface, over the same Spark JDBC connection as PostgresExtractor:
+
+    SELECT ... FROM pg_logical_slot_peek_changes('<slot>', NULL, <n>,
+        'format-version', '2', 'include-transaction', 'true',
+        'add-tables', '<schema.table>')
+
+Unlike watermark extraction this captures deletes and never scans the table
+on the primary; the server only decodes WAL written since the last run.
+
+Run lifecycle:
+1. Read the last applied LSN from `_watermarks` (CDC tables store the commit
+   LSN of the last applied transaction, zero-padded, as watermark_value; see
+   config.CDC_LSN_COLUMN).
+2. First run (no LSN): create the slot if it does not exist, then take a
+   full JDBC snapshot of the table. Every snapshot row is an upsert at the
+   slot's starting LSN, so changes committed while the snapshot runs are
+   replayed on top of it by the next run.
+3. Later runs: advance the slot to the last applied commit LSN (releasing
+   the WAL before it), then peek -- not consume -- the transactions committed
+   after it. Peeking keeps the slot unchanged if the run fails, so a failed
+   run is retried from the same LSN. A batch with none of the table's changes
+   is released at its last commit LSN instead, so the slot of a quiet table
+   still keeps up with a busy database.
+4. Tag every change with the commit LSN of its transaction (from the wal2json
+   "C" record) and drop changes whose commit is not in the batch. Decoding is
+   in commit order, so the batch is a run of whole transactions and its max
+   commit LSN is a safe resume point even when transactions interleave in
+   the WAL. No per-change LSN filter is needed: the slot itself resumes after
+   the last commit it was advanced to.
+5. Decode each change into upserts and deletes (an update that changes the
+   key becomes a delete of the old key plus an upsert of the new one) and
+   keep the last change per merge key. The writer MERGEs the batch and
+   stores its max _cdc_lsn in `_watermarks`.
+
+Requirements on the source: wal_level=logical, the wal2json plugin, and a
+user with the REPLICATION attribute (cloudsql.logical_decoding=on and the
+cloudsqlsuperuser role on Cloud SQL). Tables with TOAST-able columns (text,
+jsonb, bytea, ...) need REPLICA IDENTITY FULL: wal2json leaves unchanged
+TOASTed values out of an UPDATE, and the full old row is what fills them
+back in. TRUNCATE is not replicated; rerun the table as FULL_RELOAD after
+truncating it. An unused slot retains WAL on the primary until it is
+dropped: SELECT pg_drop_replication_slot('<slot>').
+
+Each table needs its own slot (a slot is advanced to its table's watermark,
+which would release another table's unapplied changes), and the server caps
+slots at max_replication_slots (default 10). ClusterConfig rejects shared
+slots and more CDC tables than cdc_max_slots.
+
+Local testing: see tests/docker/postgres-wal2json.Dockerfile and
+`make test-cdc`.
+"""
+
+import logging
+
+from pyspark.sql import Column, DataFrame, SparkSession, Window
+from pyspark.sql import functions as F
+from pyspark.sql.types import (
+    ArrayType,
+    BinaryType,
+    DataType,
+    MapType,
+    StringType,
+    StructField,
+    StructType,
+)
+
+from pipeline.config import (
+    CDC_LSN_COLUMN,
+    CDC_OP_COLUMN,
+    PipelineConfig,
+    resolve_secret,
+)
+from pipeline.extractors.postgres import _JDBC_DRIVER, PostgresExtractor
+
+logger = logging.getLogger(__name__)
+
+_OUTPUT_PLUGIN = "wal2json"
+
+#: Shape of one wal2json format-version 2 record. Values are kept as JSON
+#: text and decoded to the table's column types afterwards.
+_WAL2JSON_SCHEMA = StructType(
+    [
+        StructField("action", StringType()),
+        StructField(
+            "columns",
+            ArrayType(
+                StructType(
+                    [
+                        StructField("name", StringType()),
+                        StructField("value", StringType()),
+                    ]
+                )
+            ),
+        ),
+        StructField(
+            "identity",
+            ArrayType(
+                StructType(
+                    [
+                        StructField("name", StringType()),
+                        StructField("value", StringType()),
+                    ]
+                )
+            ),
+        ),
+    ]
+)
+
+
+#: One element of a Postgres array literal: a double-quoted string (with
+#: backslash escapes) or a bare token.
+_ARRAY_ELEMENT = r'"(?:[^"\\]|\\.)*"|[^,{}"]+'
+
+
+def _decode_value(value: Column, data_type: DataType) -> Column:
+    """Decode one wal2json value from Postgres text output to data_type.
+
+    A plain cast handles numbers, booleans, dates, timestamps, and text, but
+    yields NULL for bytea (hex "\\x0a0b") and arrays ("{1,2}"), which are
+    decoded here. Values that still cannot be decoded come out NULL.
+    """
+    if isinstance(data_type, BinaryType):
+        return F.when(value.startswith("\\x"), F.unhex(F.substring(value, 3, 1 << 30)))
+    if isinstance(data_type, ArrayType) and not isinstance(
+        data_type.elementType, (ArrayType, MapType, StructType)
+    ):
+        tokens = F.regexp_extract_all(value, F.lit(_ARRAY_ELEMENT), 0)
+        elements = F.transform(
+            tokens,
+            lambda t: (
+                F.when(t == "NULL", None)
+                .when(
+                    t.startswith('"'),
+                    F.regexp_replace(
+                        F.regexp_extract(t, r'(?s)^"(.*)"$', 1), r"\\(.)", "$1"
+                    ),
+                )
+                .otherwise(t)
+            ),
+        )
+        decoded = F.transform(
+            elements, lambda e: _decode_value(e, data_type.elementType)
+        )
+        # One undecodable element makes the whole array NULL, so the caller's
+        # check catches it.
+        lost = F.exists(
+            elements,
+            lambda e: e.isNotNull() & _decode_value(e, data_type.elementType).isNull(),
+        )
+        return F.when(value.startswith("{") & ~lost, decoded)
+    return value.cast(data_type)
+
+
+def _decode_column(values: Column, field: StructField) -> Column:
+    """Decode field from a wal2json values map, failing on any lost value.
+
+    A non-NULL source value that decodes to NULL would otherwise be MERGEd
+    over the good value in BigQuery, so it fails the Spark job instead.
+    """
+    value = values[field.name]
+    decoded = _decode_value(value, field.dataType)
+    lost = F.raise_error(
+        F.concat(
+            F.lit(
+                f"CDC value of column {field.name} does not decode as "
+                f"{field.dataType.simpleString()}: "
+            ),
+            F.substring(value, 1, 100),
+        )
+    )
+    return (
+        F.when(value.isNotNull() & decoded.isNull(), lost)
+        .otherwise(decoded)
+        .alias(field.name)
+    )
+
+
+def _quote_literal(value: str) -> str:
+    """Render a string as a Postgres literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def padded_lsn(column: str) -> str:
+    """SQL rendering a pg_lsn as zero-padded text ("0000000A/0016B374").
+
+    Padded LSNs sort as strings in LSN order, so MAX(watermark_value) and
+    MAX(_cdc_lsn) pick the latest position. Postgres parses them back with a
+    plain ::pg_lsn cast.
+    """
+    return (
+        f"lpad(split_part({column}::text, '/', 1), 8, '0') || '/' || "
+        f"lpad(split_part({column}::text, '/', 2), 8, '0')"
+    )
+
+
+def slot_lsn_sql(slot: str) -> str:
+    """SQL returning the slot's confirmed position (no rows if it is missing)."""
+    return (
+        f"SELECT {padded_lsn('confirmed_flush_lsn')} AS lsn "
+        f"FROM pg_replication_slots WHERE slot_name = {_quote_literal(slot)}"
+    )
+
+
+def create_slot_sql(slot: str) -> str:
+    """SQL creating a wal2json logical slot and returning its start LSN."""
+    return (
+        f"SELECT {padded_lsn('lsn')} AS lsn FROM "
+        f"pg_create_logical_replication_slot({_quote_literal(slot)}, "
+        f"'{_OUTPUT_PLUGIN}')"
+    )
+
+
+def advance_slot_sql(slot: str, lsn: str) -> str:
+    """SQL advancing the slot to lsn; a no-op if it is already there or past it.
+
+    pg_replication_slot_advance errors when asked to move backwards, so the
+    call is guarded on the slot's current position.
+    """
+    target = f"{_quote_literal(lsn)}::pg_lsn"
+    return (
+        f"SELECT {padded_lsn('a.end_lsn')} AS lsn FROM pg_replication_slots AS s, "
+        f"LATERAL pg_replication_slot_advance(s.slot_name, {target}) AS a "
+        f"WHERE s.slot_name = {_quote_literal(slot)} "
+        f"AND s.confirmed_flush_lsn < {target}"
+    )
+
+
+def replica_identity_sql(source_table: str) -> str:
+    """SQL returning the table's replica identity and whether it can TOAST.
+
+    Returns one row: identity ("d", "n", "f" or "i") and toastable (true if
+    any live column is stored out of line when large).
+    """
+    return (
+        "SELECT c.relreplident::text AS identity, EXISTS ("
+        "SELECT 1 FROM pg_attribute AS a WHERE a.attrelid = c.oid "
+        "AND a.attnum > 0 AND NOT a.attisdropped AND a.attstorage <> 'p'"
+        ") AS toastable FROM pg_class AS c "
+        f"WHERE c.oid = {_quote_literal(source_table)}::regclass"
+    )
+
+
+def _peek_sql(slot: str, source_table: str, max_changes: int | None) -> str:
+    """SQL peeking wal2json records tagged with their transaction's commit LSN.
+
+    Records of a transaction whose commit record is not in the batch get a
+    NULL commit_lsn.
+    """
+    upto = "NULL" if max_changes is None else str(max_changes)
+    return (
+        "SELECT c.seq, c.data, c.data::jsonb ->> 'action' AS action, "
+        f"max({padded_lsn('c.lsn')}) FILTER ("
+        "WHERE c.data::jsonb ->> 'action' = 'C'"
+        ") OVER (PARTITION BY c.xid) AS commit_lsn "
+        f"FROM pg_logical_slot_peek_changes({_quote_literal(slot)}, NULL, {upto}, "
+        "'format-version', '2', "
+        "'include-transaction', 'true', "
+        f"'add-tables', {_quote_literal(source_table)}"
+        ") WITH ORDINALITY AS c(lsn, xid, data, seq)"
+    )
+
+
+def changes_sql(slot: str, source_table: str, max_changes: int | None) -> str:
+    """SQL peeking the committed wal2json changes of one table.
+
+    The slot decides where the batch starts: it resumes after the last commit
+    it was advanced to.
+
+    Args:
+        slot: Replication slot name.
+        source_table: schema.table to decode changes for.
+        max_changes: Stop decoding after about this many records (the current
+            transaction is finished first; BEGIN/COMMIT records count too);
+            None reads everything pending.
+
+    Returns:
+        A query with columns _cdc_lsn (padded commit LSN of the change's
+        transaction), _cdc_seq (decoding order), and _cdc_data (the wal2json
+        record), for inserts, updates, and deletes of committed transactions.
+    """
+    return (
+        f"SELECT t.commit_lsn AS {CDC_LSN_COLUMN}, "
+        "t.seq AS _cdc_seq, t.data AS _cdc_data "
+        f"FROM ({_peek_sql(slot, source_table, max_changes)}) AS t "
+        "WHERE t.commit_lsn IS NOT NULL AND t.action IN ('I', 'U', 'D')"
+    )
+
+
+def batch_summary_sql(slot: str, source_table: str, max_changes: int | None) -> str:
+    """SQL summarising the batch changes_sql would return.
+
+    Returns one row: commit_lsn (padded commit LSN of the batch's last
+    transaction, NULL if nothing is pending) and changes (the table's
+    committed inserts, updates, and deletes in the batch).
+    """
+    return (
+        "SELECT max(t.commit_lsn) AS commit_lsn, "
+        "count(*) FILTER (WHERE t.commit_lsn IS NOT NULL "
+        "AND t.action IN ('I', 'U', 'D')) AS changes "
+        f"FROM ({_peek_sql(slot, source_table, max_changes)}) AS t"
+    )
+
+
+def changes_to_rows(
+    changes: DataFrame, schema: StructType, merge_keys: list[str]
+) -> DataFrame:
+    """Decode wal2json records into one upsert or delete row per merge key.
+
+    Args:
+        changes: Rows from changes_sql.
+        schema: Spark schema of the source table (column types to cast to).
+        merge_keys: Key columns; the last change per key wins.
+
+    Returns:
+        A DataFrame with the table's columns plus _cdc_op and _cdc_lsn.
+        Delete rows carry only the key columns (the rest are NULL) unless the
+        table has REPLICA IDENTITY FULL. Upsert columns missing from an
+        UPDATE record (unchanged TOASTed values) are taken from its old row.
+        The Spark job fails if a non-NULL value cannot be decoded to its
+        column's type.
+    """
+    record = F.from_json(F.col("_cdc_data"), _WAL2JSON_SCHEMA)
+    decoded = (
+        changes.select(CDC_LSN_COLUMN, "_cdc_seq", record.alias("_r"))
+        .filter(F.col("_r.action").isin("I", "U", "D"))
+        .select(
+            CDC_LSN_COLUMN,
+            "_cdc_seq",
+            F.col("_r.action").alias("_action"),
+            F.map_from_entries(F.col("_r.columns")).alias("_new"),
+            F.map_from_entries(F.col("_r.identity")).alias("_old"),
+        )
+    )
+    # wal2json leaves unchanged TOASTed values out of an UPDATE's "columns";
+    # with REPLICA IDENTITY FULL the old row in "identity" still has them.
+    unchanged = F.map_filter(
+        "_old", lambda k, _: ~F.array_contains(F.map_keys("_new"), k)
+    )
+    decoded = decoded.withColumn(
+        "_new",
+        F.when(F.col("_old").isNull(), F.col("_new")).otherwise(
+            F.map_concat(unchanged, F.col("_new"))
+        ),
+    )
+
+    def _keys(values: str):
+        return F.array(*[F.col(values)[k] for k in merge_keys])
+
+    def _event(op: str, values: str, order: int):
+        return F.struct(
+            F.lit(op).alias("op"),
+            F.col(values).alias("values"),
+            F.lit(order).alias("order"),
+        )
+
+    # An UPDATE carries the old key in "identity" when the key changed.
+    key_changed = (
+        (F.col("_action") == "U")
+        & F.col("_old").isNotNull()
+        & (_keys("_old") != _keys("_new"))
+    )
+    events = (
+        F.when(F.col("_action") == "D", F.array(_event("delete", "_old", 0)))
+        .when(
+            key_changed,
+            F.array(_event("delete", "_old", 0), _event("upsert", "_new", 1)),
+        )
+        .otherwise(F.array(_event("upsert", "_new", 1)))
+    )
+    rows = decoded.select(
+        CDC_LSN_COLUMN, "_cdc_seq", F.explode(events).alias("_e")
+    ).select(
+        *[_decode_column(F.col("_e.values"), field) for field in schema.fields],
+        F.col("_e.op").alias(CDC_OP_COLUMN),
+        CDC_LSN_COLUMN,
+        "_cdc_seq",
+        F.col("_e.order").alias("_cdc_order"),
+    )
+
+    latest = Window.partitionBy(*merge_keys).orderBy(
+        F.col(CDC_LSN_COLUMN).desc(),
+        F.col("_cdc_seq").desc(),
+        F.col("_cdc_order").desc(),
+    )
+    return (
+        rows.withColumn("_cdc_rank", F.row_number().over(latest))
+        .filter(F.col("_cdc_rank") == 1)
+        .drop("_cdc_rank", "_cdc_seq", "_cdc_order")
+    )
+
+
+class PostgresCdcExtractor(PostgresExtractor):
+    """Extract upserts and deletes from a Postgres logical replication slot."""
+
+    def extract(self, spark: SparkSession, config: PipelineConfig) -> DataFrame:
+        """Extract the table's changes since the last applied LSN.
+
+        Args:
+            spark: Active SparkSession.
+            config: Pipeline configuration (extraction_mode=cdc).
+
+        Returns:
+            DataFrame with the table's columns plus _cdc_op and _cdc_lsn.
+        """
+        if not config.merge_keys:
+            raise ValueError("etl_mode=CDC requires upsert_key to be set.")
+        base_options = {
+            "url": resolve_secret(config.jdbc_url_secret),
+            "driver": _JDBC_DRIVER,
+            "fetchsize": str(config.fetch_size),
+        }
+        slot = config.cdc_slot
+        self._check_replica_identity(spark, base_options, config.source_table)
+
+        last_lsn = self._read_watermark(config)
+        if last_lsn is None:
+            start_lsn = self._ensure_slot(spark, base_options, slot)
+            logger.info(
+                "CDC first run: slot=%s start_lsn=%s -- taking a full snapshot of %s.",
+                slot,
+                start_lsn,
+                config.source_table,
+            )
+            snapshot = super().extract(spark, config)
+            return snapshot.withColumn(CDC_OP_COLUMN, F.lit("upsert")).withColumn(
+                CDC_LSN_COLUMN, F.lit(start_lsn)
+            )
+
+        self._advance_slot(spark, base_options, slot, last_lsn)
+        self._skip_foreign_batches(spark, base_options, config)
+        logger.info(
+            "CDC extraction: slot=%s table=%s after_lsn=%s max_changes=%s",
+            slot,
+            config.source_table,
+            last_lsn,
+            config.cdc_max_changes or "all",
+        )
+        sql = changes_sql(slot, config.source_table, config.cdc_max_changes)
+        changes = (
+            spark.read.format("jdbc")
+            .options(**base_options, dbtable=f"({sql}) AS _cdc")
+            .load()
+        )
+        schema = self._table_schema(spark, base_options, config.source_table)
+        return changes_to_rows(changes, schema, config.merge_keys)
+
+    def _check_replica_identity(
+        self, spark: SparkSession, base_options: dict, source_table: str
+    ) -> None:
+        """Refuse tables whose UPDATEs could drop unchanged TOASTed values.
+
+        Raises:
+            RuntimeError: If the table has TOAST-able columns and its replica
+                identity is not FULL.
+        """
+        row = self._probe(spark, base_options, replica_identity_sql(source_table))[0]
+        if row["toastable"] and row["identity"] != "f":
+            raise RuntimeError(
+                f"etl_mode=CDC on {source_table} needs REPLICA IDENTITY FULL: it "
+                "has TOAST-able columns, whose unchanged values wal2json leaves "
+                "out of UPDATE records. Run: ALTER TABLE "
+                f"{source_table} REPLICA IDENTITY FULL"
+            )
+
+    def _skip_foreign_batches(
+        self, spark: SparkSession, base_options: dict, config: PipelineConfig
+    ) -> None:
+        """Advance the slot past batches that hold none of the table's changes.
+
+        The watermark only moves when a change of the table is applied, so
+        without this a quiet table in a busy database would never move its
+        slot: the WAL behind it would grow without bound and be decoded again
+        by every run. A batch of other tables' transactions alone is therefore
+        released at its last commit LSN, and the slot's confirmed position is
+        the resume point until the table changes again.
+
+        Uncapped batches hold everything pending, so one pass suffices.
+        Capped batches are skipped until one holds table changes: every
+        transaction's BEGIN/COMMIT records count towards cdc_max_changes, so
+        otherwise every later run would peek the same full batch.
+        """
+        slot = config.cdc_slot
+        sql = batch_summary_sql(slot, config.source_table, config.cdc_max_changes)
+        while True:
+            batch = self._probe(spark, base_options, sql)[0]
+            if batch["commit_lsn"] is None or batch["changes"]:
+                return
+            logger.info(
+                "CDC: no %s changes up to %s; advancing slot %s past them.",
+                config.source_table,
+                batch["commit_lsn"],
+                slot,
+            )
+            self._probe(
+                spark, base_options, advance_slot_sql(slot, batch["commit_lsn"])
+            )
+            if config.cdc_max_changes is None:
+                return
+
+    def _ensure_slot(self, spark: SparkSession, base_options: dict, slot: str) -> str:
+        """Return the slot's confirmed LSN, creating the slot if it is missing."""
+        rows = self._probe(spark, base_options, slot_lsn_sql(slot))
+        if rows:
+            return rows[0]["lsn"]
+        logger.info("Creating logical replication slot %s (%s)", slot, _OUTPUT_PLUGIN)
+        return self._probe(spark, base_options, create_slot_sql(slot))[0]["lsn"]
+
+    def _advance_slot(
+        self, spark: SparkSession, base_options: dict, slot: str, lsn: str
+    ) -> None:
+        """Release WAL up to the last LSN applied to BigQuery.
+
+        Raises:
+            RuntimeError: If the slot does not exist (it was dropped, so the
+                changes since the last run are lost; reload the table).
+        """
+        if not self._probe(spark, base_options, slot_lsn_sql(slot)):
+            raise RuntimeError(
+                f"Replication slot '{slot}' does not exist. Changes since LSN "
+                f"{lsn} are lost; delete the table's `_watermarks` row to "
+                "re-snapshot it."
+            )
+        self._probe(spark, base_options, advance_slot_sql(slot, lsn))
+
+    def _table_schema(
+        self, spark: SparkSession, base_options: dict, source_table: str
+    ) -> StructType:
+        """Resolve the source table's Spark schema without reading rows."""
+        return (
+            spark.read.format("jdbc")
+            .options(
+                **base_options, dbtable=f"(SELECT * FROM {source_table} LIMIT 0) AS _s"
+            )
+            .load()
+            .schema
+        )
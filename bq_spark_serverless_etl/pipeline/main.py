@@ -70,7 +70,7 @@ import sys
 
 from pyspark.sql import SparkSession
 
-from pipeline.config import load_config
+from pipeline.config import PipelineConfig, load_config
 from pipeline.registry import get_extractor, get_writer
 
 logging.basicConfig(
@@ -127,14 +127,26 @@ def run(
         source_group=source_group,
     )
 
-    extractor = get_extractor(config.source_type)
+    run_config(spark, config)
+
+    logger.info("Pipeline run completed: %s run_id=%s", run_label, run_id or "unset")
+
+
+def run_config(spark: SparkSession, config: PipelineConfig) -> None:
+    """Extract one table and write it to BigQuery.
+
+    Shared by run() and the multi-table batch runner (pipeline/batch.py).
+
+    Args:
+        spark: Active SparkSession.
+        config: Validated configuration for the table.
+    """
+    extractor = get_extractor(config.source_type, config.extraction_mode)
     writer = get_writer()  # always BigQuery for now
 
     df = extractor.extract(spark, config)
     writer.write(df, config)
 
-    logger.info("Pipeline run completed: %s run_id=%s", run_label, run_id or "unset")
-
 
 def _parse_cli_args(argv: list[str]) -> argparse.Namespace:
     """Parse command-line arguments for Dataproc Serverless submission."""
@@ -2,7 +2,8 @@
 
 Adding a new source type:
 1. Create pipeline/extractors/<name>.py subclassing BaseExtractor.
-2. Import it here and add an entry to EXTRACTOR_REGISTRY.
+2. Import it here and add an entry to EXTRACTOR_REGISTRY (and to
+   CDC_EXTRACTOR_REGISTRY if the source supports etl_mode: CDC).
 3. Add the source type string to SourceType in pipeline/config.py.
 
 Adding a new target type:
@@ -13,6 +14,7 @@ Adding a new target type:
 from pipeline.config import SourceType
 from pipeline.extractors.base import BaseExtractor
 from pipeline.extractors.postgres import PostgresExtractor
+from pipeline.extractors.postgres_cdc import PostgresCdcExtractor
 from pipeline.writers.base import BaseWriter
 from pipeline.writers.bigquery import BigQueryWriter
 
@@ -29,6 +31,13 @@ EXTRACTOR_REGISTRY: dict[SourceType, type[BaseExtractor]] = {
     # SourceType.COCKROACHDB: CockroachDBExtractor,  # future
 }
 
+# Extractors for extraction_mode="cdc" (etl_mode: CDC), which read change
+# streams instead of querying the table.
+
+CDC_EXTRACTOR_REGISTRY: dict[SourceType, type[BaseExtractor]] = {
+    SourceType.POSTGRES: PostgresCdcExtractor,
+}
+
 # ---------------------------------------------------------------------------
 # Writer registry
 # ---------------------------------------------------------------------------
@@ -41,23 +50,31 @@ WRITER_REGISTRY: dict[str, type[BaseWriter]] = {
 _DEFAULT_WRITER = "bigquery"
 
 
-def get_extractor(source_type: SourceType) -> BaseExtractor:
+def get_extractor(
+    source_type: SourceType, extraction_mode: str = "full"
+) -> BaseExtractor:
     """Instantiate the extractor for the given source type.
 
     Args:
         source_type: SourceType enum value from the pipeline config.
+        extraction_mode: Extraction mode from the pipeline config; "cdc"
+            selects from CDC_EXTRACTOR_REGISTRY.
 
     Returns:
         Instantiated extractor.
 
     Raises:
-        KeyError: If source_type is not registered.
+        KeyError: If source_type is not registered for the extraction mode.
     """
-    cls = EXTRACTOR_REGISTRY.get(source_type)
+    registry = (
+        CDC_EXTRACTOR_REGISTRY if extraction_mode == "cdc" else EXTRACTOR_REGISTRY
+    )
+    cls = registry.get(source_type)
     if cls is None:
-        registered = [s.value for s in EXTRACTOR_REGISTRY]
+        registered = [s.value for s in registry]
+        kind = "CDC extractor" if extraction_mode == "cdc" else "extractor"
         raise KeyError(
-            f"No extractor registered for source type '{source_type.value}'. "
+            f"No {kind} registered for source type '{source_type.value}'. "
             f"Registered types: {registered}"
         )
     return cls()
@@ -8,33 +8,317 @@ Supports three write modes:
              merge key matches an incoming row are updated; non-matching
              incoming rows are inserted. Implemented via a BQ MERGE DML
              statement executed after staging the incoming data to a
-             temporary table.
-
-Write method: indirect (GCS staging + BQ load job)
-  All writes use writeMethod=indirect, which stages data as Avro/Parquet in
-  a temporary GCS location (config.gcs_bucket) before issuing a BQ load job.
-  This is significantly cheaper than writeMethod=direct (Storage Write API)
-  for batch workloads because BQ load jobs are free -- only GCS storage cost.
+             temporary table. With merge_strategy=pruned the MERGE only
+             scans the target partitions the batch touches, and large
+             batches rewrite those partitions (table$YYYYMMDD) instead.
+
+Write method (config.write_method)
+  indirect (default) stages data as Avro/Parquet in a temporary GCS location
+  (config.gcs_bucket) before issuing a BQ load job. This is significantly
+  cheaper than writeMethod=direct (Storage Write API) for batch workloads
+  because BQ load jobs are free -- only GCS storage cost.
+  direct streams rows through the Storage Write API: no GCS round-trip or
+  load-job queueing, which dominate latency for small batches.
+  auto picks direct when the batch is estimated at or below direct_max_rows
+  and direct_max_bytes, indirect otherwise. The estimate is the exact scan
+  metrics under scan_mode=persist, otherwise the previous run's metrics.
+  Each run records the method used and its write latency in `_run_metrics`.
 
 Partitioning and clustering are applied on first write (table creation).
 On subsequent writes BigQuery preserves the existing configuration.
 
+Single-pass scan (config.scan_mode)
+  The JDBC source is read exactly once per run. Row count, estimated bytes,
+  and the new max watermark are computed in that same pass -- either as
+  observed metrics of the write job itself (observe) or while materialising a
+  persisted copy that the write then reads (persist). Those values feed the
+  watermark write-back and are recorded in the `_run_metrics` table.
+
 Reference:
   https://cloud.google.com/dataproc/docs/guides/bigquery-connector-spark-example
 """
 
 import logging
-from datetime import datetime, timezone
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from datetime import date, datetime, timedelta, timezone
 
 from google.api_core.exceptions import NotFound
 from google.cloud import bigquery as _bq
-from pyspark.sql import DataFrame, DataFrameWriter
-
-from pipeline.config import PipelineConfig
+from pyspark import StorageLevel
+from pyspark.sql import Column, DataFrame, DataFrameWriter, Observation
+from pyspark.sql import functions as F
+from pyspark.sql.types import (
+    BinaryType,
+    BooleanType,
+    ByteType,
+    DateType,
+    FloatType,
+    IntegerType,
+    ShortType,
+    StringType,
+    StructType,
+)
+
+from pipeline.config import CDC_LSN_COLUMN, CDC_OP_COLUMN, PipelineConfig
 from pipeline.writers.base import BaseWriter
 
 logger = logging.getLogger(__name__)
 
+#: Extraction modes whose batch maximum of watermark_column is written back to
+#: `_watermarks` (for cdc the watermark column is the change LSN).
+_WATERMARKED_MODES = ("incremental", "cdc")
+
+#: Serialises watermark MERGEs from concurrent table jobs in one process (see
+#: pipeline/batch.py). Tables of one database share a `_watermarks` table, and
+#: concurrent MERGEs on it can abort with a serialization error.
+_WATERMARK_LOCK = threading.Lock()
+
+#: Seconds to wait, once the write has returned, for its Observation metrics.
+#: Observation.get blocks forever when no action visible to Spark's
+#: QueryExecutionListener ran the observed plan (e.g. a write path that
+#: bypasses it), so the wait is bounded and the run fails instead of hanging.
+_OBSERVATION_TIMEOUT_SECONDS = 60
+
+#: Column types whose size is measured per row with octet_length().
+_VARIABLE_WIDTH_TYPES = (StringType, BinaryType)
+
+#: Bytes per value of fixed-width types (Spark's DataType.defaultSize).
+#: Types not listed (decimal, nested) count as 8 bytes.
+_FIXED_WIDTHS = {
+    BooleanType: 1,
+    ByteType: 1,
+    ShortType: 2,
+    IntegerType: 4,
+    DateType: 4,
+    FloatType: 4,
+}
+
+
+def _fixed_row_bytes(schema: StructType) -> int:
+    """Return the bytes per row of the fixed-width columns of a schema.
+
+    String and binary columns are excluded; their actual lengths are summed
+    separately during the scan.
+    """
+    return sum(
+        _FIXED_WIDTHS.get(type(field.dataType), 8)
+        for field in schema.fields
+        if not isinstance(field.dataType, _VARIABLE_WIDTH_TYPES)
+    )
+
+
+def _scan_metric_exprs(df: DataFrame, config: PipelineConfig) -> list[Column]:
+    """Build the aggregate expressions computed in the single source pass.
+
+    Produces ``rows_read``, ``bytes_read`` (fixed-width bytes per row times the
+    row count, plus the UTF-8/binary length of every variable-width value), and
+    ``max_wm`` (the new watermark as a string, NULL when not incremental).
+    """
+    rows = F.count(F.lit(1))
+    bytes_read = rows * F.lit(_fixed_row_bytes(df.schema))
+    for field in df.schema.fields:
+        if isinstance(field.dataType, _VARIABLE_WIDTH_TYPES):
+            bytes_read = bytes_read + F.coalesce(
+                F.sum(F.octet_length(F.col(f"`{field.name}`"))), F.lit(0)
+            )
+    if config.extraction_mode in _WATERMARKED_MODES and config.watermark_column:
+        max_wm = F.max(F.col(f"`{config.watermark_column}`")).cast("string")
+    else:
+        max_wm = F.lit(None).cast("string")
+    return [
+        rows.alias("rows_read"),
+        bytes_read.alias("bytes_read"),
+        max_wm.alias("max_wm"),
+    ]
+
+
+def _observed_metrics(observation: Observation, timeout: float) -> dict:
+    """Return an Observation's metrics, failing if they do not arrive in time.
+
+    Observation.get has no timeout, so it is read on a daemon thread that is
+    abandoned if it is still blocked after timeout seconds.
+
+    Args:
+        observation: Observation attached to the DataFrame that was written.
+        timeout: Seconds to wait for the metrics.
+
+    Returns:
+        The observed metrics.
+
+    Raises:
+        RuntimeError: If the write did not fulfil the observation in time.
+    """
+    result: dict = {}
+
+    def _get() -> None:
+        try:
+            result["metrics"] = dict(observation.get)
+        except BaseException as exc:  # re-raised on the calling thread
+            result["error"] = exc
+
+    thread = threading.Thread(target=_get, name="observation-get", daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise RuntimeError(
+            f"The write did not report scan metrics within {timeout}s:"
+            " no listener-visible action ran the observed plan. The rows may"
+            " have been written, but the watermark was not advanced. Use"
+            " scan_mode: persist for this table."
+        )
+    if "error" in result:
+        raise result["error"]
+    return result["metrics"]
+
+
+def _choose_write_method(estimate: dict | None, config: PipelineConfig) -> str:
+    """Pick direct or indirect for write_method=auto from a size estimate.
+
+    Args:
+        estimate: Dict with rows_read and bytes_read (either may be None), or
+            None when no estimate is available.
+        config: Pipeline configuration (direct_max_rows, direct_max_bytes).
+
+    Returns:
+        "direct" when every known estimate is within its threshold, otherwise
+        "indirect" (also when nothing is known).
+    """
+    if estimate is None:
+        return "indirect"
+    rows, size = estimate.get("rows_read"), estimate.get("bytes_read")
+    if rows is None and size is None:
+        return "indirect"
+    if rows is not None and rows > config.direct_max_rows:
+        return "indirect"
+    if size is not None and size > config.direct_max_bytes:
+        return "indirect"
+    return "direct"
+
+
+def _merge_sql(
+    target_table: str,
+    staging_table: str,
+    columns: list[str],
+    merge_keys: list[str],
+    partition_predicate: str | None = None,
+    cdc: bool = False,
+) -> str:
+    """Build the MERGE statement applying the staging table to the target.
+
+    Args:
+        target_table: Fully-qualified target table.
+        staging_table: Fully-qualified staging table.
+        columns: Columns of the incoming batch (without CDC metadata).
+        merge_keys: Columns matched in the ON clause.
+        partition_predicate: Optional filter on the target (alias T) added to
+            the ON clause so BigQuery prunes untouched partitions.
+        cdc: The staging table carries a _cdc_op column: rows marked "delete"
+            delete their match and are never inserted.
+    """
+    on_clause = " AND ".join(f"T.`{k}` = S.`{k}`" for k in merge_keys)
+    if partition_predicate:
+        on_clause = f"{on_clause}\n            AND {partition_predicate}"
+    non_key_columns = [c for c in columns if c not in merge_keys]
+    update_clause = ", ".join(f"T.`{c}` = S.`{c}`" for c in non_key_columns)
+    insert_cols = ", ".join(f"`{c}`" for c in columns)
+    insert_vals = ", ".join(f"S.`{c}`" for c in columns)
+
+    # If every column is a merge key there is nothing to update; omit
+    # WHEN MATCHED entirely to avoid an empty UPDATE SET clause (invalid SQL).
+    matched_clause = (
+        f"WHEN MATCHED THEN\n                UPDATE SET {update_clause}\n            "
+        if non_key_columns
+        else ""
+    )
+    not_matched = "WHEN NOT MATCHED"
+    if cdc:
+        is_delete = f"S.`{CDC_OP_COLUMN}` = 'delete'"
+        matched_clause = (
+            f"WHEN MATCHED AND {is_delete} THEN\n                DELETE\n"
+            f"            {matched_clause}"
+        )
+        not_matched = f"WHEN NOT MATCHED AND NOT {is_delete}"
+
+    return f"""
+            MERGE `{target_table}` AS T
+            USING `{staging_table}` AS S
+            ON {on_clause}
+            {matched_clause}{not_matched} THEN
+                INSERT ({insert_cols})
+                VALUES ({insert_vals})
+        """
+
+
+def _literal_type(value: object) -> str:
+    """Return the BigQuery literal type for a partition_field value."""
+    if isinstance(value, datetime):
+        return "DATETIME" if value.tzinfo is None else "TIMESTAMP"
+    if isinstance(value, date):
+        return "DATE"
+    raise ValueError(
+        f"Cannot prune on partition value {value!r}: expected DATE, DATETIME,"
+        " or TIMESTAMP."
+    )
+
+
+def _day_range_predicate(
+    column: str,
+    literal_type: str | None,
+    first_day: date | None,
+    last_day: date | None,
+    include_nulls: bool = False,
+) -> str:
+    """Build a partition-pruning filter covering whole days first..last.
+
+    Compares the partition column itself against constant literals (rather
+    than wrapping it in DATE()), which BigQuery can always prune on.
+    """
+    if literal_type is None:
+        return f"{column} IS NULL"
+    if literal_type == "DATE":
+        predicate = f"{column} BETWEEN DATE '{first_day}' AND DATE '{last_day}'"
+    else:
+        predicate = (
+            f"{column} >= {literal_type} '{first_day}'"
+            f" AND {column} < {literal_type} '{last_day + timedelta(days=1)}'"
+        )
+    if include_nulls:
+        return f"({predicate} OR {column} IS NULL)"
+    return f"({predicate})"
+
+
+def _partition_overwrite_sql(
+    target_table: str,
+    staging_table: str,
+    columns: list[str],
+    merge_keys: list[str],
+    partition_field: str,
+    literal_type: str,
+    day: date,
+) -> str:
+    """Build the query whose result replaces one day partition of the target.
+
+    The staged rows for the day, plus the target rows of that day whose merge
+    key is not in the staging table.
+    """
+    select_cols = ", ".join(f"`{c}`" for c in columns)
+    target_day = _day_range_predicate(f"T.`{partition_field}`", literal_type, day, day)
+    staging_day = _day_range_predicate(f"S.`{partition_field}`", literal_type, day, day)
+    key_match = " AND ".join(f"S.`{k}` = T.`{k}`" for k in merge_keys)
+    return f"""
+            SELECT {select_cols} FROM `{staging_table}` AS S
+            WHERE {staging_day}
+            UNION ALL
+            SELECT {select_cols} FROM `{target_table}` AS T
+            WHERE {target_day}
+              AND NOT EXISTS (
+                  SELECT 1 FROM `{staging_table}` AS S WHERE {key_match}
+              )
+        """
+
 
 class BigQueryWriter(BaseWriter):
     """Write a Spark DataFrame to a BigQuery table."""
@@ -46,12 +330,48 @@ class BigQueryWriter(BaseWriter):
             df: DataFrame to write.
             config: Pipeline configuration.
         """
+        df, scan_metrics, release = self._single_pass(df, config)
+        try:
+            method = self._resolve_write_method(config, scan_metrics)
+            config = config.model_copy(update={"write_method": method})
+            logger.info(
+                "Writing to BigQuery: table=%s mode=%s method=%s scan_mode=%s",
+                config.full_table_id,
+                config.write_mode,
+                method,
+                config.scan_mode,
+            )
+            start = time.monotonic()
+            self._write(df, config)
+            write_seconds = round(time.monotonic() - start, 3)
+        finally:
+            release()
+
+        metrics = {
+            **scan_metrics(),
+            "write_method": method,
+            "write_seconds": write_seconds,
+        }
         logger.info(
-            "Writing to BigQuery: table=%s mode=%s method=indirect",
+            "Successfully wrote to BigQuery table: %s"
+            " (rows_read=%s bytes_read=%s method=%s write_seconds=%s)",
             config.full_table_id,
-            config.write_mode,
+            metrics["rows_read"],
+            metrics["bytes_read"],
+            method,
+            write_seconds,
         )
+        self._record_run_metrics(config, metrics)
+
+        # Write-back watermark for incremental pipelines so the next run
+        # only extracts rows newer than the current batch's maximum value.
+        # The value comes from the same pass as the write; df is not re-read.
+        # CDC pipelines store the batch's last LSN the same way.
+        if config.extraction_mode in _WATERMARKED_MODES:
+            self._update_watermark(config, metrics["max_wm"])
 
+    def _write(self, df: DataFrame, config: PipelineConfig) -> None:
+        """Dispatch to the write-mode implementation."""
         if config.write_mode == "overwrite":
             self._write_overwrite(df, config)
 
@@ -67,30 +387,205 @@ class BigQueryWriter(BaseWriter):
                 "Expected one of: overwrite, append, merge."
             )
 
-        logger.info("Successfully wrote to BigQuery table: %s", config.full_table_id)
+    # ------------------------------------------------------------------
+    # Write method selection
+    # ------------------------------------------------------------------
 
-        # Write-back watermark for incremental pipelines so the next run
-        # only extracts rows newer than the current batch's maximum value.
-        if config.extraction_mode == "incremental":
-            self._update_watermark(df, config)
+    def _resolve_write_method(
+        self, config: PipelineConfig, scan_metrics: Callable[[], dict]
+    ) -> str:
+        """Return the concrete write method (direct | indirect) for this run.
+
+        For write_method=auto the batch size is estimated from the persisted
+        scan (scan_mode=persist, exact) or else from the previous run of this
+        table recorded in `_run_metrics`. In observe mode the current scan's
+        metrics only exist once the write has run, so they cannot be used.
+        """
+        if config.write_method != "auto":
+            return config.write_method
+        if config.scan_mode == "persist":
+            estimate, basis = scan_metrics(), "persisted scan"
+        else:
+            estimate, basis = self._previous_run_metrics(config), "previous run"
+        method = _choose_write_method(estimate, config)
+        logger.info(
+            "write_method=auto chose %s (estimate from %s: rows=%s bytes=%s;"
+            " thresholds rows<=%s bytes<=%s)",
+            method,
+            basis,
+            (estimate or {}).get("rows_read"),
+            (estimate or {}).get("bytes_read"),
+            config.direct_max_rows,
+            config.direct_max_bytes,
+        )
+        return method
+
+    def _previous_run_metrics(self, config: PipelineConfig) -> dict | None:
+        """Return rows_read / bytes_read of this table's latest recorded run.
+
+        Returns None when there is no earlier run or the lookup fails.
+        """
+        metrics_table = f"{config.project}.{config.dataset}._run_metrics"
+        sql = f"""
+            SELECT rows_read, bytes_read
+            FROM `{metrics_table}`
+            WHERE source_name = '{config.source_name}'
+              AND db_name     = '{config.db_name}'
+              AND tbl_name    = '{config.tbl_name}'
+            ORDER BY run_ts DESC
+            LIMIT 1
+        """
+        try:
+            bq_client = _bq.Client(project=config.project)
+            rows = list(bq_client.query(sql).result())
+        except Exception:
+            logger.info(
+                "No previous run metrics for %s -- size unknown.",
+                config.full_table_id,
+                exc_info=True,
+            )
+            return None
+        return dict(rows[0].items()) if rows else None
+
+    # ------------------------------------------------------------------
+    # Single-pass scan
+    # ------------------------------------------------------------------
+
+    def _single_pass(
+        self, df: DataFrame, config: PipelineConfig
+    ) -> tuple[DataFrame, Callable[[], dict], Callable[[], None]]:
+        """Arrange for the source to be scanned once, metrics included.
+
+        observe: attaches an Observation to df, so the write job computes the
+            metrics as it streams rows; they are read after the write,
+            waiting at most _OBSERVATION_TIMEOUT_SECONDS for them.
+        persist: persists df at config.persist_storage_level and materialises
+            it with the metric aggregation; the write then reads the
+            persisted copy, and release() unpersists it.
+
+        Args:
+            df: DataFrame produced by the extractor.
+            config: Pipeline configuration.
+
+        Returns:
+            (DataFrame to write, callable returning the metrics dict with
+            rows_read / bytes_read / max_wm, callable releasing any cache).
+
+        Raises:
+            ValueError: If persist_storage_level is not a pyspark StorageLevel.
+            RuntimeError: From the metrics callable, if the write did not
+                fulfil the observation in time.
+        """
+        if config.scan_mode == "persist":
+            level = getattr(StorageLevel, config.persist_storage_level, None)
+            if not isinstance(level, StorageLevel):
+                raise ValueError(
+                    f"Unknown persist_storage_level '{config.persist_storage_level}'."
+                    " Expected a pyspark StorageLevel name, e.g. MEMORY_AND_DISK."
+                )
+
+        exprs = _scan_metric_exprs(df, config)
+
+        if config.scan_mode == "persist":
+            cached = df.persist(level)
+            metrics = cached.agg(*exprs).first().asDict()
+            logger.info(
+                "Persisted source at %s (%s rows)",
+                config.persist_storage_level,
+                metrics["rows_read"],
+            )
+            return cached, lambda: metrics, cached.unpersist
+
+        # Observation names are global to the Spark session: batch runs of the
+        # same table name in different databases must not collide.
+        observation = Observation(f"scan_{config.full_table_id}_{uuid.uuid4().hex}")
+        observed = df.observe(observation, *exprs)
+        return (
+            observed,
+            lambda: _observed_metrics(observation, _OBSERVATION_TIMEOUT_SECONDS),
+            lambda: None,
+        )
+
+    def _record_run_metrics(self, config: PipelineConfig, metrics: dict) -> None:
+        """Append this run's scan metrics to the `_run_metrics` table.
+
+        The table has schema:
+            source_name     STRING NOT NULL,
+            db_name         STRING NOT NULL,
+            tbl_name        STRING NOT NULL,
+            run_ts          TIMESTAMP NOT NULL,
+            scan_mode       STRING NOT NULL,
+            rows_read       INT64,
+            bytes_read      INT64,
+            watermark_value STRING,
+            write_method    STRING,
+            write_seconds   FLOAT64
+
+        Args:
+            config: Pipeline configuration.
+            metrics: Scan metrics from _single_pass.
+        """
+        metrics_table = f"{config.project}.{config.dataset}._run_metrics"
+        now_ts = datetime.now(timezone.utc).isoformat()
+        watermark = metrics.get("max_wm")
+        watermark_sql = "NULL" if watermark is None else f"'{watermark}'"
+
+        create_sql = f"""
+            CREATE TABLE IF NOT EXISTS `{metrics_table}` (
+                source_name     STRING NOT NULL,
+                db_name         STRING NOT NULL,
+                tbl_name        STRING NOT NULL,
+                run_ts          TIMESTAMP NOT NULL,
+                scan_mode       STRING NOT NULL,
+                rows_read       INT64,
+                bytes_read      INT64,
+                watermark_value STRING,
+                write_method    STRING,
+                write_seconds   FLOAT64
+            )
+        """
+
+        # Tables created before write latency was recorded lack the columns.
+        alter_sql = f"""
+            ALTER TABLE `{metrics_table}`
+                ADD COLUMN IF NOT EXISTS write_method  STRING,
+                ADD COLUMN IF NOT EXISTS write_seconds FLOAT64
+        """
+
+        insert_sql = f"""
+            INSERT INTO `{metrics_table}`
+                (source_name, db_name, tbl_name, run_ts, scan_mode,
+                 rows_read, bytes_read, watermark_value, write_method, write_seconds)
+            VALUES
+                ('{config.source_name}', '{config.db_name}', '{config.tbl_name}',
+                 TIMESTAMP '{now_ts}', '{config.scan_mode}',
+                 {int(metrics["rows_read"])}, {int(metrics["bytes_read"])},
+                 {watermark_sql}, '{metrics["write_method"]}',
+                 {float(metrics["write_seconds"])})
+        """
+
+        try:
+            bq_client = _bq.Client(project=config.project)
+            bq_client.query(create_sql).result()
+            bq_client.query(alter_sql).result()
+            bq_client.query(insert_sql).result()
+        except Exception:
+            # Metrics are observability only and must not fail the run.
+            logger.error("Failed to record run metrics.", exc_info=True)
 
     # ------------------------------------------------------------------
     # Write mode implementations
     # ------------------------------------------------------------------
 
     def _base_writer(self, df: DataFrame, config: PipelineConfig) -> DataFrameWriter:
-        """Build a DataFrameWriter with shared indirect-write options applied.
+        """Build a DataFrameWriter with shared write options applied.
 
-        Uses writeMethod=indirect: Spark stages data to GCS as Avro/Parquet,
+        With writeMethod=indirect, Spark stages data to GCS as Avro/Parquet,
         then BigQuery issues a load job to ingest it. Load jobs are free,
-        making this the preferred method for batch ETL.
+        making this the preferred method for batch ETL. With writeMethod=direct
+        rows go through the Storage Write API (see _method_writer).
         """
-        writer = (
-            df.write.format("bigquery")
-            .option("writeMethod", "indirect")
-            .option("temporaryGcsBucket", config.gcs_bucket)
-            .option("table", config.full_table_id)
-        )
+        writer = self._method_writer(df, config).option("table", config.full_table_id)
         if config.partition_field:
             writer = writer.option("partitionField", config.partition_field)
             logger.info("BQ partitioning on: %s", config.partition_field)
@@ -101,6 +596,13 @@ class BigQueryWriter(BaseWriter):
             logger.info("BQ clustering on: %s", config.clustering_fields)
         return writer
 
+    def _method_writer(self, df: DataFrame, config: PipelineConfig) -> DataFrameWriter:
+        """Return df.write for BigQuery with the resolved write method applied."""
+        writer = df.write.format("bigquery").option("writeMethod", config.write_method)
+        if config.write_method == "indirect":
+            writer = writer.option("temporaryGcsBucket", config.gcs_bucket)
+        return writer
+
     def _write_overwrite(self, df: DataFrame, config: PipelineConfig) -> None:
         self._base_writer(df, config).mode("overwrite").save()
 
@@ -115,24 +617,35 @@ class BigQueryWriter(BaseWriter):
 
         On subsequent runs:
         1. Write the incoming DataFrame to a short-lived staging table
-           (overwrite, same dataset as target) using indirect write.
-        2. Execute a MERGE statement that updates matching rows and
-           inserts new ones based on merge_keys.
+           (overwrite, same dataset as target) with the run's write method.
+        2. Apply the staged rows to the target (see config.merge_strategy):
+           - full:   MERGE on merge_keys against the whole target.
+           - pruned: MERGE with the batch's partition_field day range added to
+             the ON clause, so only the touched partitions are scanned. When
+             the batch has at least merge_overwrite_min_rows rows, each
+             touched partition is rewritten instead (_overwrite_partitions).
         3. Drop the staging table.
 
         Args:
             df: Incoming DataFrame.
             config: Pipeline configuration.
         """
+        # CDC batches (etl_mode: CDC) carry _cdc_op / _cdc_lsn, which steer
+        # the MERGE but are not target columns.
+        cdc = CDC_OP_COLUMN in df.columns
+        columns = [c for c in df.columns if c not in (CDC_OP_COLUMN, CDC_LSN_COLUMN)]
+
         bq_client = _bq.Client(project=config.project)
         try:
-            bq_client.get_table(config.full_table_id)
+            target = bq_client.get_table(config.full_table_id)
         except NotFound:
             logger.info(
                 "Target table %s does not exist -- falling back to overwrite"
                 " for initial load.",
                 config.full_table_id,
             )
+            if cdc:
+                df = df.filter(F.col(CDC_OP_COLUMN) != "delete").select(*columns)
             self._write_overwrite(df, config)
             return
 
@@ -147,59 +660,157 @@ class BigQueryWriter(BaseWriter):
             config.full_table_id,
         )
 
-        # Step 1: write incoming data to staging table using indirect write.
+        # Step 1: write incoming data to staging table.
         # Intentionally does not reuse _base_writer — the staging table
         # must not inherit partitioning or clustering from the target.
         (
-            df.write.format("bigquery")
-            .option("writeMethod", "indirect")
-            .option("temporaryGcsBucket", config.gcs_bucket)
+            self._method_writer(df, config)
             .option("table", staging_table)
             .mode("overwrite")
             .save()
         )
 
-        # Step 2: build and execute MERGE DML
-        merge_keys = config.merge_keys
-        columns = df.columns
-
-        on_clause = " AND ".join(f"T.`{k}` = S.`{k}`" for k in merge_keys)
-        non_key_columns = [c for c in columns if c not in merge_keys]
-        update_clause = ", ".join(f"T.`{c}` = S.`{c}`" for c in non_key_columns)
-        insert_cols = ", ".join(f"`{c}`" for c in columns)
-        insert_vals = ", ".join(f"S.`{c}`" for c in columns)
-
-        # If every column is a merge key there is nothing to update; omit
-        # WHEN MATCHED entirely to avoid an empty UPDATE SET clause (invalid SQL).
-        matched_clause = (
-            "WHEN MATCHED THEN\n"
-            f"                UPDATE SET {update_clause}\n            "
-            if non_key_columns
-            else ""
-        )
-
-        merge_sql = f"""
-            MERGE `{config.full_table_id}` AS T
-            USING `{staging_table}` AS S
-            ON {on_clause}
-            {matched_clause}WHEN NOT MATCHED THEN
-                INSERT ({insert_cols})
-                VALUES ({insert_vals})
+        try:
+            # Step 2: apply the staged rows to the target.
+            pruning = None
+            if config.merge_strategy == "pruned" and cdc:
+                # Deletes carry only key columns, so their partition is unknown.
+                logger.info(
+                    "merge_strategy=pruned does not apply to CDC batches --"
+                    " running an unpruned MERGE for %s.",
+                    config.full_table_id,
+                )
+            elif config.merge_strategy == "pruned" and not config.partition_field:
+                logger.warning(
+                    "merge_strategy=pruned needs partition_keys -- running an"
+                    " unpruned MERGE for %s.",
+                    config.full_table_id,
+                )
+            elif config.merge_strategy == "pruned":
+                stats = self._staging_partition_stats(bq_client, staging_table, config)
+                if stats["row_count"] == 0:
+                    logger.info("Merge: empty batch -- nothing to apply.")
+                    return
+                if (
+                    config.merge_overwrite_min_rows is not None
+                    and stats["row_count"] >= config.merge_overwrite_min_rows
+                    and stats["null_count"] == 0
+                ):
+                    self._overwrite_partitions(
+                        bq_client,
+                        staging_table,
+                        [field.name for field in target.schema],
+                        stats,
+                        config,
+                    )
+                    return
+                days = stats["days"]
+                pruning = _day_range_predicate(
+                    f"T.`{config.partition_field}`",
+                    stats["literal_type"],
+                    days[0] if days else None,
+                    days[-1] if days else None,
+                    include_nulls=stats["null_count"] > 0,
+                )
+
+            merge_sql = _merge_sql(
+                config.full_table_id,
+                staging_table,
+                columns,
+                config.merge_keys,
+                pruning,
+                cdc=cdc,
+            )
+            logger.info(
+                "Executing MERGE DML for table: %s (partition filter: %s)",
+                config.full_table_id,
+                pruning or "none",
+            )
+            bq_client.query(merge_sql).result()
+        finally:
+            # Step 3: clean up staging table
+            drop_sql = f"DROP TABLE IF EXISTS `{staging_table}`"
+            bq_client.query(drop_sql).result()
+            logger.info("Dropped staging table: %s", staging_table)
+
+    def _staging_partition_stats(
+        self, bq_client: _bq.Client, staging_table: str, config: PipelineConfig
+    ) -> dict:
+        """Summarise the staged batch's partition_field values.
+
+        Returns:
+            A dict with row_count, null_count, days (sorted partition dates,
+            NULL excluded), and literal_type (DATE, DATETIME or TIMESTAMP;
+            None when every value is NULL).
         """
-        logger.info("Executing MERGE DML for table: %s", config.full_table_id)
-
-        bq_client.query(merge_sql).result()
-
-        # Step 3: clean up staging table
-        drop_sql = f"DROP TABLE IF EXISTS `{staging_table}`"
-        bq_client.query(drop_sql).result()
-        logger.info("Dropped staging table: %s", staging_table)
+        column = f"`{config.partition_field}`"
+        stats_sql = f"""
+            SELECT
+                COUNT(*)                  AS row_count,
+                COUNTIF({column} IS NULL) AS null_count,
+                MIN({column})             AS min_value,
+                ARRAY_AGG(DISTINCT DATE({column}) IGNORE NULLS
+                          ORDER BY DATE({column})) AS days
+            FROM `{staging_table}`
+        """
+        row = next(iter(bq_client.query(stats_sql).result()))
+        min_value = row["min_value"]
+        return {
+            "row_count": row["row_count"],
+            "null_count": row["null_count"],
+            "days": list(row["days"] or []),
+            "literal_type": None if min_value is None else _literal_type(min_value),
+        }
+
+    def _overwrite_partitions(
+        self,
+        bq_client: _bq.Client,
+        staging_table: str,
+        columns: list[str],
+        stats: dict,
+        config: PipelineConfig,
+    ) -> None:
+        """Rewrite every partition the batch touches via table$YYYYMMDD.
+
+        Each partition becomes its unmatched existing rows plus the staged
+        rows for that day, written by a WRITE_TRUNCATE query job whose
+        destination is the partition decorator. Each partition is replaced
+        atomically; the batch as a whole is not.
+        """
+        logger.info(
+            "Merge: %s rows across %s partition(s) >= merge_overwrite_min_rows=%s"
+            " -- overwriting partitions of %s",
+            stats["row_count"],
+            len(stats["days"]),
+            config.merge_overwrite_min_rows,
+            config.full_table_id,
+        )
+        for day in stats["days"]:
+            sql = _partition_overwrite_sql(
+                config.full_table_id,
+                staging_table,
+                columns,
+                config.merge_keys,
+                config.partition_field,
+                stats["literal_type"],
+                day,
+            )
+            job_config = _bq.QueryJobConfig(
+                destination=f"{config.full_table_id}${day:%Y%m%d}",
+                write_disposition=_bq.WriteDisposition.WRITE_TRUNCATE,
+            )
+            bq_client.query(sql, job_config=job_config).result()
+            logger.info(
+                "Overwrote partition %s$%s", config.full_table_id, f"{day:%Y%m%d}"
+            )
 
     # ------------------------------------------------------------------
     # Watermark management
     # ------------------------------------------------------------------
 
-    def _update_watermark(self, df: DataFrame, config: PipelineConfig) -> None:
+    def _update_watermark(
+        self, config: PipelineConfig, new_watermark: str | None
+    ) -> None:
         """Persist the new high-watermark value to BigQuery after a successful write.
 
         The watermark table has schema:
@@ -213,19 +824,16 @@ class BigQueryWriter(BaseWriter):
         identity tuple so the next run starts from the correct position.
 
         Args:
-            df: The DataFrame that was just written (used to compute MAX watermark).
             config: Pipeline configuration.
+            new_watermark: MAX(watermark_column) of the batch just written, as
+                computed in the single source pass (None if the batch was empty).
         """
         if not config.watermark_column:
             return
 
         watermark_table = f"{config.project}.{config.dataset}._watermarks"
 
-        max_row = df.selectExpr(
-            f"CAST(MAX(`{config.watermark_column}`) AS STRING) AS max_wm"
-        ).first()
-
-        if max_row is None or max_row["max_wm"] is None:
+        if new_watermark is None:
             logger.warning(
                 "Could not compute max watermark from column '%s'"
                 " -- skipping write-back.",
@@ -233,7 +841,6 @@ class BigQueryWriter(BaseWriter):
             )
             return
 
-        new_watermark = max_row["max_wm"]
         now_ts = datetime.now(timezone.utc).isoformat()
 
         logger.info(
@@ -281,8 +888,9 @@ class BigQueryWriter(BaseWriter):
 
         try:
             bq_client = _bq.Client(project=config.project)
-            bq_client.query(create_sql).result()
-            bq_client.query(merge_sql).result()
+            with _WATERMARK_LOCK:
+                bq_client.query(create_sql).result()
+                bq_client.query(merge_sql).result()
             logger.info("Watermark updated to: %s", new_watermark)
         except Exception:
             # A watermark write failure must not fail the overall pipeline run.
@@ -0,0 +1,182 @@
+"""Unit tests for pipeline.batch -- table selection, isolation, and reporting."""
+
+import threading
+
+import pytest
+
+from pipeline import batch
+from pipeline.batch import (
+    TableResult,
+    cluster_tables,
+    format_report,
+    parse_tables,
+    run_batch,
+)
+from pipeline.config import ClusterConfig
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+_CLUSTER = ClusterConfig.model_validate(
+    {
+        "source_name": "demo_cluster",
+        "source_type": "postgres",
+        "source_group": "demo",
+        "data_config": {
+            "thelook": {
+                "tables": {
+                    "users": {"etl_mode": "FULL_RELOAD"},
+                    "orders": {"etl_mode": "FULL_RELOAD"},
+                }
+            },
+            "billing": {"tables": {"invoices": {"etl_mode": "FULL_RELOAD"}}},
+        },
+    }
+)
+
+
+class _FakeConf:
+    def __init__(self, mode: str):
+        self._mode = mode
+
+    def get(self, key, default=None):
+        return self._mode if key == "spark.scheduler.mode" else default
+
+
+class _FakeSparkContext:
+    """Records the scheduler pool each thread had set when a table ran."""
+
+    def __init__(self, mode: str):
+        self._conf = _FakeConf(mode)
+        self._local = threading.local()
+
+    def getConf(self):
+        return self._conf
+
+    def setLocalProperty(self, key, value):
+        setattr(self._local, key, value)
+
+    def getLocalProperty(self, key):
+        return getattr(self._local, key, None)
+
+    def setJobDescription(self, value):
+        self._local.description = value
+
+
+class _FakeSpark:
+    def __init__(self, mode: str = "FAIR"):
+        self.sparkContext = _FakeSparkContext(mode)
+
+
+def _run(monkeypatch, tables, fail=(), mode="FAIR", parallelism=2):
+    """Run a batch with run_config replaced by a recorder."""
+    spark = _FakeSpark(mode)
+    pools = {}
+
+    def fake_run_config(spark_, config):
+        label = f"{config.db_name}.{config.tbl_name}"
+        pools[label] = spark_.sparkContext.getLocalProperty("spark.scheduler.pool")
+        if label in fail:
+            raise RuntimeError(f"{label} exploded")
+
+    monkeypatch.setattr(batch, "run_config", fake_run_config)
+    results = run_batch(spark, _CLUSTER, tables, "my-project", "my-bucket", parallelism)
+    return results, pools
+
+
+# ---------------------------------------------------------------------------
+# Table selection
+# ---------------------------------------------------------------------------
+
+
+def test_parse_tables_splits_on_first_dot():
+    assert parse_tables("thelook.users, thelook.public.orders,") == [
+        ("thelook", "users"),
+        ("thelook", "public.orders"),
+    ]
+
+
+def test_parse_tables_requires_db_name():
+    with pytest.raises(ValueError, match="<db_name>.<tbl_name>"):
+        parse_tables("users")
+
+
+def test_cluster_tables_lists_every_table_in_yaml_order():
+    assert cluster_tables(_CLUSTER) == [
+        ("thelook", "users"),
+        ("thelook", "orders"),
+        ("billing", "invoices"),
+    ]
+
+
+def test_cluster_tables_filters_by_db_name():
+    assert cluster_tables(_CLUSTER, "billing") == [("billing", "invoices")]
+
+
+# ---------------------------------------------------------------------------
+# run_batch
+# ---------------------------------------------------------------------------
+
+
+class TestRunBatch:
+    def test_each_table_runs_in_its_own_pool(self, monkeypatch):
+        results, pools = _run(monkeypatch, cluster_tables(_CLUSTER))
+        assert [r.status for r in results] == ["succeeded"] * 3
+        assert pools == {
+            "thelook.users": "thelook.users",
+            "thelook.orders": "thelook.orders",
+            "billing.invoices": "billing.invoices",
+        }
+
+    def test_failures_are_isolated(self, monkeypatch):
+        results, pools = _run(
+            monkeypatch, cluster_tables(_CLUSTER), fail={"thelook.users"}
+        )
+        by_label = {r.label: r for r in results}
+        assert by_label["thelook.users"].status == "failed"
+        assert by_label["thelook.users"].error == (
+            "RuntimeError: thelook.users exploded"
+        )
+        assert by_label["thelook.orders"].status == "succeeded"
+        assert by_label["billing.invoices"].status == "succeeded"
+
+    def test_unknown_table_fails_without_running(self, monkeypatch):
+        results, pools = _run(monkeypatch, [("thelook", "missing")])
+        assert results[0].status == "failed"
+        assert results[0].error.startswith("KeyError")
+        assert pools == {}
+
+    def test_results_keep_input_order(self, monkeypatch):
+        tables = [("billing", "invoices"), ("thelook", "users")]
+        results, _ = _run(monkeypatch, tables, parallelism=4)
+        assert [(r.db_name, r.tbl_name) for r in results] == tables
+
+    def test_warns_when_scheduler_is_not_fair(self, monkeypatch, caplog):
+        _run(monkeypatch, [("thelook", "users")], mode="FIFO")
+        assert "not FAIR" in caplog.text
+
+    def test_rejects_zero_parallelism(self, monkeypatch):
+        with pytest.raises(ValueError, match="parallelism"):
+            _run(monkeypatch, [("thelook", "users")], parallelism=0)
+
+
+# ---------------------------------------------------------------------------
+# format_report
+# ---------------------------------------------------------------------------
+
+
+def test_format_report_lists_failures_first():
+    report = format_report(
+        [
+            TableResult(db_name="a", tbl_name="ok", status="succeeded", seconds=9.0),
+            TableResult(
+                db_name="a", tbl_name="bad", status="failed", seconds=1.0, error="E: x"
+            ),
+        ]
+    )
+    lines = report.splitlines()
+    assert lines[0] == "Batch summary: 1 succeeded, 1 failed, 2 total"
+    assert lines[2].startswith("a.bad")
+    assert lines[2].endswith("E: x")
+    assert lines[3].startswith("a.ok")
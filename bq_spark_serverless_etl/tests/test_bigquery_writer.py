@@ -0,0 +1,562 @@
+"""Unit tests for pipeline.writers.bigquery -- single-pass scan, write flow, merge."""
+
+import shutil
+import threading
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from pyspark.sql.types import (
+    BinaryType,
+    DateType,
+    DecimalType,
+    IntegerType,
+    LongType,
+    StringType,
+    StructField,
+    StructType,
+    TimestampType,
+)
+
+from pipeline.config import PipelineConfig, SourceType
+from pipeline.writers import bigquery as bq_writer
+from pipeline.writers.bigquery import (
+    BigQueryWriter,
+    _choose_write_method,
+    _day_range_predicate,
+    _fixed_row_bytes,
+    _literal_type,
+    _merge_sql,
+    _partition_overwrite_sql,
+)
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _make_config(
+    extraction_mode: str = "incremental",
+    watermark_column: str | None = "updated_at",
+    scan_mode: str = "observe",
+    persist_storage_level: str = "MEMORY_AND_DISK",
+    write_mode: str = "append",
+    merge_strategy: str = "full",
+    merge_overwrite_min_rows: int | None = None,
+    partition_field: str | None = None,
+    write_method: str = "indirect",
+) -> PipelineConfig:
+    return PipelineConfig(
+        source_name="demo_cluster",
+        source_type=SourceType.POSTGRES,
+        source_group="demo",
+        db_name="thelook",
+        tbl_name="users",
+        jdbc_url_secret="projects/p/secrets/demo_cluster-jdbc-url/versions/latest",
+        source_table="public.users",
+        project="my-project",
+        dataset="raw_thelook",
+        table="users",
+        write_mode=write_mode,
+        write_method=write_method,
+        direct_max_rows=1_000,
+        direct_max_bytes=1_000_000,
+        merge_keys=["id"] if write_mode == "merge" else [],
+        merge_strategy=merge_strategy,
+        merge_overwrite_min_rows=merge_overwrite_min_rows,
+        partition_field=partition_field,
+        extraction_mode=extraction_mode,
+        watermark_column=watermark_column,
+        scan_mode=scan_mode,
+        persist_storage_level=persist_storage_level,
+        gcs_bucket="my-bucket",
+    )
+
+
+def _patch_writer(monkeypatch, metrics: dict, write_error: Exception | None = None):
+    """Replace every Spark/BigQuery touchpoint of BigQueryWriter with recorders."""
+    calls = {}
+
+    def fake_single_pass(self, df, config):
+        calls["single_pass"] = df
+        return f"single_pass({df})", lambda: metrics, lambda: calls.update(released=1)
+
+    def fake_write(self, df, config):
+        calls["written"] = df
+        calls["write_method"] = config.write_method
+        if write_error is not None:
+            raise write_error
+
+    monkeypatch.setattr(BigQueryWriter, "_single_pass", fake_single_pass)
+    monkeypatch.setattr(BigQueryWriter, "_write", fake_write)
+    monkeypatch.setattr(
+        BigQueryWriter,
+        "_record_run_metrics",
+        lambda self, config, m: calls.update(recorded=m),
+    )
+    monkeypatch.setattr(
+        BigQueryWriter,
+        "_update_watermark",
+        lambda self, config, wm: calls.update(watermark=wm),
+    )
+    return calls
+
+
+# ---------------------------------------------------------------------------
+# _fixed_row_bytes
+# ---------------------------------------------------------------------------
+
+
+def test_fixed_row_bytes_skips_variable_width_columns():
+    schema = StructType(
+        [
+            StructField("id", LongType()),
+            StructField("qty", IntegerType()),
+            StructField("day", DateType()),
+            StructField("ts", TimestampType()),
+            StructField("name", StringType()),
+            StructField("blob", BinaryType()),
+        ]
+    )
+    assert _fixed_row_bytes(schema) == 8 + 4 + 4 + 8
+
+
+def test_fixed_row_bytes_counts_unlisted_types_as_eight_bytes():
+    schema = StructType([StructField("price", DecimalType(10, 2))])
+    assert _fixed_row_bytes(schema) == 8
+
+
+# ---------------------------------------------------------------------------
+# write() flow
+# ---------------------------------------------------------------------------
+
+
+class TestSinglePassWrite:
+    _METRICS = {"rows_read": 3, "bytes_read": 120, "max_wm": "2024-01-02 00:00:00"}
+
+    def test_writes_the_single_pass_dataframe(self, monkeypatch):
+        calls = _patch_writer(monkeypatch, self._METRICS)
+        BigQueryWriter().write("df", _make_config())
+        assert calls["single_pass"] == "df"
+        assert calls["written"] == "single_pass(df)"
+        assert calls["released"] == 1
+
+    def test_watermark_comes_from_scan_metrics(self, monkeypatch):
+        calls = _patch_writer(monkeypatch, self._METRICS)
+        BigQueryWriter().write("df", _make_config())
+        assert calls["watermark"] == "2024-01-02 00:00:00"
+        assert calls["recorded"].items() >= self._METRICS.items()
+
+    def test_cdc_stores_the_batch_lsn_as_watermark(self, monkeypatch):
+        calls = _patch_writer(
+            monkeypatch, {**self._METRICS, "max_wm": "00000000/0016B374"}
+        )
+        config = _make_config(
+            extraction_mode="cdc", watermark_column="_cdc_lsn", write_mode="merge"
+        )
+        BigQueryWriter().write("df", config)
+        assert calls["watermark"] == "00000000/0016B374"
+
+    def test_full_reload_skips_watermark_but_records_metrics(self, monkeypatch):
+        metrics = {**self._METRICS, "max_wm": None}
+        calls = _patch_writer(monkeypatch, metrics)
+        BigQueryWriter().write(
+            "df", _make_config(extraction_mode="full", watermark_column=None)
+        )
+        assert "watermark" not in calls
+        assert calls["recorded"].items() >= metrics.items()
+
+    def test_records_write_method_and_latency(self, monkeypatch):
+        calls = _patch_writer(monkeypatch, self._METRICS)
+        BigQueryWriter().write("df", _make_config())
+        assert calls["recorded"]["write_method"] == "indirect"
+        assert calls["recorded"]["write_seconds"] >= 0
+
+    def test_failed_write_releases_and_records_nothing(self, monkeypatch):
+        calls = _patch_writer(monkeypatch, self._METRICS, RuntimeError("boom"))
+        with pytest.raises(RuntimeError, match="boom"):
+            BigQueryWriter().write("df", _make_config())
+        assert calls["released"] == 1
+        assert "recorded" not in calls
+        assert "watermark" not in calls
+
+
+def test_unknown_persist_storage_level_raises():
+    config = _make_config(scan_mode="persist", persist_storage_level="IN_THE_CLOUD")
+    with pytest.raises(ValueError, match="persist_storage_level"):
+        BigQueryWriter()._single_pass("df", config)
+
+
+def test_observation_name_is_unique_per_table_and_run(monkeypatch):
+    names = []
+
+    class _Observation:
+        def __init__(self, name):
+            names.append(name)
+            self.get = {}
+
+    df = SimpleNamespace(observe=lambda observation, *exprs: df)
+    monkeypatch.setattr(bq_writer, "Observation", _Observation)
+    monkeypatch.setattr(bq_writer, "_scan_metric_exprs", lambda *_: [])
+    config = _make_config()
+    BigQueryWriter()._single_pass(df, config)
+    BigQueryWriter()._single_pass(df, config)
+    other = config.model_copy(update={"dataset": "raw_other"})
+    BigQueryWriter()._single_pass(df, other)
+
+    assert len(set(names)) == 3
+    assert names[0].startswith(f"scan_{config.full_table_id}_")
+    assert names[2].startswith(f"scan_{other.full_table_id}_")
+
+
+def test_observed_metrics_returns_the_observation():
+    observation = SimpleNamespace(get={"rows_read": 3, "bytes_read": 24})
+    assert bq_writer._observed_metrics(observation, timeout=5) == {
+        "rows_read": 3,
+        "bytes_read": 24,
+    }
+
+
+def test_observed_metrics_fails_instead_of_waiting_forever():
+    released = threading.Event()
+
+    class _Unfulfilled:
+        @property
+        def get(self):
+            released.wait()
+            return {}
+
+    try:
+        with pytest.raises(RuntimeError, match="scan_mode: persist"):
+            bq_writer._observed_metrics(_Unfulfilled(), timeout=0.1)
+    finally:
+        released.set()
+
+
+def test_observed_metrics_reraises_observation_errors():
+    class _Failed:
+        @property
+        def get(self):
+            raise ValueError("job aborted")
+
+    with pytest.raises(ValueError, match="job aborted"):
+        bq_writer._observed_metrics(_Failed(), timeout=5)
+
+
+@pytest.mark.skipif(shutil.which("java") is None, reason="needs a JVM for Spark")
+class TestObserveWithLocalSpark:
+    @pytest.fixture(scope="class")
+    def spark(self):
+        from pyspark.sql import SparkSession
+
+        spark = (
+            SparkSession.builder.master("local[2]")
+            .appName("test-observe")
+            .getOrCreate()
+        )
+        yield spark
+        spark.stop()
+
+    def test_v1_source_write_fulfils_the_observation(self, spark, tmp_path):
+        # Parquet is in spark.sql.sources.useV1SourceList, like the
+        # BigQuery connector's indirect write path.
+        df = spark.createDataFrame(
+            [(1, "a", 10), (2, "bb", 30), (3, None, 20)],
+            "id long, name string, updated_at long",
+        )
+        observed, scan_metrics, _ = BigQueryWriter()._single_pass(df, _make_config())
+        observed.write.format("parquet").save(str(tmp_path / "out"))
+
+        metrics = scan_metrics()
+        assert metrics["rows_read"] == 3
+        assert metrics["max_wm"] == "30"
+
+    def test_unwritten_observation_times_out(self, spark, monkeypatch):
+        monkeypatch.setattr(bq_writer, "_OBSERVATION_TIMEOUT_SECONDS", 1)
+        df = spark.createDataFrame([(1, 10)], "id long, updated_at long")
+        _, scan_metrics, _ = BigQueryWriter()._single_pass(df, _make_config())
+
+        with pytest.raises(RuntimeError, match="did not report scan metrics"):
+            scan_metrics()
+
+
+# ---------------------------------------------------------------------------
+# Merge SQL builders
+# ---------------------------------------------------------------------------
+
+
+def test_merge_sql_without_partition_predicate():
+    sql = _merge_sql("p.d.t", "p.d._stg", ["id", "name"], ["id"])
+    assert "ON T.`id` = S.`id`\n" in sql
+    assert "UPDATE SET T.`name` = S.`name`" in sql
+    assert "INSERT (`id`, `name`)" in sql
+
+
+def test_merge_sql_adds_partition_predicate_to_on_clause():
+    sql = _merge_sql("p.d.t", "p.d._stg", ["id", "day"], ["id"], "(T.`day` = 1)")
+    assert "ON T.`id` = S.`id`\n            AND (T.`day` = 1)" in sql
+
+
+def test_merge_sql_omits_update_when_every_column_is_a_key():
+    sql = _merge_sql("p.d.t", "p.d._stg", ["id"], ["id"])
+    assert "WHEN MATCHED" not in sql
+
+
+def test_merge_sql_cdc_deletes_matches_and_skips_delete_inserts():
+    sql = _merge_sql("p.d.t", "p.d._stg", ["id", "name"], ["id"], cdc=True)
+    assert "WHEN MATCHED AND S.`_cdc_op` = 'delete' THEN\n                DELETE" in sql
+    assert sql.index("DELETE") < sql.index("UPDATE SET")
+    assert "WHEN NOT MATCHED AND NOT S.`_cdc_op` = 'delete' THEN" in sql
+    assert "_cdc_op`," not in sql.split("INSERT", 1)[1]
+
+
+def test_literal_type_from_bigquery_values():
+    assert _literal_type(date(2024, 1, 2)) == "DATE"
+    assert _literal_type(datetime(2024, 1, 2)) == "DATETIME"
+    assert _literal_type(datetime(2024, 1, 2, tzinfo=timezone.utc)) == "TIMESTAMP"
+    with pytest.raises(ValueError, match="Cannot prune"):
+        _literal_type(20240102)
+
+
+class TestDayRangePredicate:
+    def test_date_column_uses_between(self):
+        assert _day_range_predicate(
+            "T.`d`", "DATE", date(2024, 1, 2), date(2024, 1, 5)
+        ) == ("(T.`d` BETWEEN DATE '2024-01-02' AND DATE '2024-01-05')")
+
+    def test_timestamp_column_covers_whole_days(self):
+        assert _day_range_predicate(
+            "T.`ts`", "TIMESTAMP", date(2024, 1, 2), date(2024, 1, 2)
+        ) == ("(T.`ts` >= TIMESTAMP '2024-01-02' AND T.`ts` < TIMESTAMP '2024-01-03')")
+
+    def test_nulls_are_included_on_request(self):
+        predicate = _day_range_predicate(
+            "T.`d`", "DATE", date(2024, 1, 2), date(2024, 1, 2), include_nulls=True
+        )
+        assert predicate.endswith("OR T.`d` IS NULL)")
+
+    def test_all_null_batch_targets_the_null_partition(self):
+        assert _day_range_predicate("T.`d`", None, None, None) == "T.`d` IS NULL"
+
+
+def test_partition_overwrite_sql_keeps_unmatched_target_rows():
+    sql = _partition_overwrite_sql(
+        "p.d.t", "p.d._stg", ["id", "d"], ["id"], "d", "DATE", date(2024, 1, 2)
+    )
+    assert "FROM `p.d._stg` AS S\n            WHERE (S.`d` BETWEEN" in sql
+    assert "FROM `p.d.t` AS T\n            WHERE (T.`d` BETWEEN" in sql
+    assert "NOT EXISTS" in sql
+    assert "WHERE S.`id` = T.`id`" in sql
+
+
+# ---------------------------------------------------------------------------
+# _write_merge flow
+# ---------------------------------------------------------------------------
+
+
+class _FakeDataFrameWriter:
+    def __init__(self, saved: list):
+        self._saved = saved
+        self._options = {}
+
+    def format(self, _):
+        return self
+
+    def option(self, key, value):
+        self._options[key] = value
+        return self
+
+    def mode(self, _):
+        return self
+
+    def save(self):
+        self._saved.append(self._options["table"])
+
+
+class _FakeDataFrame:
+    columns = ["id", "name", "created_at"]
+
+    def __init__(self):
+        self.saved = []
+
+    @property
+    def write(self):
+        return _FakeDataFrameWriter(self.saved)
+
+
+class _FakeCdcDataFrame(_FakeDataFrame):
+    columns = [*_FakeDataFrame.columns, "_cdc_op", "_cdc_lsn"]
+
+
+class _FakeBigQueryClient:
+    """Records every query; answers the staging stats query with ``stats``."""
+
+    stats: dict = {}
+    queries: list = []
+
+    def __init__(self, project=None):
+        pass
+
+    def get_table(self, table_id):
+        return SimpleNamespace(
+            schema=[SimpleNamespace(name=c) for c in _FakeDataFrame.columns]
+        )
+
+    def query(self, sql, job_config=None):
+        type(self).queries.append((sql, job_config))
+        rows = [self.stats] if "COUNTIF" in sql else []
+        return SimpleNamespace(result=lambda: iter(rows))
+
+
+def _run_merge(monkeypatch, stats, df=None, **config_kwargs):
+    _FakeBigQueryClient.stats = stats
+    _FakeBigQueryClient.queries = []
+    monkeypatch.setattr(bq_writer._bq, "Client", _FakeBigQueryClient)
+    config = _make_config(write_mode="merge", **config_kwargs)
+    BigQueryWriter()._write_merge(df or _FakeDataFrame(), config)
+    return _FakeBigQueryClient.queries
+
+
+_STATS = {
+    "row_count": 10,
+    "null_count": 0,
+    "min_value": datetime(2024, 1, 2, 3, tzinfo=timezone.utc),
+    "days": [date(2024, 1, 2), date(2024, 1, 3)],
+}
+
+
+class TestWriteMerge:
+    def test_full_strategy_runs_unpruned_merge(self, monkeypatch):
+        queries = _run_merge(monkeypatch, _STATS, partition_field="created_at")
+        merge = next(sql for sql, _ in queries if "MERGE" in sql)
+        assert "ON T.`id` = S.`id`\n" in merge
+        assert "created_at` >=" not in merge
+        assert queries[-1][0].startswith("DROP TABLE IF EXISTS")
+
+    def test_pruned_strategy_filters_target_partitions(self, monkeypatch):
+        queries = _run_merge(
+            monkeypatch,
+            _STATS,
+            merge_strategy="pruned",
+            partition_field="created_at",
+        )
+        merge = next(sql for sql, _ in queries if "MERGE" in sql)
+        assert (
+            "AND (T.`created_at` >= TIMESTAMP '2024-01-02'"
+            " AND T.`created_at` < TIMESTAMP '2024-01-04')"
+        ) in merge
+
+    def test_large_batch_overwrites_each_partition(self, monkeypatch):
+        queries = _run_merge(
+            monkeypatch,
+            _STATS,
+            merge_strategy="pruned",
+            merge_overwrite_min_rows=10,
+            partition_field="created_at",
+        )
+        destinations = [
+            str(job_config.destination) for _, job_config in queries if job_config
+        ]
+        assert [d.rsplit("$", 1)[1] for d in destinations] == ["20240102", "20240103"]
+        assert not any("MERGE" in sql for sql, _ in queries)
+        assert queries[-1][0].startswith("DROP TABLE IF EXISTS")
+
+    def test_null_partition_values_keep_the_merge(self, monkeypatch):
+        queries = _run_merge(
+            monkeypatch,
+            {**_STATS, "null_count": 1},
+            merge_strategy="pruned",
+            merge_overwrite_min_rows=10,
+            partition_field="created_at",
+        )
+        merge = next(sql for sql, _ in queries if "MERGE" in sql)
+        assert "OR T.`created_at` IS NULL)" in merge
+
+    def test_empty_batch_skips_merge_but_drops_staging(self, monkeypatch):
+        queries = _run_merge(
+            monkeypatch,
+            {"row_count": 0, "null_count": 0, "min_value": None, "days": []},
+            merge_strategy="pruned",
+            partition_field="created_at",
+        )
+        assert not any("MERGE" in sql for sql, _ in queries)
+        assert queries[-1][0].startswith("DROP TABLE IF EXISTS")
+
+    def test_pruned_without_partition_field_runs_unpruned_merge(self, monkeypatch):
+        queries = _run_merge(monkeypatch, _STATS, merge_strategy="pruned")
+        assert not any("COUNTIF" in sql for sql, _ in queries)
+        assert any("MERGE" in sql for sql, _ in queries)
+
+    def test_cdc_batch_runs_unpruned_delete_aware_merge(self, monkeypatch):
+        queries = _run_merge(
+            monkeypatch,
+            _STATS,
+            df=_FakeCdcDataFrame(),
+            merge_strategy="pruned",
+            merge_overwrite_min_rows=1,
+            partition_field="created_at",
+        )
+        assert not any("COUNTIF" in sql for sql, _ in queries)
+        merge = next(sql for sql, _ in queries if "MERGE" in sql)
+        assert "THEN\n                DELETE" in merge
+        assert "INSERT (`id`, `name`, `created_at`)" in merge
+
+
+# ---------------------------------------------------------------------------
+# write_method=auto
+# ---------------------------------------------------------------------------
+
+
+class TestChooseWriteMethod:
+    _CONFIG = _make_config(write_method="auto")
+
+    def test_small_batch_goes_direct(self):
+        estimate = {"rows_read": 1_000, "bytes_read": 1_000_000}
+        assert _choose_write_method(estimate, self._CONFIG) == "direct"
+
+    def test_too_many_rows_goes_indirect(self):
+        estimate = {"rows_read": 1_001, "bytes_read": 10}
+        assert _choose_write_method(estimate, self._CONFIG) == "indirect"
+
+    def test_too_many_bytes_goes_indirect(self):
+        estimate = {"rows_read": 10, "bytes_read": 1_000_001}
+        assert _choose_write_method(estimate, self._CONFIG) == "indirect"
+
+    def test_partial_estimate_uses_the_known_value(self):
+        assert _choose_write_method({"rows_read": 5}, self._CONFIG) == "direct"
+
+    def test_unknown_size_goes_indirect(self):
+        assert _choose_write_method(None, self._CONFIG) == "indirect"
+        assert _choose_write_method({}, self._CONFIG) == "indirect"
+
+
+class TestAutoWriteMethod:
+    _SMALL = {"rows_read": 10, "bytes_read": 100, "max_wm": None}
+
+    def test_explicit_method_is_used_as_is(self, monkeypatch):
+        calls = _patch_writer(monkeypatch, self._SMALL)
+        BigQueryWriter().write("df", _make_config(write_method="direct"))
+        assert calls["write_method"] == "direct"
+
+    def test_persist_mode_uses_the_scan_metrics(self, monkeypatch):
+        calls = _patch_writer(monkeypatch, self._SMALL)
+        monkeypatch.setattr(
+            BigQueryWriter,
+            "_previous_run_metrics",
+            lambda self, config: pytest.fail("previous run must not be read"),
+        )
+        BigQueryWriter().write(
+            "df", _make_config(write_method="auto", scan_mode="persist")
+        )
+        assert calls["write_method"] == "direct"
+
+    def test_observe_mode_uses_the_previous_run(self, monkeypatch):
+        calls = _patch_writer(monkeypatch, self._SMALL)
+        monkeypatch.setattr(
+            BigQueryWriter,
+            "_previous_run_metrics",
+            lambda self, config: {"rows_read": 5_000, "bytes_read": 10},
+        )
+        BigQueryWriter().write("df", _make_config(write_method="auto"))
+        assert calls["write_method"] == "indirect"
+        assert calls["recorded"]["write_method"] == "indirect"
@@ -12,6 +12,7 @@ from pipeline.config import (
     TableConfig,
     _build_blob_path,
     _build_pipeline_config,
+    _derive_cdc_slot,
     _derive_dataset,
     _derive_write_mode,
     _resolve_etl_mode,
@@ -240,6 +241,81 @@ def test_derive_write_mode_unknown_defaults_to_overwrite():
     assert _derive_write_mode("UNKNOWN_MODE", []) == "overwrite"
 
 
+def test_derive_write_mode_cdc_always_merges():
+    assert _derive_write_mode("CDC", ["id"]) == "merge"
+
+
+# ---------------------------------------------------------------------------
+# etl_mode: CDC
+# ---------------------------------------------------------------------------
+
+
+def _cdc_cluster(**tbl_overrides) -> dict:
+    return {
+        **_FULL_CLUSTER_YAML,
+        "data_config": {
+            "thelook": {
+                "tables": {
+                    "public.users": {
+                        "etl_mode": "CDC",
+                        "upsert_key": ["id"],
+                        **tbl_overrides,
+                    }
+                }
+            }
+        },
+    }
+
+
+def test_build_pipeline_config_cdc():
+    cfg = _make_pipeline_config(tbl_name="public.users", cluster_raw=_cdc_cluster())
+    assert cfg.extraction_mode == "cdc"
+    assert cfg.write_mode == "merge"
+    assert cfg.watermark_column == "_cdc_lsn"
+    assert cfg.cdc_slot == "pipeline_thelook_public_users"
+    assert cfg.cdc_max_changes is None
+
+
+def test_build_pipeline_config_cdc_explicit_slot_and_limit():
+    raw = _cdc_cluster(cdc_slot="users_slot", cdc_max_changes=50_000)
+    cfg = _make_pipeline_config(tbl_name="public.users", cluster_raw=raw)
+    assert cfg.cdc_slot == "users_slot"
+    assert cfg.cdc_max_changes == 50_000
+
+
+def test_build_pipeline_config_cdc_requires_upsert_key():
+    raw = _cdc_cluster(upsert_key=[])
+    with pytest.raises(ValidationError, match="merge_keys"):
+        _make_pipeline_config(tbl_name="public.users", cluster_raw=raw)
+
+
+def _cdc_tables(count: int, **tbl_overrides) -> dict:
+    raw = _cdc_cluster()
+    raw["data_config"]["thelook"]["tables"] = {
+        f"public.t{i}": {"etl_mode": "CDC", "upsert_key": ["id"], **tbl_overrides}
+        for i in range(count)
+    }
+    return raw
+
+
+def test_cluster_config_rejects_shared_cdc_slots():
+    with pytest.raises(ValidationError, match="share replication slot 'shared'"):
+        ClusterConfig.model_validate(_cdc_tables(2, cdc_slot="shared"))
+
+
+def test_cluster_config_caps_cdc_slots():
+    assert len(ClusterConfig.model_validate(_cdc_tables(10)).data_config) == 1
+    with pytest.raises(ValidationError, match="cdc_max_slots=10"):
+        ClusterConfig.model_validate(_cdc_tables(11))
+    raw = {**_cdc_tables(11), "cdc_max_slots": 20}
+    assert ClusterConfig.model_validate(raw).cdc_max_slots == 20
+
+
+def test_derive_cdc_slot_sanitises_and_truncates():
+    assert _derive_cdc_slot("The-Look", "orders") == "pipeline_the_look_orders"
+    assert len(_derive_cdc_slot("db", "t" * 100)) == 63
+
+
 # ---------------------------------------------------------------------------
 # _derive_dataset
 # ---------------------------------------------------------------------------
@@ -668,3 +744,206 @@ def test_customer_style_yaml_no_etl_mode_with_pagination():
     assert cfg.partition_column == "id"
     assert cfg.dataset == "raw_transaction_service_v4"
     assert cfg.source_table == "public.transaction_event"
+
+
+def test_partition_strategy_defaults_to_bounds():
+    cfg = _make_pipeline_config(tbl_name="orders")
+    assert cfg.partition_strategy == "bounds"
+    assert cfg.partition_sample_percent is None
+
+
+def test_build_pipeline_config_quantile_partitioning():
+    raw = {
+        **_FULL_CLUSTER_YAML,
+        "data_config": {
+            "thelook": {
+                "tables": {
+                    "skewed": {
+                        "etl_mode": "FULL_RELOAD",
+                        "is_paginated": True,
+                        "pagination_key": "tenant_id",
+                        "partition_strategy": "quantiles",
+                        "partition_sample_percent": 1,
+                    }
+                }
+            }
+        },
+    }
+    cfg = _make_pipeline_config(tbl_name="skewed", cluster_raw=raw)
+    assert cfg.partition_strategy == "quantiles"
+    assert cfg.partition_sample_percent == 1
+
+
+def test_unknown_partition_strategy_raises():
+    with pytest.raises(ValidationError, match="partition_strategy"):
+        TableConfig(partition_strategy="hash")
+
+
+def test_partition_sample_percent_must_be_a_percentage():
+    with pytest.raises(ValidationError):
+        TableConfig(partition_sample_percent=0)
+    with pytest.raises(ValidationError):
+        TableConfig(partition_sample_percent=150)
+
+
+def test_build_pipeline_config_keyset_pagination():
+    raw = {
+        **_FULL_CLUSTER_YAML,
+        "data_config": {
+            "thelook": {
+                "tables": {
+                    "events": {
+                        "etl_mode": "FULL_RELOAD",
+                        "is_paginated": True,
+                        "pagination_key": "event_uuid",
+                        "pagination_size": 8,
+                        "partition_strategy": "keyset",
+                        "page_rows": 50_000,
+                    }
+                }
+            }
+        },
+    }
+    cfg = _make_pipeline_config(tbl_name="events", cluster_raw=raw)
+    assert cfg.partition_strategy == "keyset"
+    assert cfg.page_rows == 50_000
+    assert cfg.num_partitions == 8
+
+
+def test_page_rows_must_be_positive():
+    with pytest.raises(ValidationError):
+        TableConfig(page_rows=0)
+
+
+def test_auto_tune_defaults_off():
+    cfg = _make_pipeline_config(tbl_name="users")
+    assert cfg.auto_tune is False
+    assert cfg.target_partition_bytes == 128 * 1024 * 1024
+
+
+def test_build_pipeline_config_auto_tune():
+    raw = {
+        **_FULL_CLUSTER_YAML,
+        "data_config": {
+            "thelook": {
+                "tables": {
+                    "events": {
+                        "etl_mode": "FULL_RELOAD",
+                        "is_paginated": True,
+                        "pagination_key": "id",
+                        "auto_tune": True,
+                        "target_partition_bytes": 256 * 1024 * 1024,
+                    }
+                }
+            }
+        },
+    }
+    cfg = _make_pipeline_config(tbl_name="events", cluster_raw=raw)
+    assert cfg.auto_tune is True
+    assert cfg.target_partition_bytes == 256 * 1024 * 1024
+
+
+def test_target_partition_bytes_must_be_positive():
+    with pytest.raises(ValidationError):
+        TableConfig(target_partition_bytes=0)
+
+
+def test_scan_mode_defaults_to_observe():
+    cfg = _make_pipeline_config(tbl_name="users")
+    assert cfg.scan_mode == "observe"
+    assert cfg.persist_storage_level == "MEMORY_AND_DISK"
+
+
+def test_build_pipeline_config_persist_scan_mode():
+    raw = {
+        **_FULL_CLUSTER_YAML,
+        "data_config": {
+            "thelook": {
+                "tables": {
+                    "orders": {
+                        "etl_mode": "FULL_RELOAD",
+                        "scan_mode": "persist",
+                        "persist_storage_level": "DISK_ONLY",
+                    }
+                }
+            }
+        },
+    }
+    cfg = _make_pipeline_config(cluster_raw=raw)
+    assert cfg.scan_mode == "persist"
+    assert cfg.persist_storage_level == "DISK_ONLY"
+
+
+def test_unknown_scan_mode_raises():
+    with pytest.raises(ValidationError, match="scan_mode"):
+        TableConfig(scan_mode="twice")
+
+
+def test_build_pipeline_config_pruned_merge():
+    raw = {
+        **_FULL_CLUSTER_YAML,
+        "data_config": {
+            "thelook": {
+                "tables": {
+                    "users": {
+                        "etl_mode": "INCREMENTAL",
+                        "backfill_filters": [{"backfill_id": "updated_at"}],
+                        "upsert_key": ["id"],
+                        "partition_keys": [
+                            {"col_name": "created_at", "col_type": "timestamp"}
+                        ],
+                        "merge_strategy": "pruned",
+                        "merge_overwrite_min_rows": 5_000_000,
+                    }
+                }
+            }
+        },
+    }
+    cfg = _make_pipeline_config(tbl_name="users", cluster_raw=raw)
+    assert cfg.write_mode == "merge"
+    assert cfg.merge_strategy == "pruned"
+    assert cfg.merge_overwrite_min_rows == 5_000_000
+    assert cfg.partition_field == "created_at"
+
+
+def test_merge_strategy_defaults_to_full():
+    cfg = _make_pipeline_config(tbl_name="users")
+    assert cfg.merge_strategy == "full"
+    assert cfg.merge_overwrite_min_rows is None
+
+
+def test_unknown_merge_strategy_raises():
+    with pytest.raises(ValidationError, match="merge_strategy"):
+        TableConfig(merge_strategy="partial")
+
+
+def test_write_method_defaults_to_indirect():
+    cfg = _make_pipeline_config(tbl_name="users")
+    assert cfg.write_method == "indirect"
+
+
+def test_build_pipeline_config_auto_write_method():
+    raw = {
+        **_FULL_CLUSTER_YAML,
+        "data_config": {
+            "thelook": {
+                "tables": {
+                    "orders": {
+                        "etl_mode": "FULL_RELOAD",
+                        "write_method": "auto",
+                        "direct_max_rows": 50_000,
+                        "direct_max_bytes": 10_000_000,
+                    }
+                }
+            }
+        },
+    }
+    cfg = _make_pipeline_config(cluster_raw=raw)
+    assert cfg.write_method == "auto"
+    assert cfg.direct_max_rows == 50_000
+    assert cfg.direct_max_bytes == 10_000_000
+
+
+def test_unknown_write_method_raises():
+    with pytest.raises(ValidationError, match="write_method"):
+        TableConfig(write_method="streaming")
@@ -8,7 +8,14 @@ Spark-dependent paths (actual JDBC reads) are integration tests.
 import pytest
 
 from pipeline.config import PipelineConfig, SourceType
-from pipeline.extractors.postgres import PostgresExtractor
+from pipeline.extractors.postgres import (
+    PostgresExtractor,
+    keyset_predicates,
+    keyset_step_sql,
+    quantile_predicates,
+    table_stats_sql,
+    tune_read,
+)
 
 
 def _make_config(
@@ -16,6 +23,11 @@ def _make_config(
     watermark_column: str | None = None,
     partition_column: str | None = None,
     num_partitions: int = 10,
+    partition_strategy: str = "bounds",
+    partition_sample_percent: float | None = None,
+    page_rows: int = 100_000,
+    auto_tune: bool = False,
+    target_partition_bytes: int = 128 * 1024 * 1024,
 ) -> PipelineConfig:
     return PipelineConfig(
         source_name="demo_cluster",
@@ -27,6 +39,11 @@ def _make_config(
         source_table="public.users",
         partition_column=partition_column,
         num_partitions=num_partitions,
+        partition_strategy=partition_strategy,
+        partition_sample_percent=partition_sample_percent,
+        page_rows=page_rows,
+        auto_tune=auto_tune,
+        target_partition_bytes=target_partition_bytes,
         project="my-project",
         dataset="raw_thelook",
         table="users",
@@ -63,6 +80,19 @@ class _FakeRead:
     def format(self, _):
         return _FakeFormat(self._captured)
 
+    def jdbc(self, **kwargs):
+        self._captured.update(kwargs)
+        return _FakeFrame(self._captured)
+
+
+class _FakeFrame:
+    def __init__(self, captured: dict):
+        self._captured = captured
+
+    def coalesce(self, n):
+        self._captured["coalesce"] = n
+        return self
+
 
 class _FakeSpark:
     def __init__(self, captured: dict):
@@ -127,6 +157,7 @@ class TestParallelRead:
         monkeypatch.setattr(
             extractor, "_build_query", lambda spark, cfg: "SELECT * FROM public.users"
         )
+        monkeypatch.setattr(extractor, "_partition_bounds", lambda *args: (1, 5000))
 
         extractor.extract(spark=_FakeSpark(captured_options), config=config)  # type: ignore[arg-type]
 
@@ -152,3 +183,248 @@ class TestParallelRead:
 
         assert "partitionColumn" not in captured_options
         assert "numPartitions" not in captured_options
+
+
+def _extract_with_probe(monkeypatch, config, probe_rows):
+    """Run extract() with a canned probe result; return (options, probe SQL).
+
+    probe_rows is either the rows every probe returns or a function of the
+    probe SQL returning them.
+    """
+    extractor = PostgresExtractor()
+    captured: dict = {}
+    probes: list[str] = []
+
+    monkeypatch.setattr(
+        "pipeline.extractors.postgres.resolve_secret",
+        lambda _: "jdbc:postgresql://localhost/test",
+    )
+    monkeypatch.setattr(
+        extractor,
+        "_build_query",
+        lambda spark, cfg: "SELECT * FROM public.users WHERE id > 0",
+    )
+
+    def _probe(spark, base_options, sql):
+        probes.append(sql)
+        return probe_rows(sql) if callable(probe_rows) else probe_rows
+
+    monkeypatch.setattr(extractor, "_probe", _probe)
+    extractor.extract(spark=_FakeSpark(captured), config=config)  # type: ignore[arg-type]
+    return captured, probes
+
+
+class TestAutoBounds:
+    """Tests for automatic lowerBound/upperBound discovery."""
+
+    def test_bounds_come_from_min_max_of_extraction_query(self, monkeypatch):
+        config = _make_config(partition_column="id", num_partitions=8)
+
+        options, probes = _extract_with_probe(
+            monkeypatch, config, [{"lo": 3, "hi": 9_000}]
+        )
+
+        assert options["lowerBound"] == "3"
+        assert options["upperBound"] == "9000"
+        assert options["numPartitions"] == "8"
+        assert "MIN(id) AS lo, MAX(id) AS hi" in probes[0]
+        assert "FROM (SELECT * FROM public.users WHERE id > 0) AS _subq" in probes[0]
+
+    def test_empty_source_reads_single_partition(self, monkeypatch):
+        config = _make_config(partition_column="id")
+
+        options, _ = _extract_with_probe(
+            monkeypatch, config, [{"lo": None, "hi": None}]
+        )
+
+        assert "partitionColumn" not in options
+        assert options["dbtable"].endswith("AS _subq")
+
+
+class TestSkewAwareRead:
+    """Tests for the quantile-based (skew-aware) predicate read."""
+
+    def test_quantile_cuts_become_sorted_predicates(self, monkeypatch):
+        config = _make_config(
+            partition_column="id",
+            num_partitions=4,
+            partition_strategy="quantiles",
+            partition_sample_percent=5,
+        )
+
+        captured, probes = _extract_with_probe(
+            monkeypatch, config, [{"cut": 300}, {"cut": 100}, {"cut": 200}]
+        )
+
+        assert captured["predicates"] == [
+            "(id < 100 OR id IS NULL)",
+            "id >= 100 AND id < 200",
+            "id >= 200 AND id < 300",
+            "id >= 300",
+        ]
+        assert captured["url"] == "jdbc:postgresql://localhost/test"
+        assert "url" not in captured["properties"]
+        assert "percentile_disc(ARRAY[0.250000, 0.500000, 0.750000])" in probes[0]
+        assert "WHERE random() < 0.050000" in probes[0]
+
+    def test_no_cuts_falls_back_to_single_read(self, monkeypatch):
+        config = _make_config(partition_column="id", partition_strategy="quantiles")
+
+        captured, _ = _extract_with_probe(monkeypatch, config, [])
+
+        assert "predicates" not in captured
+        assert "partitionColumn" not in captured
+
+    def test_predicates_quote_non_numeric_keys(self):
+        predicates = quantile_predicates("code", ["b'x", "m"])
+
+        assert predicates == [
+            "(code < 'b''x' OR code IS NULL)",
+            "code >= 'b''x' AND code < 'm'",
+            "code >= 'm'",
+        ]
+
+
+class TestKeysetPagination:
+    """Tests for partition_strategy=keyset."""
+
+    def test_pages_are_predicates_read_by_bounded_tasks(self, monkeypatch):
+        config = _make_config(
+            partition_column="order_ref",
+            num_partitions=3,
+            partition_strategy="keyset",
+            page_rows=1000,
+        )
+
+        steps = iter([[{"boundary": "k1000"}], [{"boundary": "k2000"}], []])
+        captured, probes = _extract_with_probe(
+            monkeypatch, config, lambda sql: next(steps)
+        )
+
+        assert captured["predicates"] == [
+            "(order_ref <= 'k1000' OR order_ref IS NULL)",
+            "order_ref > 'k1000' AND order_ref <= 'k2000'",
+            "order_ref > 'k2000'",
+        ]
+        assert captured["coalesce"] == 3
+        assert "WHERE order_ref IS NOT NULL ORDER BY order_ref" in probes[0]
+        assert "WHERE order_ref > 'k1000' ORDER BY order_ref" in probes[1]
+        assert "WHERE order_ref > 'k2000' ORDER BY order_ref" in probes[2]
+        assert all("OFFSET 999 LIMIT 1" in sql for sql in probes)
+        assert not any("row_number()" in sql for sql in probes)
+
+    def test_single_page_reads_without_pagination(self, monkeypatch):
+        config = _make_config(partition_column="id", partition_strategy="keyset")
+
+        captured, _ = _extract_with_probe(monkeypatch, config, [])
+
+        assert "predicates" not in captured
+        assert "coalesce" not in captured
+
+    def test_keyset_step_sql_is_one_index_range_page(self):
+        sql = keyset_step_sql("SELECT * FROM t", "id", 500, after=10)
+
+        assert sql == (
+            "SELECT id AS boundary FROM (SELECT * FROM t) AS _subq "
+            "WHERE id > 10 ORDER BY id OFFSET 499 LIMIT 1"
+        )
+
+    def test_keyset_predicates_cover_every_key_once(self):
+        predicates = keyset_predicates("id", [10, 20])
+
+        assert predicates == [
+            "(id <= 10 OR id IS NULL)",
+            "id > 10 AND id <= 20",
+            "id > 20",
+        ]
+        assert keyset_predicates("id", []) == []
+
+
+_MIB = 1024 * 1024
+
+
+class TestAutoTune:
+    """Tests for statistics-driven sizing of the JDBC read (auto_tune)."""
+
+    def test_partitions_fetch_size_and_pages_follow_the_row_width(self):
+        # 10M rows x 100 B = 1 GB -> 8 tasks of 128 MiB.
+        tuned = tune_read(10_000_000, 2_000_000_000, 100, 128 * _MIB)
+
+        assert tuned == {
+            "num_partitions": 8,
+            "fetch_size": 83_886,
+            "page_rows": 1_342_177,
+        }
+
+    def test_small_table_reads_as_one_partition(self):
+        tuned = tune_read(10_000, 1_500_000, 120, 128 * _MIB)
+
+        assert tuned["num_partitions"] == 1
+        assert tuned["fetch_size"] == 69_905
+
+    def test_huge_table_is_capped_at_max_partitions(self):
+        tuned = tune_read(10_000_000_000, 2 * 10**12, 150, 128 * _MIB)
+
+        assert tuned["num_partitions"] == 200
+
+    def test_wide_rows_keep_the_minimum_fetch_size(self):
+        tuned = tune_read(1_000, 64 * _MIB, 64 * 1024, 128 * _MIB)
+
+        assert tuned["fetch_size"] == 1_000
+        assert tuned["page_rows"] == 2_048
+
+    def test_missing_pg_stats_estimates_width_from_relation_size(self):
+        tuned = tune_read(1_000_000, 500 * _MIB, None, 128 * _MIB)
+
+        assert tuned["num_partitions"] == 4
+        assert tuned["page_rows"] == 256_140  # 524 B per row
+
+    def test_never_analyzed_table_is_sized_from_relation_size_only(self):
+        tuned = tune_read(-1, 300 * _MIB, None, 128 * _MIB)
+
+        assert tuned == {"num_partitions": 3}
+
+    def test_table_stats_sql_resolves_quoted_names(self):
+        sql = table_stats_sql('public."ApprovalWorkflows"')
+
+        assert "c.oid = to_regclass('public.\"ApprovalWorkflows\"')" in sql
+        assert "pg_total_relation_size(c.oid)" in sql
+        assert "SUM(s.avg_width)" in sql
+
+    def test_extract_applies_the_tuned_settings(self, monkeypatch):
+        config = _make_config(partition_column="id", num_partitions=2, auto_tune=True)
+
+        def probe(sql):
+            if "pg_class" in sql:
+                return [
+                    {
+                        "row_estimate": 10_000_000,
+                        "total_bytes": 2_000_000_000,
+                        "row_width": 100,
+                    }
+                ]
+            return [{"lo": 1, "hi": 10_000_000}]
+
+        options, probes = _extract_with_probe(monkeypatch, config, probe)
+
+        assert options["numPartitions"] == "8"
+        assert options["fetchsize"] == "83886"
+        assert "to_regclass('public.users')" in probes[0]
+
+    def test_missing_table_keeps_configured_settings(self, monkeypatch):
+        config = _make_config(partition_column="id", num_partitions=5, auto_tune=True)
+
+        def probe(sql):
+            return [] if "pg_class" in sql else [{"lo": 1, "hi": 100}]
+
+        options, _ = _extract_with_probe(monkeypatch, config, probe)
+
+        assert options["numPartitions"] == "5"
+        assert options["fetchsize"] == "10000"
+
+    def test_disabled_by_default(self, monkeypatch):
+        config = _make_config(partition_column="id")
+
+        _, probes = _extract_with_probe(monkeypatch, config, [{"lo": 1, "hi": 9}])
+
+        assert not any("pg_class" in sql for sql in probes)
@@ -4,6 +4,7 @@ import pytest
 
 from pipeline.config import SourceType
 from pipeline.extractors.postgres import PostgresExtractor
+from pipeline.extractors.postgres_cdc import PostgresCdcExtractor
 from pipeline.registry import get_extractor, get_writer
 from pipeline.writers.bigquery import BigQueryWriter
 
@@ -13,6 +14,12 @@ def test_get_extractor_postgres():
     assert isinstance(extractor, PostgresExtractor)
 
 
+def test_get_extractor_cdc_mode_uses_cdc_registry():
+    extractor = get_extractor(SourceType.POSTGRES, "cdc")
+    assert isinstance(extractor, PostgresCdcExtractor)
+    assert type(get_extractor(SourceType.POSTGRES, "incremental")) is PostgresExtractor
+
+
 def test_get_extractor_unregistered_raises():
     # Temporarily remove a registered type to exercise the KeyError guard.
     from pipeline.registry import EXTRACTOR_REGISTRY